@@ -0,0 +1,112 @@
+"""baseline schema
+
+The users, organizations, projects and donations tables as they were before
+migrations were tracked. Databases created by the earlier untracked history
+already have them: run `alembic stamp 0a7e2c9d4b18` once before upgrading.
+
+Revision ID: 0a7e2c9d4b18
+Revises:
+Create Date: 2026-10-18 08:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0a7e2c9d4b18'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('password', sa.String(length=255), nullable=False),
+        sa.Column('role', sa.Enum('DONOR', 'ADMIN', 'ORG', name='userrole'), nullable=False),
+        sa.Column('wallet_address', sa.String(length=255), nullable=True),
+        sa.Column('encrypted_private_key', sa.String(length=500), nullable=True),
+        sa.Column('is_verified', sa.Boolean(), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('wallet_address')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=True)
+
+    op.create_table(
+        'organizations',
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('contact_email', sa.String(length=255), nullable=False),
+        sa.Column('region', sa.String(length=100), nullable=True),
+        sa.Column('verified', sa.Boolean(), nullable=False),
+        sa.Column('created_by', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_organizations_contact_email'), 'organizations', ['contact_email'], unique=False)
+    op.create_index(op.f('ix_organizations_id'), 'organizations', ['id'], unique=True)
+
+    op.create_table(
+        'projects',
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('target_amount', sa.Float(), nullable=False),
+        sa.Column('amount_raised', sa.Float(), nullable=True),
+        sa.Column('backers_count', sa.Integer(), nullable=True),
+        sa.Column('location', sa.String(length=255), nullable=True),
+        sa.Column('verified', sa.Boolean(), nullable=True),
+        sa.Column('wallet_address', sa.String(length=255), nullable=False),
+        sa.Column('image', sa.LargeBinary(), nullable=True),
+        sa.Column('image_mime_type', sa.String(length=50), nullable=True),
+        sa.Column('created_by', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_projects_id'), 'projects', ['id'], unique=True)
+
+    op.create_table(
+        'donations',
+        sa.Column('donor_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('tx_hash', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.Enum('pending', 'completed', 'failed', name='donationstatus'), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['donor_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('tx_hash')
+    )
+    op.create_index(op.f('ix_donations_id'), 'donations', ['id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_donations_id'), table_name='donations')
+    op.drop_table('donations')
+    op.drop_index(op.f('ix_projects_id'), table_name='projects')
+    op.drop_table('projects')
+    op.drop_index(op.f('ix_organizations_id'), table_name='organizations')
+    op.drop_index(op.f('ix_organizations_contact_email'), table_name='organizations')
+    op.drop_table('organizations')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    sa.Enum(name='donationstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='userrole').drop(op.get_bind(), checkfirst=True)
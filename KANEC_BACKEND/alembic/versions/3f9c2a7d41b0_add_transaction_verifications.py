@@ -0,0 +1,44 @@
+"""add transaction_verifications
+
+Revision ID: 3f9c2a7d41b0
+Revises: 0a7e2c9d4b18
+Create Date: 2026-10-18 09:12:44.201937
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d41b0'
+down_revision: Union[str, None] = '0a7e2c9d4b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'transaction_verifications',
+        sa.Column('tx_id', sa.String(length=255), nullable=False),
+        sa.Column('valid', sa.Boolean(), nullable=False),
+        sa.Column('result', sa.String(length=50), nullable=True),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('from_account', sa.String(length=255), nullable=True),
+        sa.Column('to_account', sa.String(length=255), nullable=True),
+        sa.Column('consensus_timestamp', sa.String(length=40), nullable=True),
+        sa.Column('transfers', sa.JSON(), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_transaction_verifications_id'), 'transaction_verifications', ['id'], unique=True)
+    op.create_index(op.f('ix_transaction_verifications_tx_id'), 'transaction_verifications', ['tx_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_transaction_verifications_tx_id'), table_name='transaction_verifications')
+    op.drop_index(op.f('ix_transaction_verifications_id'), table_name='transaction_verifications')
+    op.drop_table('transaction_verifications')
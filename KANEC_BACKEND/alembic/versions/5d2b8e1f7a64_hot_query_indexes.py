@@ -0,0 +1,71 @@
+"""hot query indexes
+
+Add composite and partial indexes for the donation and project hot queries and
+drop the ix_<table>_id indexes that duplicated each primary key.
+
+Indexes are built CONCURRENTLY so the tables stay writable during the upgrade.
+
+Revision ID: 5d2b8e1f7a64
+Revises: c47d0e8a1f25
+Create Date: 2026-10-18 14:02:13.518220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2b8e1f7a64'
+down_revision: Union[str, None] = 'c47d0e8a1f25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PRIMARY_KEY_TABLES = ('users', 'organizations', 'projects', 'donations', 'transaction_verifications')
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_donations_donor_status_created', 'donations', ['donor_id', 'status', 'created_at'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_donations_project_status_created', 'donations', ['project_id', 'status', 'created_at'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_donations_completed_created', 'donations', ['created_at'],
+            postgresql_where=sa.text("status = 'completed'"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_projects_verified_category_raised', 'projects', ['category', 'amount_raised'],
+            postgresql_where=sa.text('verified'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_projects_verified_raised', 'projects', ['amount_raised'],
+            postgresql_where=sa.text('verified'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+        # The primary key already has its own unique index
+        for table in PRIMARY_KEY_TABLES:
+            op.drop_index(f'ix_{table}_id', table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table in PRIMARY_KEY_TABLES:
+            op.create_index(
+                f'ix_{table}_id', table, ['id'], unique=True,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+
+        op.drop_index('ix_projects_verified_raised', table_name='projects', postgresql_concurrently=True)
+        op.drop_index('ix_projects_verified_category_raised', table_name='projects', postgresql_concurrently=True)
+        op.drop_index('ix_donations_completed_created', table_name='donations', postgresql_concurrently=True)
+        op.drop_index('ix_donations_project_status_created', table_name='donations', postgresql_concurrently=True)
+        op.drop_index('ix_donations_donor_status_created', table_name='donations', postgresql_concurrently=True)
@@ -0,0 +1,61 @@
+"""project listing keyset indexes
+
+Make amount_raised NOT NULL so it can be a keyset sort key, and index each
+listing sort key together with id over verified projects.
+
+Revision ID: 7c4d1a9e5f26
+Revises: e12f7b9c3d50
+Create Date: 2026-10-18 18:11:27.390154
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c4d1a9e5f26'
+down_revision: Union[str, None] = 'e12f7b9c3d50'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match api.v1.models.project.completion_ratio for the planner to use it
+COMPLETION_RATIO = 'coalesce(amount_raised / nullif(target_amount, 0), 0)'
+
+
+def upgrade() -> None:
+    op.execute("UPDATE projects SET amount_raised = 0 WHERE amount_raised IS NULL")
+    op.alter_column('projects', 'amount_raised', existing_type=sa.Float(), nullable=False)
+
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_projects_verified_raised', table_name='projects', postgresql_concurrently=True, if_exists=True)
+        op.create_index(
+            'ix_projects_verified_raised', 'projects', ['amount_raised', 'id'],
+            postgresql_where=sa.text('verified'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_projects_verified_created', 'projects', ['created_at', 'id'],
+            postgresql_where=sa.text('verified'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_projects_verified_completion', 'projects', [sa.text(COMPLETION_RATIO), 'id'],
+            postgresql_where=sa.text('verified'),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_projects_verified_completion', table_name='projects', postgresql_concurrently=True)
+        op.drop_index('ix_projects_verified_created', table_name='projects', postgresql_concurrently=True)
+        op.drop_index('ix_projects_verified_raised', table_name='projects', postgresql_concurrently=True)
+        op.create_index(
+            'ix_projects_verified_raised', 'projects', ['amount_raised'],
+            postgresql_where=sa.text('verified'),
+            postgresql_concurrently=True
+        )
+
+    op.alter_column('projects', 'amount_raised', existing_type=sa.Float(), nullable=True)
@@ -0,0 +1,42 @@
+"""normalize donation tx_hash
+
+Rewrite donations.tx_hash stored as shard.realm.num-seconds.nanos (the SDK form
+with '@' swapped for '-', nanos unpadded) into the mirror-node form
+shard.realm.num-seconds-nnnnnnnnn.
+
+Revision ID: 8b1e4d5c92a3
+Revises: 3f9c2a7d41b0
+Create Date: 2026-10-18 10:03:17.554210
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e4d5c92a3'
+down_revision: Union[str, None] = '3f9c2a7d41b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(r"""
+        UPDATE donations
+        SET tx_hash = split_part(replace(tx_hash, '@', '-'), '-', 1)
+            || '-' || split_part(split_part(replace(tx_hash, '@', '-'), '-', 2), '.', 1)
+            || '-' || lpad(split_part(split_part(replace(tx_hash, '@', '-'), '-', 2), '.', 2), 9, '0')
+        WHERE tx_hash ~ '^\d+\.\d+\.\d+[@-]\d+\.\d{1,9}$'
+    """)
+
+
+def downgrade() -> None:
+    op.execute(r"""
+        UPDATE donations
+        SET tx_hash = split_part(tx_hash, '-', 1)
+            || '-' || split_part(tx_hash, '-', 2)
+            || '.' || split_part(tx_hash, '-', 3)::bigint::text
+        WHERE tx_hash ~ '^\d+\.\d+\.\d+-\d+-\d{9}$'
+    """)
@@ -0,0 +1,67 @@
+"""move project images
+
+Move image bytes off the projects row into project_images, keyed by project and
+content hash, and keep only the hash on projects.
+
+Revision ID: a9e3c6f2b814
+Revises: 5d2b8e1f7a64
+Create Date: 2026-10-18 15:37:52.104966
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9e3c6f2b814'
+down_revision: Union[str, None] = '5d2b8e1f7a64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'project_images',
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('mime_type', sa.String(length=50), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('project_id')
+    )
+    op.add_column('projects', sa.Column('image_hash', sa.String(length=64), nullable=True))
+
+    op.execute("""
+        INSERT INTO project_images (id, project_id, content_hash, mime_type, size, data, created_at, updated_at)
+        SELECT gen_random_uuid(), id, encode(sha256(image), 'hex'), coalesce(image_mime_type, 'image/webp'),
+               octet_length(image), image, now(), now()
+        FROM projects
+        WHERE image IS NOT NULL
+    """)
+    op.execute("""
+        UPDATE projects
+        SET image_hash = project_images.content_hash
+        FROM project_images
+        WHERE project_images.project_id = projects.id
+    """)
+    op.drop_column('projects', 'image')
+
+
+def downgrade() -> None:
+    op.add_column('projects', sa.Column('image', sa.LargeBinary(), nullable=True))
+    op.execute("""
+        UPDATE projects
+        SET image = project_images.data
+        FROM project_images
+        WHERE project_images.project_id = projects.id
+    """)
+    op.drop_column('projects', 'image_hash')
+    op.drop_table('project_images')
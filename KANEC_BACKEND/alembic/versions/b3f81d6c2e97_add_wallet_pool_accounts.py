@@ -0,0 +1,47 @@
+"""add wallet pool accounts
+
+Pre-created Hedera accounts that registration and project creation claim
+instead of waiting on an AccountCreateTransaction.
+
+Revision ID: b3f81d6c2e97
+Revises: 7c4d1a9e5f26
+Create Date: 2026-10-18 19:12:40.318527
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f81d6c2e97'
+down_revision: Union[str, None] = '7c4d1a9e5f26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'wallet_pool_accounts',
+        sa.Column('kind', sa.Enum('user', 'project', name='walletkind'), nullable=False),
+        sa.Column('wallet_address', sa.String(length=255), nullable=False),
+        sa.Column('encrypted_private_key', sa.String(length=500), nullable=True),
+        sa.Column('claimed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('wallet_address')
+    )
+    op.create_index(
+        'ix_wallet_pool_accounts_available', 'wallet_pool_accounts', ['kind', 'created_at'],
+        postgresql_where=sa.text('claimed_at IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_wallet_pool_accounts_available', table_name='wallet_pool_accounts')
+    op.drop_table('wallet_pool_accounts')
+    sa.Enum(name='walletkind').drop(op.get_bind(), checkfirst=True)
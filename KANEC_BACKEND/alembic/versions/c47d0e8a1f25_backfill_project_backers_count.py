@@ -0,0 +1,36 @@
+"""backfill project backers_count
+
+backers_count was never maintained; recompute it from completed donations.
+
+Revision ID: c47d0e8a1f25
+Revises: 8b1e4d5c92a3
+Create Date: 2026-10-18 11:20:41.873305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47d0e8a1f25'
+down_revision: Union[str, None] = '8b1e4d5c92a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        UPDATE projects
+        SET backers_count = (
+            SELECT count(DISTINCT donations.donor_id)
+            FROM donations
+            WHERE donations.project_id = projects.id
+              AND donations.status = 'completed'
+        )
+    """)
+
+
+def downgrade() -> None:
+    pass
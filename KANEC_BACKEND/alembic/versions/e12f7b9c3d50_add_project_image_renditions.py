@@ -0,0 +1,36 @@
+"""add project image renditions
+
+Store several renditions (thumbnail, card, full) per project image. Existing
+images become the full rendition; smaller sizes fall back to it until the
+image is uploaded again.
+
+Revision ID: e12f7b9c3d50
+Revises: a9e3c6f2b814
+Create Date: 2026-10-18 16:48:09.662731
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e12f7b9c3d50'
+down_revision: Union[str, None] = 'a9e3c6f2b814'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('project_images', sa.Column('rendition', sa.String(length=20), nullable=False, server_default='full'))
+    op.alter_column('project_images', 'rendition', server_default=None)
+    op.drop_constraint('project_images_project_id_key', 'project_images', type_='unique')
+    op.create_unique_constraint('uq_project_images_project_rendition', 'project_images', ['project_id', 'rendition'])
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM project_images WHERE rendition <> 'full'")
+    op.drop_constraint('uq_project_images_project_rendition', 'project_images', type_='unique')
+    op.create_unique_constraint('project_images_project_id_key', 'project_images', ['project_id'])
+    op.drop_column('project_images', 'rendition')
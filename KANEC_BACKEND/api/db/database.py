@@ -1,8 +1,11 @@
 # api/db/database.py
 
-from sqlalchemy.orm import sessionmaker, scoped_session, declarative_base
+from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool, QueuePool, AsyncAdaptedQueuePool
 from api.utils.settings import settings
+from api.db.pool_metrics import instrumented_pool, instrument_engine
 
 DB_HOST = settings.DB_HOST
 DB_PORT = settings.DB_PORT
@@ -11,6 +14,30 @@ DB_PASSWORD = settings.DB_PASSWORD
 DB_NAME = settings.DB_NAME
 DB_TYPE = settings.DB_TYPE
 
+def pool_options(pool_class) -> dict:
+    """
+    Sizing and health-check options shared by the pooled engines.
+
+    Connections are recycled before server or load-balancer idle timeouts can
+    close them, and pre-ping replaces any that died while checked in.
+    """
+    return {
+        "poolclass": pool_class,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+def statement_timeout_args(is_async: bool = False) -> dict:
+    """Server-side statement_timeout for every connection; 0 disables it"""
+    if settings.DB_STATEMENT_TIMEOUT_MS <= 0:
+        return {}
+    if is_async:
+        return {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+    return {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+
 def get_db_engine(test_mode: bool = False):
     """
     Create and return a SQLAlchemy engine for the database.
@@ -32,13 +59,41 @@ def get_db_engine(test_mode: bool = False):
         DATABASE_URL = (
             f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
         )
-        return create_engine(DATABASE_URL)
+        return create_engine(
+            DATABASE_URL,
+            connect_args=statement_timeout_args(),
+            **pool_options(instrumented_pool(QueuePool, "sync"))
+        )
+    
+    raise ValueError(f"Unsupported DB_TYPE: {DB_TYPE}")
+
+def get_async_db_engine(**kwargs):
+    """
+    Create and return an async SQLAlchemy engine (asyncpg) for the database.
+    """
+    if DB_TYPE == "postgresql":
+        kwargs.setdefault("pool_pre_ping", settings.DB_POOL_PRE_PING)
+        return create_async_engine(
+            settings.SQLALCHEMY_ASYNC_DATABASE_URI,
+            connect_args=statement_timeout_args(is_async=True),
+            **kwargs
+        )
     
     raise ValueError(f"Unsupported DB_TYPE: {DB_TYPE}")
 
 engine = get_db_engine()
+instrument_engine(engine, "sync")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-db_session = scoped_session(SessionLocal)
+
+async_engine = get_async_db_engine(**pool_options(instrumented_pool(AsyncAdaptedQueuePool, "async")))
+instrument_engine(async_engine.sync_engine, "async")
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# asyncpg connections belong to the event loop that opened them. Celery tasks run
+# each job in a fresh loop, so they use unpooled connections that never outlive it.
+task_engine = get_async_db_engine(poolclass=NullPool)
+instrument_engine(task_engine.sync_engine, "task")
+TaskSessionLocal = async_sessionmaker(task_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 def create_database():
@@ -50,9 +105,21 @@ def create_database():
 def get_db():
     """
     Dependency to provide a database session.
+
+    Every request gets its own session, closed when the request finishes;
+    closing rolls back anything left uncommitted. Sessions are never shared
+    between requests, even when they run on the same thread.
     """
-    db = db_session()
+    db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    """
+    Dependency to provide an async database session, scoped to one request
+    like get_db.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
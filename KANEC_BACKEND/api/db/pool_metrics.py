@@ -0,0 +1,76 @@
+import time
+from typing import Type
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import Pool, QueuePool
+
+from api.utils.metrics import metrics
+
+pool_checkouts = metrics.counter("db_pool_checkouts", "Connections checked out of the pool")
+pool_waits = metrics.counter("db_pool_waits", "Checkouts that found the pool exhausted and had to wait")
+pool_timeouts = metrics.counter("db_pool_timeouts", "Checkouts that gave up after pool_timeout")
+pool_connects = metrics.counter("db_pool_connects", "New DBAPI connections opened")
+pool_invalidations = metrics.counter("db_pool_invalidations", "Connections invalidated (disconnects, failed pre-ping)")
+pool_checkout_seconds = metrics.histogram("db_pool_checkout_seconds", "Time to obtain a pooled connection")
+pool_checked_out = metrics.gauge("db_pool_checked_out", "Connections currently checked out")
+pool_overflow = metrics.gauge("db_pool_overflow", "Connections open beyond pool_size")
+pool_idle = metrics.gauge("db_pool_idle", "Connections idle in the pool")
+
+
+class InstrumentedPoolMixin:
+    """Times every checkout and counts the ones that had to wait for a connection"""
+
+    metrics_label = "default"
+
+    def connect(self):
+        waiting = self._exhausted()
+        if waiting:
+            pool_waits.inc(engine=self.metrics_label)
+        started = time.monotonic()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            pool_timeouts.inc(engine=self.metrics_label)
+            raise
+        finally:
+            pool_checkout_seconds.observe(time.monotonic() - started, engine=self.metrics_label, waited=waiting)
+
+    def _exhausted(self) -> bool:
+        if not isinstance(self, QueuePool) or self._max_overflow < 0:
+            return False
+        return self.checkedin() == 0 and self.overflow() >= self._max_overflow
+
+
+def instrumented_pool(base: Type[Pool], label: str) -> Type[Pool]:
+    """A subclass of `base` that reports checkout metrics under `label`"""
+    return type(f"Instrumented{base.__name__}", (InstrumentedPoolMixin, base), {"metrics_label": label})
+
+
+def instrument_engine(engine, label: str) -> None:
+    """
+    Export pool events and occupancy for a sync engine (or an AsyncEngine's
+    sync_engine). Gauges read `engine.pool` on every scrape because dispose()
+    swaps in a fresh pool; event listeners are carried over by SQLAlchemy.
+    """
+    pool = engine.pool
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        pool_connects.inc(engine=label)
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool_checkouts.inc(engine=label)
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        pool_invalidations.inc(engine=label, soft=False)
+
+    @event.listens_for(pool, "soft_invalidate")
+    def on_soft_invalidate(dbapi_connection, connection_record, exception):
+        pool_invalidations.inc(engine=label, soft=True)
+
+    if isinstance(pool, QueuePool):
+        pool_checked_out.set_function(lambda: engine.pool.checkedout(), engine=label)
+        pool_overflow.set_function(lambda: max(engine.pool.overflow(), 0), engine=label)
+        pool_idle.set_function(lambda: engine.pool.checkedin(), engine=label)
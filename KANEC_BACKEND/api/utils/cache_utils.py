@@ -0,0 +1,305 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+from api.utils.redis_utils import redis_client
+from api.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+cache_hits = metrics.counter("cache_hits", "Cache lookups answered from Redis or the local LRU")
+cache_misses = metrics.counter("cache_misses", "Cache lookups that had to load the value")
+cache_loads_joined = metrics.counter("cache_loads_joined", "Loads that joined an in-flight load for the same key")
+
+
+class LRUCache:
+    """Thread-safe in-process LRU with a per-entry expiry"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SingleFlight:
+    """Collapse concurrent loads of the same key into one awaitable per event loop"""
+
+    def __init__(self):
+        self._flights: Dict[Tuple[int, str], asyncio.Future] = {}
+
+    async def do(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+        flight = self._flights.get(flight_key)
+        if flight is not None:
+            cache_loads_joined.inc()
+            return await asyncio.shield(flight)
+
+        flight = loop.create_task(loader())
+        self._flights[flight_key] = flight
+        try:
+            return await asyncio.shield(flight)
+        finally:
+            if self._flights.get(flight_key) is flight:
+                del self._flights[flight_key]
+
+    def forget(self, key: str) -> None:
+        """Make the next load of `key` start afresh instead of joining a stale flight"""
+        for flight_key in [k for k in self._flights if k[1] == key]:
+            self._flights.pop(flight_key, None)
+
+
+# Delete the lock only if it still holds our token, in one round trip
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Invalidate keys across workers: give each a fresh version token, then drop
+# its value. KEYS are value keys followed by their version keys; ARGV holds
+# the token and the version key expiry (ms)
+INVALIDATE_SCRIPT = """
+local count = #KEYS / 2
+for i = 1, count do
+    redis.call("set", KEYS[count + i], ARGV[1], "PX", ARGV[2])
+    redis.call("del", KEYS[i])
+end
+return count
+"""
+
+# Write a loaded value only if the key's version is still the one seen before
+# loading ("" for none), so a load that raced an invalidation is dropped.
+# KEYS: value key, version key; ARGV: version, value, ttl (ms)
+SET_IF_CURRENT_SCRIPT = """
+if (redis.call("get", KEYS[2]) or "") ~= ARGV[1] then
+    return 0
+end
+redis.call("set", KEYS[1], ARGV[2], "PX", ARGV[3])
+return 1
+"""
+
+
+class TTLCache:
+    """
+    JSON value cache shared through Redis, falling back to an in-process LRU when
+    Redis is unavailable. `get_or_load` guarantees a single loader per key at a time:
+    per process through SingleFlight, and across workers through a short Redis lock.
+
+    Invalidation is versioned: `delete` stamps each key with a new version in
+    Redis, and a load only writes its value back if the version it saw before
+    loading is still current, so a load that started before a delete in any
+    worker cannot restore the stale value. Version stamps outlive any sane load
+    by `version_ttl` seconds.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl: float,
+        maxsize: int = 1024,
+        lock_timeout: float = 5.0,
+        version_ttl: float = 3600.0
+    ):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self.version_ttl = version_ttl
+        self.local = LRUCache(maxsize)
+        self._flight = SingleFlight()
+        # Only keys with a load in flight are tracked, so invalidating keys
+        # nobody is loading leaves nothing behind
+        self._fills: Dict[str, int] = {}
+        self._generations: Dict[str, int] = {}
+
+    def _key(self, key: str) -> str:
+        return f"cache:{self.namespace}:{key}"
+
+    def _version_key(self, key: str) -> str:
+        return f"{self._key(key)}:version"
+
+    async def get(self, key: str) -> Optional[Any]:
+        client = redis_client.client
+        if client is not None:
+            try:
+                raw = await client.get(self._key(key))
+                return json.loads(raw) if raw is not None else None
+            except Exception as e:
+                redis_client.failed(e)
+                logger.warning(f"Redis cache read failed for {self.namespace}: {str(e)}")
+        return self.local.get(key)
+
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        """Cached values for whichever of `keys` are present, in one round trip"""
+        if redis_client.available:
+            raws = await redis_client.get_many([self._key(key) for key in keys])
+            if redis_client.available:
+                return {key: json.loads(raw) for key, raw in zip(keys, raws) if raw is not None}
+        found = {key: self.local.get(key) for key in keys}
+        return {key: value for key, value in found.items() if value is not None}
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = ttl if ttl is not None else self.ttl
+        client = redis_client.client
+        if client is not None:
+            try:
+                await client.set(self._key(key), json.dumps(value), px=int(ttl * 1000))
+                return
+            except Exception as e:
+                redis_client.failed(e)
+                logger.warning(f"Redis cache write failed for {self.namespace}: {str(e)}")
+        self.local.set(key, value, ttl)
+
+    async def set_many(self, values: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """Cache several values with one pipelined write"""
+        ttl = ttl if ttl is not None else self.ttl
+        if redis_client.available:
+            encoded = {self._key(key): json.dumps(value) for key, value in values.items()}
+            if await redis_client.set_many(encoded, ttl):
+                return
+        for key, value in values.items():
+            self.local.set(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            if key in self._fills:
+                self._generations[key] += 1
+            self._flight.forget(key)
+            self.local.delete(key)
+        client = redis_client.client if keys else None
+        if client is not None:
+            try:
+                await client.eval(
+                    INVALIDATE_SCRIPT, 2 * len(keys),
+                    *[self._key(key) for key in keys], *[self._version_key(key) for key in keys],
+                    uuid.uuid4().hex, int(self.version_ttl * 1000)
+                )
+            except Exception as e:
+                redis_client.failed(e)
+                logger.warning(f"Redis cache delete failed for {self.namespace}: {str(e)}")
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[float] = None) -> Any:
+        value = await self.get(key)
+        if value is not None:
+            cache_hits.inc(namespace=self.namespace)
+            return value
+        cache_misses.inc(namespace=self.namespace)
+        return await self._flight.do(key, lambda: self._load(key, loader, ttl))
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]], ttl: Optional[float]) -> Any:
+        self._fills[key] = self._fills.get(key, 0) + 1
+        generation = self._generations.setdefault(key, 0)
+        token = None
+        try:
+            version = await self._version(key)
+            token = await self._acquire_lock(key)
+            if token is None:
+                # Another worker is loading this key; give it a chance to fill the cache
+                value = await self._wait_for(key)
+                if value is not None:
+                    return value
+            value = await loader()
+            # Skip the write-back if the key was invalidated while we were loading
+            if value is not None and self._generations[key] == generation:
+                await self._set_if_current(key, value, ttl, version)
+            return value
+        finally:
+            if token is not None:
+                await self._release_lock(key, token)
+            self._fills[key] -= 1
+            if not self._fills[key]:
+                del self._fills[key]
+                del self._generations[key]
+
+    async def _version(self, key: str) -> Optional[str]:
+        """The key's current version ("" if never invalidated), or None without Redis"""
+        client = redis_client.client
+        if client is None:
+            return None
+        try:
+            return await client.get(self._version_key(key)) or ""
+        except Exception as e:
+            redis_client.failed(e)
+            return None
+
+    async def _set_if_current(self, key: str, value: Any, ttl: Optional[float], version: Optional[str]) -> None:
+        client = redis_client.client if version is not None else None
+        if client is None:
+            await self.set(key, value, ttl)
+            return
+        ttl = ttl if ttl is not None else self.ttl
+        try:
+            await client.eval(
+                SET_IF_CURRENT_SCRIPT, 2, self._key(key), self._version_key(key),
+                version, json.dumps(value), int(ttl * 1000)
+            )
+        except Exception as e:
+            redis_client.failed(e)
+            logger.warning(f"Redis cache write failed for {self.namespace}: {str(e)}")
+            self.local.set(key, value, ttl)
+
+    async def _acquire_lock(self, key: str) -> Optional[str]:
+        client = redis_client.client
+        if client is None:
+            return ""
+        token = uuid.uuid4().hex
+        try:
+            acquired = await client.set(f"{self._key(key)}:lock", token, nx=True, px=int(self.lock_timeout * 1000))
+            return token if acquired else None
+        except Exception as e:
+            redis_client.failed(e)
+            return ""
+
+    async def _release_lock(self, key: str, token: str) -> None:
+        client = redis_client.client if token else None
+        if client is None:
+            return
+        try:
+            await client.eval(RELEASE_LOCK_SCRIPT, 1, f"{self._key(key)}:lock", token)
+        except Exception as e:
+            redis_client.failed(e)
+
+    async def _wait_for(self, key: str, interval: float = 0.05) -> Optional[Any]:
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(interval)
+            value = await self.get(key)
+            if value is not None:
+                return value
+        return None
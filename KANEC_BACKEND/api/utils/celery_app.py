@@ -1,4 +1,7 @@
 from celery import Celery
+from typing import Optional
+from uuid import UUID
+import asyncio
 from api.utils.settings import settings
 from api.utils.email_utils import email_utils
 import logging
@@ -17,6 +20,16 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    beat_schedule={
+        "replenish-wallet-pool": {
+            "task": "api.utils.celery_app.replenish_wallet_pool_task",
+            "schedule": settings.WALLET_POOL_REPLENISH_INTERVAL,
+        },
+        "sweep-pending-donations": {
+            "task": "api.utils.celery_app.sweep_pending_donations_task",
+            "schedule": settings.DONATION_SWEEP_INTERVAL,
+        },
+    },
 )
 
 @celery_app.task(bind=True, max_retries=3)
@@ -89,4 +102,52 @@ def send_password_reset_email_task(self, email: str, otp_code: str, user_name: s
         return {"status": "success", "email": email}
     except Exception as exc:
         logger.error(f"Failed to send password reset email to {email}: {str(exc)}")
-        raise self.retry(countdown=30, exc=exc)
\ No newline at end of file
+        raise self.retry(countdown=30, exc=exc)
+
+@celery_app.task(bind=True, max_retries=settings.DONATION_RECONCILE_RETRIES)
+def settle_donation_task(self, donation_id: str, retry: bool = True):
+    """
+    Celery task to settle a pending donation. A donation whose transfer outcome
+    is unknown stays pending with its transaction id; retries only reconcile
+    that id against the mirror node, so they can never submit it twice.
+    The sweep queues it with retry=False, since it comes back on its own schedule.
+    """
+    import api.v1.models  # register every mapper before the first query
+    from api.v1.models.donation import DonationStatus
+    from api.v1.services.donation import settle_donation
+
+    status = asyncio.run(settle_donation(UUID(donation_id)))
+    if status == DonationStatus.pending and retry:
+        raise self.retry(countdown=min(30 * 2 ** self.request.retries, 600))
+    return {"status": status.value, "donation_id": donation_id}
+
+@celery_app.task
+def sweep_pending_donations_task():
+    """
+    Celery task to queue settlement again for donations left pending after their
+    own task gave up or was lost. Runs on the beat schedule.
+    """
+    import api.v1.models  # register every mapper before the first query
+    from api.v1.services.donation import stale_pending_donations
+
+    donation_ids = asyncio.run(stale_pending_donations(settings.DONATION_STALE_AFTER, settings.DONATION_SWEEP_BATCH))
+    for donation_id in donation_ids:
+        settle_donation_task.delay(donation_id=str(donation_id), retry=False)
+    if donation_ids:
+        logger.warning(f"Re-queued settlement for {len(donation_ids)} stale pending donations")
+    return {"queued": len(donation_ids)}
+
+@celery_app.task
+def replenish_wallet_pool_task(kind: Optional[str] = None):
+    """
+    Celery task to top up the pre-created wallet pool, for one kind or for all.
+    Runs on the beat schedule and whenever a claim finds the pool below its
+    low-water mark.
+    """
+    import api.v1.models  # register every mapper before the first query
+    from api.v1.models.wallet_pool import WalletKind
+    from api.v1.services.wallet_pool import replenish_wallet_pool, replenish_wallet_pools
+
+    if kind:
+        return {kind: asyncio.run(replenish_wallet_pool(WalletKind(kind)))}
+    return asyncio.run(replenish_wallet_pools())
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, TypeVar
+
+from api.utils.settings import settings
+from api.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+QUERY = "query"
+TRANSACTION = "transaction"
+ACCOUNT = "account"
+
+lane_submitted = metrics.counter("hedera_executor_submitted", "Calls submitted to a Hedera executor lane")
+lane_rejected = metrics.counter("hedera_executor_rejected", "Calls rejected because the lane queue was full")
+lane_timeouts = metrics.counter("hedera_executor_timeouts", "Calls that exceeded their lane timeout")
+lane_pending = metrics.gauge("hedera_executor_pending", "Calls queued or running in a lane")
+lane_queue_seconds = metrics.histogram("hedera_executor_queue_seconds", "Time a call waited for a lane worker")
+lane_run_seconds = metrics.histogram("hedera_executor_run_seconds", "Time a call spent running on a lane worker")
+
+
+class HederaExecutorSaturated(RuntimeError):
+    """Raised when a lane already has its maximum number of calls queued"""
+
+
+class HederaCallTimeout(TimeoutError):
+    """
+    Raised when a lane call exceeds its timeout. The worker thread keeps running
+    the call; `call` completes once it returns, so resources it uses can be
+    released only then.
+    """
+
+    def __init__(self, message: str, call: Future):
+        super().__init__(message)
+        self.call = call
+
+
+class ExecutorLane:
+    """A sized thread pool dedicated to one kind of blocking Hedera SDK call"""
+
+    def __init__(self, name: str, workers: int, timeout: float, max_pending: int):
+        self.name = name
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        lane_pending.set_function(lambda: self._pending, lane=name)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix=f"hedera-{self.name}"
+                )
+            return self._executor
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, fn: Callable[..., T], *args, timeout: Optional[float] = None) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                lane_rejected.inc(lane=self.name)
+                raise HederaExecutorSaturated(f"Hedera {self.name} lane is busy, please retry shortly")
+            self._pending += 1
+        lane_submitted.inc(lane=self.name)
+
+        submitted = time.monotonic()
+
+        def timed_call():
+            started = time.monotonic()
+            lane_queue_seconds.observe(started - submitted, lane=self.name)
+            try:
+                return fn(*args)
+            finally:
+                lane_run_seconds.observe(time.monotonic() - started, lane=self.name)
+                self._release()
+
+        try:
+            call = self.executor.submit(timed_call)
+        except Exception:
+            self._release()
+            raise
+        # A call cancelled before it reached a worker never runs timed_call
+        call.add_done_callback(lambda f: f.cancelled() and self._release())
+        future = asyncio.wrap_future(call)
+
+        limit = timeout if timeout is not None else self.timeout
+        try:
+            return await asyncio.wait_for(future, limit)
+        except asyncio.TimeoutError:
+            # The worker thread keeps running; the pending count drops once it returns
+            lane_timeouts.inc(lane=self.name)
+            logger.warning(f"Hedera {self.name} call timed out after {limit}s")
+            raise HederaCallTimeout(f"Hedera {self.name} call timed out after {limit}s", call)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class HederaExecutor:
+    """
+    Runs blocking Hedera SDK calls on dedicated lanes so that slow consensus nodes
+    cannot starve other operations or the default asyncio executor.
+    """
+
+    def __init__(self, lanes: Dict[str, ExecutorLane]):
+        self.lanes = lanes
+
+    def lane(self, name: str) -> ExecutorLane:
+        try:
+            return self.lanes[name]
+        except KeyError:
+            raise ValueError(f"Unknown Hedera executor lane: {name}")
+
+    async def run(self, lane: str, fn: Callable[..., T], *args, timeout: Optional[float] = None) -> T:
+        return await self.lane(lane).run(fn, *args, timeout=timeout)
+
+    def shutdown(self) -> None:
+        for lane in self.lanes.values():
+            lane.shutdown()
+
+
+hedera_executor = HederaExecutor({
+    QUERY: ExecutorLane(
+        QUERY,
+        workers=settings.HEDERA_QUERY_WORKERS,
+        timeout=settings.HEDERA_QUERY_TIMEOUT,
+        max_pending=settings.HEDERA_LANE_MAX_PENDING
+    ),
+    TRANSACTION: ExecutorLane(
+        TRANSACTION,
+        workers=settings.HEDERA_TRANSACTION_WORKERS,
+        timeout=settings.HEDERA_TRANSACTION_TIMEOUT,
+        max_pending=settings.HEDERA_LANE_MAX_PENDING
+    ),
+    ACCOUNT: ExecutorLane(
+        ACCOUNT,
+        workers=settings.HEDERA_ACCOUNT_WORKERS,
+        timeout=settings.HEDERA_ACCOUNT_TIMEOUT,
+        max_pending=settings.HEDERA_LANE_MAX_PENDING
+    ),
+})
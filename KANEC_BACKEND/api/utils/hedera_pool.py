@@ -0,0 +1,274 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from contextlib import asynccontextmanager
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+import grpc
+from hiero_sdk_python import Client, AccountId, PrivateKey, Network
+from hiero_sdk_python.exceptions import MaxAttemptsError
+
+from api.utils.settings import settings
+from api.utils.hedera_executor import HederaCallTimeout
+from api.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Errors that point at the client's node connections rather than at the request itself
+NODE_FAILURE_ERRORS = (MaxAttemptsError, grpc.RpcError, ConnectionError, TimeoutError)
+
+pool_hits = metrics.counter("hedera_client_pool_hits", "Checkouts served by an idle pooled client")
+pool_misses = metrics.counter("hedera_client_pool_misses", "Checkouts that had to build a new client")
+pool_waits = metrics.counter("hedera_client_pool_waits", "Checkouts that waited for a client to be released")
+pool_wait_timeouts = metrics.counter("hedera_client_pool_wait_timeouts", "Checkouts that gave up waiting")
+pool_discards = metrics.counter("hedera_client_pool_discards", "Clients closed because they were unhealthy or expired")
+pool_wait_seconds = metrics.histogram("hedera_client_pool_wait_seconds", "Time spent waiting for a pooled client")
+pool_clients = metrics.gauge("hedera_client_pool_clients", "Clients owned by the pool")
+
+
+def build_hedera_client() -> Client:
+    """
+    Build a Hedera client for testnet or mainnet with the operator configured.
+    Blocking: the SDK fetches the node address book while constructing the network.
+    """
+    try:
+        network = settings.HEDERA_NETWORK.lower()
+        client = Client(Network(network='testnet' if network == 'testnet' else 'mainnet'))
+
+        account_id = AccountId.from_string(settings.HEDERA_OPERATOR_ID)
+        operator_key = PrivateKey.from_string(settings.HEDERA_OPERATOR_KEY)
+
+        logger.debug(f"Building Hedera client for operator {account_id} on {network}")
+
+        client.set_operator(account_id, operator_key)
+        return client
+
+    except ValueError as e:
+        logger.error(f"Invalid Hedera configuration: {str(e)}")
+        raise ValueError(f"Invalid Hedera configuration: {str(e)}")
+    except Exception as e:
+        logger.error(f"Unexpected error building Hedera client: {type(e).__name__}: {str(e)}")
+        raise ValueError(f"Failed to initialize Hedera client: {type(e).__name__}: {str(e)}")
+
+
+class HederaClientPool:
+    """
+    Bounded, process-wide pool of Hedera clients.
+
+    Clients are expensive to build (node discovery plus gRPC channels), so they are
+    created once and reused. State is guarded by a thread lock and waiters are woken
+    through their own event loop, so the pool can be shared by the API loop and by
+    short-lived loops such as those started from Celery tasks.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        acquire_timeout: float = 10.0,
+        max_age: float = 3600.0,
+        factory: Callable[[], Client] = build_hedera_client
+    ):
+        self.size = size
+        self.acquire_timeout = acquire_timeout
+        self.max_age = max_age
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._idle: Deque[Client] = deque()
+        self._created_at: Dict[int, float] = {}
+        self._total = 0
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = deque()
+        pool_clients.set_function(lambda: self._total)
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    @property
+    def in_use_count(self) -> int:
+        return self._total - len(self._idle)
+
+    async def start(self) -> None:
+        """Warm the pool at startup. Failures are logged and clients are built lazily instead."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            missing = self.size - self._total
+            self._total += missing
+        warmed: List[Client] = []
+        for _ in range(missing):
+            try:
+                warmed.append(await loop.run_in_executor(None, self._create))
+            except Exception as e:
+                logger.warning(f"Could not warm Hedera client pool: {str(e)}")
+                break
+        with self._lock:
+            self._total -= missing - len(warmed)
+        for client in warmed:
+            self._put_back(client)
+        logger.info(f"Hedera client pool started with {len(warmed)}/{self.size} clients")
+
+    async def close(self) -> None:
+        """Close every idle client; in-flight clients are closed when released."""
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._total -= len(idle)
+        for client in idle:
+            self._destroy(client)
+
+    async def acquire(self) -> Client:
+        loop = asyncio.get_running_loop()
+        future = None
+        build = False
+        with self._lock:
+            while self._idle:
+                client = self._idle.pop()
+                if self._is_healthy(client):
+                    pool_hits.inc()
+                    return client
+                self._total -= 1
+                self._destroy(client)
+            if self._total < self.size:
+                self._total += 1
+                build = True
+            else:
+                future = loop.create_future()
+                self._waiters.append((loop, future))
+
+        if build:
+            pool_misses.inc()
+            return await self._build_reserved(loop)
+
+        pool_waits.inc()
+        started = time.monotonic()
+        try:
+            client = await asyncio.wait_for(asyncio.shield(future), self.acquire_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                try:
+                    self._waiters.remove((loop, future))
+                except ValueError:
+                    pass
+            # The slot may have been handed over just as we gave up; a pending
+            # hand-over sees the cancelled future and returns the client itself
+            if not future.cancel():
+                self._hand_back(future.result())
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            pool_wait_timeouts.inc()
+            raise TimeoutError(f"Timed out after {self.acquire_timeout}s waiting for a Hedera client")
+        finally:
+            pool_wait_seconds.observe(time.monotonic() - started)
+
+        if client is None:
+            # A broken client was discarded and its slot handed to us
+            pool_misses.inc()
+            return await self._build_reserved(loop)
+        return client
+
+    def release(self, client: Client, healthy: bool = True) -> None:
+        if not healthy or not self._is_healthy(client):
+            with self._lock:
+                self._total -= 1
+            self._destroy(client)
+            self._wake_for_new_slot()
+            return
+        self._put_back(client)
+
+    @asynccontextmanager
+    async def client(self):
+        """Check out a client, discarding it if the node connection failed while in use"""
+        client = await self.acquire()
+        healthy = True
+        deferred = False
+        try:
+            yield client
+        except HederaCallTimeout as e:
+            # The lane gave up but its worker thread may still be using the client
+            deferred = True
+            e.call.add_done_callback(lambda call: self._release_after(client, call))
+            raise
+        except NODE_FAILURE_ERRORS:
+            healthy = False
+            raise
+        finally:
+            if not deferred:
+                self.release(client, healthy=healthy)
+
+    def _release_after(self, client: Client, call: Future) -> None:
+        """Release a client once the timed-out call that was using it has returned"""
+        healthy = call.cancelled() or not isinstance(call.exception(), NODE_FAILURE_ERRORS)
+        self.release(client, healthy=healthy)
+
+    def _create(self) -> Client:
+        client = self._factory()
+        with self._lock:
+            self._created_at[id(client)] = time.monotonic()
+        return client
+
+    async def _build_reserved(self, loop: asyncio.AbstractEventLoop) -> Client:
+        try:
+            return await loop.run_in_executor(None, self._create)
+        except Exception:
+            with self._lock:
+                self._total -= 1
+            self._wake_for_new_slot()
+            raise
+
+    def _is_healthy(self, client: Client) -> bool:
+        created = self._created_at.get(id(client))
+        if created is None or time.monotonic() - created > self.max_age:
+            return False
+        return client.mirror_channel is not None and bool(getattr(client.network, "nodes", None))
+
+    def _put_back(self, client: Client) -> None:
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                if future.done() or loop.is_closed():
+                    continue
+                loop.call_soon_threadsafe(self._resolve, future, client)
+                return
+            self._idle.append(client)
+
+    def _hand_back(self, client: Optional[Client]) -> None:
+        if client is None:
+            with self._lock:
+                self._total -= 1
+            self._wake_for_new_slot()
+        else:
+            self._put_back(client)
+
+    def _wake_for_new_slot(self) -> None:
+        """Let the oldest waiter build a replacement client in the freed slot"""
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                if future.done() or loop.is_closed():
+                    continue
+                self._total += 1
+                loop.call_soon_threadsafe(self._resolve, future, None)
+                return
+
+    def _resolve(self, future: asyncio.Future, client: Optional[Client]) -> None:
+        if future.done():
+            self._hand_back(client)
+        else:
+            future.set_result(client)
+
+    def _destroy(self, client: Client) -> None:
+        pool_discards.inc()
+        self._created_at.pop(id(client), None)
+        try:
+            client.close()
+        except Exception as e:
+            logger.debug(f"Error closing Hedera client: {str(e)}")
+
+
+hedera_pool = HederaClientPool(
+    size=settings.HEDERA_CLIENT_POOL_SIZE,
+    acquire_timeout=settings.HEDERA_CLIENT_ACQUIRE_TIMEOUT,
+    max_age=settings.HEDERA_CLIENT_MAX_AGE
+)
@@ -0,0 +1,43 @@
+import io
+from typing import Dict, Sequence, Tuple, Union
+
+from PIL import Image
+
+# (name, bounding box, WEBP quality), largest first
+RenditionSpec = Sequence[Tuple[str, Tuple[int, int], int]]
+
+
+class ImageTooLarge(ValueError):
+    """Raised for images whose pixel count exceeds the decompression-bomb limit"""
+
+
+def render_renditions(source: Union[str, bytes], renditions: RenditionSpec, max_pixels: int) -> Dict[str, bytes]:
+    """
+    Decode an upload (a file path or the raw bytes) once and encode every
+    rendition from it as WEBP. Each rendition is scaled down from the previous,
+    larger one.
+
+    The pixel count is checked from the header before anything is decoded.
+    Runs in media pool worker processes, so it only depends on PIL.
+    """
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    try:
+        image = Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+    except Image.DecompressionBombError:
+        raise ImageTooLarge(f"Image exceeds {max_pixels} pixels")
+    if image.width * image.height > max_pixels:
+        raise ImageTooLarge(f"Image exceeds {max_pixels} pixels")
+
+    # Convert to RGB if necessary (for JPEG)
+    if image.mode in ('RGBA', 'P'):
+        image = image.convert('RGB')
+
+    rendered = {}
+    for name, box, quality in renditions:
+        # Resize image while maintaining aspect ratio
+        image.thumbnail(box, Image.Resampling.LANCZOS)
+        output = io.BytesIO()
+        image.save(output, 'WEBP', quality=quality, optimize=True)
+        rendered[name] = output.getvalue()
+
+    return rendered
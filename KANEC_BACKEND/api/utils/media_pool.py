@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from api.utils.settings import settings
+from api.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+media_submitted = metrics.counter("media_pool_submitted", "Jobs submitted to the media worker pool")
+media_rejected = metrics.counter("media_pool_rejected", "Jobs rejected because the media pool was full")
+media_timeouts = metrics.counter("media_pool_timeouts", "Jobs that exceeded the media job timeout")
+media_pending = metrics.gauge("media_pool_pending", "Jobs queued or running in the media pool")
+media_job_seconds = metrics.histogram("media_pool_job_seconds", "Time from submitting a media job to its result")
+
+
+class MediaPoolSaturated(RuntimeError):
+    """Raised when the media pool already has its maximum number of jobs queued"""
+
+
+class MediaPool:
+    """
+    Process pool for CPU-bound media work such as image decoding and encoding,
+    so it neither blocks the event loop nor holds the API process's GIL.
+
+    Workers are spawned rather than forked and only import what the job
+    function needs. Jobs must be picklable module-level functions.
+    """
+
+    def __init__(self, workers: int, timeout: float, max_pending: int):
+        self.workers = workers
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        media_pending.set_function(lambda: self._pending)
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def run(self, fn: Callable[..., T], *args, timeout: Optional[float] = None) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                media_rejected.inc()
+                raise MediaPoolSaturated("Image processing is busy, please retry shortly")
+            self._pending += 1
+        media_submitted.inc()
+
+        started = time.monotonic()
+        try:
+            call = self.executor.submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        # The pending slot is held until the worker finishes, even after a timeout
+        call.add_done_callback(lambda f: self._release())
+
+        limit = timeout if timeout is not None else self.timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(call), limit)
+        except asyncio.TimeoutError:
+            media_timeouts.inc()
+            logger.warning(f"Media job {getattr(fn, '__name__', fn)} timed out after {limit}s")
+            raise TimeoutError(f"Image processing timed out after {limit}s")
+        finally:
+            media_job_seconds.observe(time.monotonic() - started)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+media_pool = MediaPool(
+    workers=settings.MEDIA_WORKERS,
+    timeout=settings.MEDIA_JOB_TIMEOUT,
+    max_pending=settings.MEDIA_MAX_PENDING
+)
@@ -0,0 +1,181 @@
+import asyncio
+import importlib.util
+import logging
+import random
+import time
+import weakref
+from typing import Iterator, Optional
+
+import httpx
+
+from api.utils.settings import settings
+from api.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+mirror_requests = metrics.counter("mirror_node_requests", "Requests sent to the Hedera mirror node")
+mirror_errors = metrics.counter("mirror_node_errors", "Mirror node requests that failed without a response")
+mirror_request_seconds = metrics.histogram("mirror_node_request_seconds", "Mirror node request latency")
+mirror_indexing_lag = metrics.histogram(
+    "mirror_node_indexing_lag_seconds",
+    "Time from consensus until a fresh transaction was first found on the mirror node",
+    buckets=(0.5, 1.0, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 30.0, 60.0)
+)
+
+
+def mirror_node_base_url(network: Optional[str] = None) -> str:
+    network = (network or settings.HEDERA_NETWORK).lower()
+    return f"https://{'testnet' if network == 'testnet' else 'mainnet'}.mirrornode.hedera.com"
+
+
+def _endpoint(path: str) -> str:
+    """Collapse a request path to its resource name so metric labels stay bounded"""
+    parts = [part for part in path.split("?")[0].split("/") if part]
+    if parts[:2] == ["api", "v1"]:
+        parts = parts[2:]
+    return parts[0] if parts else "root"
+
+
+class IndexingWait:
+    """
+    Polling schedule for a transaction that may not be on the mirror node yet.
+
+    Transactions older than `fresh_window` seconds (measured from their valid
+    start) are looked up once, immediately. Fresh ones wait until they are about
+    `expected_lag` seconds old, then poll with full-jitter exponential backoff
+    until `timeout` seconds after their valid start.
+    """
+
+    def __init__(
+        self,
+        expected_lag: float = 10.0,
+        fresh_window: float = 120.0,
+        timeout: float = 45.0,
+        base_delay: float = 0.5,
+        max_delay: float = 4.0
+    ):
+        self.expected_lag = expected_lag
+        self.fresh_window = fresh_window
+        self.timeout = timeout
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def is_fresh(self, valid_start: float) -> bool:
+        return time.time() - valid_start < self.fresh_window
+
+    def delays(self, valid_start: float) -> Iterator[float]:
+        """Yield the delay before each lookup attempt; stop when the budget is spent"""
+        age = time.time() - valid_start
+        if age >= self.fresh_window:
+            yield 0.0
+            return
+
+        first = max(0.0, self.expected_lag - age)
+        yield first
+        remaining = self.timeout - max(age, 0.0) - first
+        attempt = 0
+        while remaining > 0:
+            delay = min(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)), remaining)
+            remaining -= delay
+            attempt += 1
+            yield delay
+
+
+def record_indexing_lag(consensus_timestamp: Optional[str]) -> None:
+    """Record how long after consensus a transaction became visible"""
+    try:
+        lag = time.time() - float(consensus_timestamp)
+    except (TypeError, ValueError):
+        return
+    mirror_indexing_lag.observe(max(lag, 0.0))
+
+
+class MirrorNodeClient:
+    """
+    Keep-alive HTTP client for the Hedera mirror node.
+
+    httpx clients are bound to the event loop they first run on, so one client is
+    kept per loop: the API loop gets a long-lived client opened at startup, and
+    short-lived loops (Celery tasks) get their own and close it when they finish.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 30.0,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self._transport = transport
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+    def _build(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=self.limits,
+            http2=self.http2,
+            transport=self._transport,
+            headers={"Accept": "application/json"}
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = self._build()
+            self._clients[loop] = client
+        return client
+
+    async def start(self) -> None:
+        self.client
+        logger.info(f"Mirror node client ready for {self.base_url} (http2={self.http2})")
+
+    async def close(self) -> None:
+        """Close the client owned by the running event loop"""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    async def get(self, path: str, **params) -> httpx.Response:
+        endpoint = _endpoint(path)
+        started = time.monotonic()
+        try:
+            response = await self.client.get(path, params=params or None)
+        except httpx.HTTPError as e:
+            mirror_errors.inc(endpoint=endpoint, error=type(e).__name__)
+            mirror_request_seconds.observe(time.monotonic() - started, endpoint=endpoint, status="error")
+            raise
+        mirror_requests.inc(endpoint=endpoint, status=response.status_code)
+        mirror_request_seconds.observe(time.monotonic() - started, endpoint=endpoint, status=response.status_code)
+        return response
+
+
+mirror_node = MirrorNodeClient(
+    mirror_node_base_url(),
+    timeout=settings.MIRROR_NODE_TIMEOUT,
+    max_connections=settings.MIRROR_NODE_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.MIRROR_NODE_MAX_KEEPALIVE,
+    keepalive_expiry=settings.MIRROR_NODE_KEEPALIVE_EXPIRY,
+    http2=settings.MIRROR_NODE_HTTP2
+)
+
+indexing_wait = IndexingWait(
+    expected_lag=settings.MIRROR_NODE_INDEXING_LAG,
+    fresh_window=settings.MIRROR_NODE_FRESH_WINDOW,
+    timeout=settings.MIRROR_NODE_INDEXING_TIMEOUT
+)
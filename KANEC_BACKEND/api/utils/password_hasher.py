@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
+from passlib.context import CryptContext
+
+from api.utils.settings import settings
+from api.utils.metrics import metrics
+
+T = TypeVar("T")
+
+hash_submitted = metrics.counter("password_hasher_submitted", "Password hash/verify calls submitted to the hasher pool")
+hash_rejected = metrics.counter("password_hasher_rejected", "Calls rejected because the hasher pool was full")
+hash_rehashed = metrics.counter("password_hasher_rehashed", "Stored hashes upgraded to the current cost on login")
+hash_pending = metrics.gauge("password_hasher_pending", "Calls queued or running in the hasher pool")
+hash_seconds = metrics.histogram("password_hasher_seconds", "Time from submitting a hash/verify call to its result")
+
+
+class PasswordHasherSaturated(RuntimeError):
+    """Raised when the hasher pool already has its maximum number of calls queued"""
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a small thread pool so a login no
+    longer blocks the event loop for the full cost of a hash. bcrypt releases
+    the GIL while it works, so threads give real parallelism here.
+
+    The number of calls queued or running is capped; beyond that callers get
+    PasswordHasherSaturated straight away instead of waiting behind the queue.
+    """
+
+    def __init__(self, context: CryptContext, workers: int, max_pending: int):
+        self.context = context
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+        hash_pending.set_function(lambda: self._pending)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="password-hasher"
+                )
+            return self._executor
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                hash_rejected.inc()
+                raise PasswordHasherSaturated("Too many sign-in attempts in progress, please retry shortly")
+            self._pending += 1
+        hash_submitted.inc()
+
+        started = time.monotonic()
+        try:
+            call = self.executor.submit(fn, *args)
+        except Exception:
+            self._release()
+            raise
+        # The slot is held until the worker finishes, even if the request goes away
+        call.add_done_callback(lambda f: self._release())
+        try:
+            return await asyncio.wrap_future(call)
+        finally:
+            hash_seconds.observe(time.monotonic() - started)
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed: Optional[str]) -> bool:
+        if not hashed:
+            return False
+        return await self._run(self.context.verify, password, hashed)
+
+    async def verify_and_update(self, password: str, hashed: Optional[str]) -> Tuple[bool, Optional[str]]:
+        """
+        Verify `password` and, when the stored hash uses an outdated scheme or a
+        cost below the configured minimum, also return a replacement hash that
+        the caller should persist.
+        """
+        if not hashed:
+            return False, None
+        valid, new_hash = await self._run(self.context.verify_and_update, password, hashed)
+        if new_hash is not None:
+            hash_rehashed.inc()
+        return valid, new_hash
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_HASH_MIN_ROUNDS
+)
+
+password_hasher = PasswordHasher(
+    pwd_context,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
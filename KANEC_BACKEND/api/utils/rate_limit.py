@@ -0,0 +1,202 @@
+import hashlib
+import logging
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Request, status
+from jose import jwt, JWTError
+
+from api.utils.settings import settings
+from api.utils.redis_utils import redis_client
+from api.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+rate_limit_checks = metrics.counter("rate_limit_checks", "Requests checked against a rate limit")
+rate_limit_rejected = metrics.counter("rate_limit_rejected", "Requests rejected by a rate limit")
+rate_limit_local = metrics.counter("rate_limit_local", "Checks answered by the in-process limiter because Redis was down")
+
+IP = "ip"
+EMAIL = "email"
+USER = "user"
+
+# Checks every window first and only records the hit when all of them have
+# room, so a rejected request never counts against the caller. Each KEYS[i]
+# is a sorted set of hit timestamps (ms); ARGV holds the hit id and then a
+# limit and window (ms) per key. Returns 0 when allowed, otherwise the ms
+# until the tightest full window frees a slot.
+SLIDING_WINDOW_SCRIPT = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[i * 2])
+    local window = tonumber(ARGV[i * 2 + 1])
+    redis.call("ZREMRANGEBYSCORE", key, "-inf", now - window)
+    if redis.call("ZCARD", key) >= limit then
+        local oldest = redis.call("ZRANGE", key, 0, 0, "WITHSCORES")
+        wait = math.max(wait, tonumber(oldest[2]) + window - now)
+    end
+end
+if wait > 0 then
+    return wait
+end
+for i, key in ipairs(KEYS) do
+    redis.call("ZADD", key, now, ARGV[1])
+    redis.call("PEXPIRE", key, tonumber(ARGV[i * 2 + 1]))
+end
+return 0
+"""
+
+
+@dataclass(frozen=True)
+class Rule:
+    """At most `limit` requests per `window` seconds for each value of `by`"""
+    by: str
+    limit: int
+    window: float
+
+
+class LocalSlidingWindow:
+    """In-process equivalent of SLIDING_WINDOW_SCRIPT, used while Redis is down"""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._hits: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, checks: Sequence[Tuple[str, int, float]]) -> float:
+        now = time.monotonic()
+        with self._lock:
+            wait = 0.0
+            for key, limit, window in checks:
+                hits = self._hits.get(key)
+                if hits is None:
+                    continue
+                while hits and hits[0] <= now - window:
+                    hits.popleft()
+                if len(hits) >= limit:
+                    wait = max(wait, hits[0] + window - now)
+            if wait > 0:
+                return wait
+            for key, _, window in checks:
+                self._hits.setdefault(key, deque()).append(now)
+                self._hits.move_to_end(key)
+            while len(self._hits) > self.maxsize:
+                self._hits.popitem(last=False)
+            return 0.0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._hits.clear()
+
+
+local_limiter = LocalSlidingWindow()
+
+
+def client_ip(request: Request) -> Optional[str]:
+    if settings.RATE_LIMIT_TRUST_PROXY:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else None
+
+
+async def request_email(request: Request) -> Optional[str]:
+    """The email a login/signup/reset request is about, from the query, JSON body or login form"""
+    email = request.query_params.get("email")
+    if not email:
+        content_type = request.headers.get("content-type", "")
+        try:
+            if content_type.startswith("application/json"):
+                body = await request.json()
+                email = body.get("email") if isinstance(body, dict) else None
+            elif content_type.startswith(("application/x-www-form-urlencoded", "multipart/form-data")):
+                email = (await request.form()).get("username")
+        except Exception:
+            email = None
+    return email.strip().lower() if isinstance(email, str) and email.strip() else None
+
+
+def token_subject(request: Request) -> Optional[str]:
+    """The subject of a valid bearer token; authentication itself still happens in get_current_user"""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]).get("sub")
+    except JWTError:
+        return None
+
+
+async def identity(request: Request, by: str) -> Optional[str]:
+    if by == IP:
+        return client_ip(request)
+    if by == EMAIL:
+        return await request_email(request)
+    if by == USER:
+        return token_subject(request)
+    raise ValueError(f"Unknown rate limit key: {by}")
+
+
+class RateLimiter:
+    """
+    FastAPI dependency enforcing sliding-window limits for one endpoint.
+
+    All rules are checked and recorded together in one Redis round trip. A rule
+    whose identity is missing from the request (no email, no token) is skipped.
+    While Redis is down the limits are enforced per process instead.
+    """
+
+    def __init__(self, scope: str, *rules: Rule):
+        self.scope = scope
+        self.rules = rules
+        self._script = None
+
+    def _key(self, rule: Rule, value: str) -> str:
+        digest = hashlib.sha256(value.encode()).hexdigest()[:32]
+        return f"ratelimit:{self.scope}:{rule.by}:{digest}"
+
+    async def __call__(self, request: Request) -> None:
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        checks: List[Tuple[str, int, float]] = []
+        for rule in self.rules:
+            value = await identity(request, rule.by)
+            if value:
+                checks.append((self._key(rule, value), rule.limit, rule.window))
+        if not checks:
+            return
+
+        rate_limit_checks.inc(scope=self.scope)
+        wait = await self.hit(checks)
+        if wait > 0:
+            rate_limit_rejected.inc(scope=self.scope)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, please try again later",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))}
+            )
+
+    async def hit(self, checks: Sequence[Tuple[str, int, float]]) -> float:
+        """Record a request against every check; returns 0 if allowed, else seconds to wait"""
+        client = redis_client.client
+        if client is not None:
+            if self._script is None:
+                self._script = client.register_script(SLIDING_WINDOW_SCRIPT)
+            args = [uuid.uuid4().hex]
+            for _, limit, window in checks:
+                args += [limit, int(window * 1000)]
+            try:
+                wait_ms = await self._script(keys=[key for key, _, _ in checks], args=args, client=client)
+                return int(wait_ms) / 1000
+            except Exception as e:
+                redis_client.failed(e)
+                logger.warning(f"Rate limit check for {self.scope} fell back to in-process: {str(e)}")
+        rate_limit_local.inc(scope=self.scope)
+        return local_limiter.hit(checks)
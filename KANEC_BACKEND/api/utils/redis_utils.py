@@ -1,86 +1,204 @@
-import redis
-import json
-from api.utils.settings import settings
+import asyncio
 import logging
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Sequence
+
+import redis.asyncio as redis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError, TimeoutError
+
+from api.utils.settings import settings
+from api.utils.metrics import metrics
 
 logger = logging.getLogger(__name__)
 
+redis_errors = metrics.counter("redis_errors", "Redis commands that failed after retries")
+redis_unavailable = metrics.counter("redis_unavailable", "Redis calls skipped while Redis was marked down")
+
+
+class RedisUnavailable(ConnectionError):
+    """Raised by `pipeline()` while Redis is disabled or marked down"""
+
+
 class RedisClient:
-    def __init__(self):
+    """
+    Async Redis access shared by OTP storage and the Redis-backed caches.
+
+    Each event loop gets its own client and connection pool, because asyncio
+    connections cannot be shared across loops (Celery tasks run each job in a
+    fresh `asyncio.run`). Transient connection errors are retried with backoff;
+    once they are exhausted Redis is marked down for REDIS_DOWN_COOLDOWN
+    seconds, so callers fall back immediately instead of each waiting for a
+    connect timeout, and the next call after the cooldown reconnects.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, redis.Redis]" = weakref.WeakKeyDictionary()
+        self._down_until = 0.0
+
+    def _create(self) -> redis.Redis:
+        options = dict(
+            decode_responses=True,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+            socket_keepalive=True,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+            retry=Retry(ExponentialBackoff(cap=0.5, base=0.02), settings.REDIS_RETRIES),
+        )
+        if settings.REDIS_URL:
+            return redis.Redis.from_url(settings.REDIS_URL, **options)
+        return redis.Redis(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            password=settings.REDIS_PASSWORD or None,
+            **options
+        )
+
+    @property
+    def client(self) -> Optional[redis.Redis]:
+        """The client for the running loop, or None while Redis is disabled or marked down"""
+        if not self.enabled:
+            return None
+        if time.monotonic() < self._down_until:
+            redis_unavailable.inc()
+            return None
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = self._create()
+        return client
+
+    @property
+    def available(self) -> bool:
+        return self.enabled and time.monotonic() >= self._down_until
+
+    def failed(self, error: Exception) -> None:
+        """Record a failed command; connection-level failures mark Redis down for a while"""
+        redis_errors.inc(error=type(error).__name__)
+        if isinstance(error, (ConnectionError, TimeoutError, OSError)):
+            if self.available:
+                logger.error(f"Redis unavailable, falling back for {settings.REDIS_DOWN_COOLDOWN}s: {str(error)}")
+            self._down_until = time.monotonic() + settings.REDIS_DOWN_COOLDOWN
+
+    async def ping(self) -> bool:
+        client = self.client
+        if client is None:
+            return False
         try:
-            if settings.REDIS_URL:
-                self.redis_client = redis.from_url(settings.REDIS_URL)
-            else:
-                self.redis_client = redis.Redis(
-                    host=settings.REDIS_HOST,
-                    port=settings.REDIS_PORT,
-                    db=settings.REDIS_DB,
-                    password=settings.REDIS_PASSWORD,
-                    decode_responses=True,
-                    socket_connect_timeout=5,
-                    socket_timeout=5,
-                    retry_on_timeout=True
-                )
-            self.redis_client.ping()
-            logger.info("Redis connection established successfully")
+            return await client.ping()
         except Exception as e:
-            logger.error(f"Failed to connect to Redis: {str(e)}")
-            self.redis_client = None
+            self.failed(e)
+            return False
+
+    @asynccontextmanager
+    async def pipeline(self, transaction: bool = False):
+        """
+        Buffer commands and send them in one round trip on exit. Raises
+        RedisUnavailable when there is no client; command errors propagate.
+        """
+        client = self.client
+        if client is None:
+            raise RedisUnavailable("Redis is not available")
+        async with client.pipeline(transaction=transaction) as pipe:
+            yield pipe
+            try:
+                await pipe.execute()
+            except Exception as e:
+                self.failed(e)
+                raise
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[str]]:
+        """Values for `keys` in one MGET; all None when Redis is unavailable"""
+        client = self.client
+        if client is None or not keys:
+            return [None] * len(keys)
+        try:
+            return await client.mget(keys)
+        except Exception as e:
+            self.failed(e)
+            return [None] * len(keys)
+
+    async def set_many(self, values: Dict[str, str], ttl: float) -> bool:
+        """Set every key with the same expiry in one pipelined round trip"""
+        if not values:
+            return True
+        try:
+            async with self.pipeline() as pipe:
+                for key, value in values.items():
+                    pipe.set(key, value, px=int(ttl * 1000))
+            return True
+        except Exception as e:
+            logger.warning(f"Redis write of {len(values)} keys failed: {str(e)}")
+            return False
 
     async def set_otp(self, email: str, otp_code: str, expires_in: int = 600) -> bool:
         """Store OTP in Redis with expiration (default 10 minutes)"""
-        if not self.redis_client:
+        client = self.client
+        if client is None:
             logger.error("Redis client not available")
             return False
-            
+
         try:
             key = f"otp:{email}"
-            self.redis_client.setex(key, expires_in, otp_code)
+            await client.setex(key, expires_in, otp_code)
             logger.info(f"OTP stored for {email}")
             return True
         except Exception as e:
+            self.failed(e)
             logger.error(f"Failed to store OTP for {email}: {str(e)}")
             return False
 
-    async def get_otp(self, email: str) -> str:
+    async def get_otp(self, email: str) -> Optional[str]:
         """Retrieve OTP from Redis"""
-        if not self.redis_client:
+        client = self.client
+        if client is None:
             logger.error("Redis client not available")
             return None
-            
+
         try:
             key = f"otp:{email}"
-            otp = self.redis_client.get(key)
-            return otp
+            return await client.get(key)
         except Exception as e:
+            self.failed(e)
             logger.error(f"Failed to get OTP for {email}: {str(e)}")
             return None
 
     async def delete_otp(self, email: str) -> bool:
         """Delete OTP from Redis"""
-        if not self.redis_client:
+        client = self.client
+        if client is None:
             logger.error("Redis client not available")
             return False
-            
+
         try:
             key = f"otp:{email}"
-            self.redis_client.delete(key)
+            await client.delete(key)
             return True
         except Exception as e:
+            self.failed(e)
             logger.error(f"Failed to delete OTP for {email}: {str(e)}")
             return False
 
     async def is_otp_valid(self, email: str, otp_code: str) -> bool:
         """Check if OTP is valid"""
-        if not self.redis_client:
-            logger.error("Redis client not available")
-            return False
-            
         stored_otp = await self.get_otp(email)
-        
-        if isinstance(stored_otp, bytes):
-            stored_otp = stored_otp.decode('utf-8')
-        
-        return stored_otp == otp_code
+        return stored_otp is not None and stored_otp == otp_code
+
+    async def close(self) -> None:
+        """Close the client for the running loop"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
 
-redis_client = RedisClient()
\ No newline at end of file
+redis_client = RedisClient()
@@ -34,6 +34,17 @@ class Settings(BaseSettings):
     REDIS_DB: Optional[int] = 0
     REDIS_PASSWORD: Optional[str] = ""
     REDIS_URL: Optional[str] = None
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_CONNECT_TIMEOUT: float = 2.0
+    REDIS_SOCKET_TIMEOUT: float = 2.0
+    REDIS_HEALTH_CHECK_INTERVAL: int = 30
+    REDIS_RETRIES: int = 2
+    # After retries are exhausted, skip Redis for this long before reconnecting
+    REDIS_DOWN_COOLDOWN: float = 5.0
+
+    RATE_LIMIT_ENABLED: bool = True
+    # Take the client address from X-Forwarded-For; only enable behind a proxy that sets it
+    RATE_LIMIT_TRUST_PROXY: bool = False
 
     CELERY_BROKER_URL: Optional[str] = None
     CELERY_RESULT_BACKEND: Optional[str] = None
@@ -43,6 +54,66 @@ class Settings(BaseSettings):
     HEDERA_OPERATOR_KEY: str
     PRIVATE_KEY_ENCRYPTION_KEY: str
 
+    HEDERA_CLIENT_POOL_SIZE: int = 4
+    HEDERA_CLIENT_ACQUIRE_TIMEOUT: float = 10.0
+    HEDERA_CLIENT_MAX_AGE: int = 3600
+
+    HEDERA_QUERY_WORKERS: int = 8
+    HEDERA_TRANSACTION_WORKERS: int = 8
+    HEDERA_ACCOUNT_WORKERS: int = 2
+    HEDERA_QUERY_TIMEOUT: float = 15.0
+    HEDERA_TRANSACTION_TIMEOUT: float = 60.0
+    HEDERA_ACCOUNT_TIMEOUT: float = 60.0
+    HEDERA_LANE_MAX_PENDING: int = 100
+    # Celery retries, with backoff, for a donation whose transfer outcome is not known yet
+    DONATION_RECONCILE_RETRIES: int = 8
+    # Pending donations untouched for this long are settled again by the beat sweep
+    DONATION_STALE_AFTER: float = 900.0
+    DONATION_SWEEP_INTERVAL: float = 300.0
+    DONATION_SWEEP_BATCH: int = 100
+
+    BALANCE_CACHE_TTL: float = 10.0
+    BALANCE_CACHE_MAXSIZE: int = 10000
+
+    PRINCIPAL_CACHE_TTL: float = 60.0
+    PRINCIPAL_CACHE_MAXSIZE: int = 10000
+
+    PASSWORD_HASH_ROUNDS: int = 12
+    # Stored hashes below this cost are rehashed at PASSWORD_HASH_ROUNDS on login
+    PASSWORD_HASH_MIN_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 16
+
+    WALLET_POOL_USER_LOW_WATER: int = 10
+    WALLET_POOL_USER_TARGET: int = 25
+    WALLET_POOL_PROJECT_LOW_WATER: int = 2
+    WALLET_POOL_PROJECT_TARGET: int = 5
+    WALLET_POOL_REPLENISH_BATCH: int = 10
+    WALLET_POOL_REPLENISH_INTERVAL: float = 60.0
+
+    MIRROR_NODE_CONCURRENCY: int = 10
+    MIRROR_NODE_TIMEOUT: float = 30.0
+    MIRROR_NODE_MAX_CONNECTIONS: int = 20
+    MIRROR_NODE_MAX_KEEPALIVE: int = 10
+    MIRROR_NODE_KEEPALIVE_EXPIRY: float = 30.0
+    MIRROR_NODE_HTTP2: bool = True
+    MIRROR_NODE_INDEXING_LAG: float = 10.0
+    MIRROR_NODE_FRESH_WINDOW: float = 120.0
+    MIRROR_NODE_INDEXING_TIMEOUT: float = 45.0
+
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+
+    MEDIA_WORKERS: int = 2
+    MEDIA_MAX_PENDING: int = 8
+    MEDIA_JOB_TIMEOUT: float = 30.0
+    MEDIA_MAX_IMAGE_PIXELS: int = 40_000_000
+    MAX_IMAGE_UPLOAD_BYTES: int = 10 * 1024 * 1024
+
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
         return (
@@ -50,6 +121,13 @@ class Settings(BaseSettings):
             f"@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         )
 
+    @property
+    def SQLALCHEMY_ASYNC_DATABASE_URI(self) -> str:
+        return (
+            f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}"
+            f"@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+        )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,64 @@
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+# shard.realm.num followed by the valid start, in any of the forms we have stored or
+# received: SDK (0.0.5@1700000000.5), mirror node (0.0.5-1700000000-000000005)
+# and the legacy stored form (0.0.5-1700000000.5)
+_TRANSACTION_ID = re.compile(r"^(\d+\.\d+\.\d+)[@-](\d+)[.-](\d{1,9})$")
+
+
+@dataclass(frozen=True)
+class HederaTransactionId:
+    """
+    A Hedera transaction id: the payer account plus the transaction valid start.
+
+    The SDK prints nanoseconds without padding, so 0.0.5@1700000000.5 means five
+    nanoseconds, not half a second. `to_mirror` gives the one canonical form we
+    store and send to the mirror node.
+    """
+
+    account_id: str
+    seconds: int
+    nanos: int
+
+    @classmethod
+    def parse(cls, value: str) -> "HederaTransactionId":
+        match = _TRANSACTION_ID.match(value.strip())
+        if match is None:
+            raise ValueError(f"Invalid Hedera transaction id: {value}")
+        account_id, seconds, nanos = match.groups()
+        return cls(account_id, int(seconds), int(nanos))
+
+    @classmethod
+    def from_sdk(cls, transaction_id) -> "HederaTransactionId":
+        """Build from a hiero_sdk_python TransactionId"""
+        return cls(str(transaction_id.account_id), transaction_id.valid_start.seconds, transaction_id.valid_start.nanos)
+
+    @property
+    def valid_start(self) -> float:
+        """Valid start as a unix timestamp"""
+        return self.seconds + self.nanos / 1_000_000_000
+
+    def to_mirror(self) -> str:
+        return f"{self.account_id}-{self.seconds}-{self.nanos:09d}"
+
+    def to_sdk(self) -> str:
+        return f"{self.account_id}@{self.seconds}.{self.nanos:09d}"
+
+    def __str__(self) -> str:
+        return self.to_mirror()
+
+
+def to_mirror_tx_id(value: str) -> str:
+    """Canonical mirror-node form of a transaction id string"""
+    return HederaTransactionId.parse(value).to_mirror()
+
+
+def try_parse_tx_id(value: Optional[str]) -> Optional[HederaTransactionId]:
+    if not value:
+        return None
+    try:
+        return HederaTransactionId.parse(value)
+    except ValueError:
+        return None
@@ -0,0 +1,101 @@
+import os
+import re
+import tempfile
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException, UploadFile
+
+CHUNK_SIZE = 64 * 1024
+# Room for multipart boundaries and part headers around the file itself
+MULTIPART_OVERHEAD = 16 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """Raised when an upload exceeds its byte limit"""
+
+
+class UnsupportedUpload(ValueError):
+    """Raised when an upload's content is not an accepted image format"""
+
+
+def sniff_image_format(head: bytes) -> Optional[str]:
+    """Image format from the file's leading magic bytes, or None if not recognised"""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+@asynccontextmanager
+async def spooled_upload(upload: UploadFile, max_bytes: int, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[str]:
+    """
+    Copy an uploaded image to a temporary file chunk by chunk and yield its
+    path; the file is removed on exit. The content type is checked on the first
+    chunk and the size on every chunk, so a rejected upload is never read in
+    full or held in memory.
+    """
+    handle = tempfile.NamedTemporaryFile(prefix="upload-", delete=False)
+    try:
+        with handle:
+            size = 0
+            while chunk := await upload.read(chunk_size):
+                if size == 0 and sniff_image_format(chunk) is None:
+                    raise UnsupportedUpload("Invalid image format. Allowed: jpg, jpeg, png, gif, webp")
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(f"Image exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+                handle.write(chunk)
+        if size == 0:
+            raise UnsupportedUpload("Empty upload")
+        yield handle.name
+    finally:
+        os.unlink(handle.name)
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject request bodies over `max_bytes` on upload routes before they are
+    parsed: by Content-Length up front, and by counting for chunked bodies.
+    """
+
+    def __init__(self, app, max_bytes: int, path_pattern: str):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_pattern = re.compile(path_pattern)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.path_pattern.search(scope["path"]):
+            return await self.app(scope, receive, send)
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            return await self._reject(send)
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise HTTPException(status_code=413, detail="Request body too large")
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    async def _reject(self, send) -> None:
+        body = b'{"detail":"Request body too large"}'
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
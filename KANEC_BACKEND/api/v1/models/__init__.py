@@ -1,5 +1,8 @@
 from api.v1.models.user import User
 from api.v1.models.project import Project
+from api.v1.models.project_image import ProjectImage
 from api.v1.models.donation import Donation
 from api.v1.models.organization import Organization
+from api.v1.models.transaction_verification import TransactionVerification
 from api.v1.models.base_class import BaseModel
+from api.v1.models.wallet_pool import WalletPoolAccount
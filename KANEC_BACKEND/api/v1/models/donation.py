@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Float, String, ForeignKey, Enum
+from sqlalchemy import Column, Float, String, ForeignKey, Enum, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import enum
@@ -14,6 +14,18 @@ class DonationStatus(enum.Enum):
 
 class Donation(BaseModel):
     __tablename__ = "donations"
+    __table_args__ = (
+        # a donor's history, newest first
+        Index("ix_donations_donor_status_created", "donor_id", "status", "created_at"),
+        # per-project analytics, transparency and the backers count
+        Index("ix_donations_project_status_created", "project_id", "status", "created_at"),
+        # platform-wide stats and recent activity only ever look at completed donations
+        Index(
+            "ix_donations_completed_created",
+            "created_at",
+            postgresql_where=text("status = 'completed'")
+        ),
+    )
 
     donor_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Boolean, Float, ForeignKey, Integer, LargeBinary
+from sqlalchemy import Column, String, Text, Boolean, Float, ForeignKey, Integer, Index, text, func, literal_column
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -7,21 +7,60 @@ from api.v1.models.base_class import BaseModel
 
 class Project(BaseModel):
     __tablename__ = "projects"
+    __table_args__ = (
+        # recommendations and listings only show verified projects, best funded first
+        Index(
+            "ix_projects_verified_category_raised",
+            "category",
+            "amount_raised",
+            postgresql_where=text("verified")
+        ),
+        # keyset pagination of the listing: each sort key plus id as tie-breaker
+        Index(
+            "ix_projects_verified_raised",
+            "amount_raised",
+            "id",
+            postgresql_where=text("verified")
+        ),
+        Index(
+            "ix_projects_verified_created",
+            "created_at",
+            "id",
+            postgresql_where=text("verified")
+        ),
+    )
 
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)
     category = Column(String(100), nullable=False)
     target_amount = Column(Float, nullable=False)
-    amount_raised = Column(Float, default=0.0)
+    amount_raised = Column(Float, default=0.0, nullable=False)
     backers_count = Column(Integer, default=0)
     location = Column(String(255), nullable=True)
     verified = Column(Boolean, default=False)
     wallet_address = Column(String(255), nullable=False)
-    image = Column(LargeBinary, nullable=True) 
+    # content hash of the current image in project_images; the bytes never live on this row
+    image_hash = Column(String(64), nullable=True)
     image_mime_type = Column(String(50), nullable=True)
 
     created_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
 
     # relationships
     creator = relationship("User", back_populates="projects")
-    donations = relationship("Donation", back_populates="project", cascade="all, delete-orphan")
\ No newline at end of file
+    donations = relationship("Donation", back_populates="project", cascade="all, delete-orphan")
+
+
+# Share of the target raised, 0 when there is no target. Constants are inlined
+# so queries match the expression index below.
+completion_ratio = func.coalesce(
+    Project.amount_raised.op("/", return_type=Float)(func.nullif(Project.target_amount, literal_column("0"))),
+    literal_column("0"),
+    type_=Float
+)
+
+Index(
+    "ix_projects_verified_completion",
+    completion_ratio,
+    Project.id,
+    postgresql_where=text("verified")
+)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, Integer, ForeignKey, LargeBinary, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import deferred
+
+from api.v1.models.base_class import BaseModel
+
+
+class ProjectImage(BaseModel):
+    __tablename__ = "project_images"
+    __table_args__ = (
+        UniqueConstraint("project_id", "rendition", name="uq_project_images_project_rendition"),
+    )
+
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    # one of ImageSize: thumbnail, card or full
+    rendition = Column(String(20), nullable=False, default="full")
+    # sha256 of `data`, hex encoded; the full rendition's hash is mirrored on Project.image_hash
+    content_hash = Column(String(64), nullable=False)
+    mime_type = Column(String(50), nullable=False)
+    size = Column(Integer, nullable=False)
+    # only loaded when the image itself is served
+    data = deferred(Column(LargeBinary, nullable=False))
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, Boolean, Float, JSON
+
+from api.v1.models.base_class import BaseModel
+
+
+class TransactionVerification(BaseModel):
+    __tablename__ = "transaction_verifications"
+
+    # transaction id in mirror-node form, e.g. 0.0.1234-1700000000-000000001
+    tx_id = Column(String(255), unique=True, nullable=False, index=True)
+    valid = Column(Boolean, nullable=False)
+    result = Column(String(50), nullable=True)
+    amount = Column(Float, nullable=False, default=0.0)
+    from_account = Column(String(255), nullable=True)
+    to_account = Column(String(255), nullable=True)
+    consensus_timestamp = Column(String(40), nullable=True)
+    transfers = Column(JSON, nullable=True)
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, DateTime, Enum, Index, text
+import enum
+
+from api.v1.models.base_class import BaseModel
+
+
+class WalletKind(enum.Enum):
+    user = "user"
+    project = "project"
+
+
+class WalletPoolAccount(BaseModel):
+    """A Hedera account created ahead of time, waiting to be handed to a new user or project"""
+    __tablename__ = "wallet_pool_accounts"
+    __table_args__ = (
+        # claims take the oldest unclaimed account of a kind
+        Index(
+            "ix_wallet_pool_accounts_available",
+            "kind", "created_at",
+            postgresql_where=text("claimed_at IS NULL")
+        ),
+    )
+
+    kind = Column(Enum(WalletKind), nullable=False)
+    wallet_address = Column(String(255), unique=True, nullable=False)
+    # only user accounts keep a key, matching wallets created at registration
+    encrypted_private_key = Column(String(500), nullable=True)
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
@@ -7,8 +7,8 @@ from uuid import UUID
 
 from api.db.database import get_db
 from api.v1.services.auth import get_current_user
+from api.v1.services.principal import Principal
 from api.v1.services.analytics import DonationAnalytics
-from api.v1.models.user import User
 from api.v1.models.donation import Donation, DonationStatus
 from api.v1.models.project import Project
 from api.v1.schemas.analytics import (
@@ -19,12 +19,14 @@ from api.v1.schemas.analytics import (
     CategoryAnalytics
 )
 
+# Analytics runs blocking queries and pandas/scikit-learn work on the sync session,
+# so these handlers are plain functions that FastAPI runs in its threadpool
 analytics = APIRouter(prefix="/analytics", tags=["analytics"])
 
 @analytics.get("/user/insights", response_model=UserInsightsResponse)
-async def get_user_insights(
+def get_user_insights(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get AI-powered donation insights and personalized recommendations for the current user.
@@ -41,7 +43,7 @@ async def get_user_insights(
     """
     try:
         analytics = DonationAnalytics(db)
-        insights_data = await analytics.get_user_insights(current_user.id)
+        insights_data = analytics.get_user_insights(current_user.id)
         
         return UserInsightsResponse(
             user_id=str(current_user.id),
@@ -53,7 +55,7 @@ async def get_user_insights(
         raise HTTPException(status_code=500, detail=f"Error generating insights: {str(e)}")
 
 @analytics.get("/global/stats", response_model=GlobalStats)
-async def get_global_analytics(db: Session = Depends(get_db)):
+def get_global_analytics(db: Session = Depends(get_db)):
     """
     Get global donation statistics across the entire platform.
     
@@ -88,7 +90,7 @@ async def get_global_analytics(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error generating global stats: {str(e)}")
 
 @analytics.get("/platform/overview", response_model=PlatformAnalytics)
-async def get_platform_analytics(db: Session = Depends(get_db)):
+def get_platform_analytics(db: Session = Depends(get_db)):
     """
     Get comprehensive platform analytics including category breakdowns.
     
@@ -161,7 +163,7 @@ async def get_platform_analytics(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Error generating platform analytics: {str(e)}")
 
 @analytics.get("/project/{project_id}", response_model=ProjectAnalytics)
-async def get_project_analytics(
+def get_project_analytics(
     project_id: UUID,
     db: Session = Depends(get_db)
 ):
@@ -212,7 +214,7 @@ async def get_project_analytics(
         raise HTTPException(status_code=500, detail=f"Error generating project analytics: {str(e)}")
 
 @analytics.get("/categories/top")
-async def get_top_categories(
+def get_top_categories(
     limit: int = Query(10, ge=1, le=50, description="Number of top categories to return"),
     db: Session = Depends(get_db)
 ):
@@ -260,16 +262,16 @@ async def get_top_categories(
         raise HTTPException(status_code=500, detail=f"Error generating category analytics: {str(e)}")
 
 @analytics.get("/user/compare")
-async def compare_user_with_average(
+def compare_user_with_average(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Compare current user's donation behavior with platform averages.
     """
     try:        
         analytics = DonationAnalytics(db)
-        user_insights = await analytics.get_user_insights(current_user.id)
+        user_insights = analytics.get_user_insights(current_user.id)
         
         total_donations = db.query(Donation).filter(Donation.status == DonationStatus.completed).count()
         total_amount = db.query(func.sum(Donation.amount)).filter(Donation.status == DonationStatus.completed).scalar() or 0
@@ -1,13 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordRequestForm
-from api.db.database import get_db
+from api.db.database import get_async_db
 from api.v1.services.auth import register_user, login_user, get_current_user, login_user_swagger, ENCRYPTION_KEY, update_user_profile, change_user_password, delete_user_account
 from api.v1.services.hedera import get_wallet_balance, decrypt_private_key
 from api.v1.schemas.user import UserCreate, Login, UserResponse, UserUpdate, PasswordChange, ForgotPasswordRequest, ResetPassword
 
 from api.v1.models.user import User
 from api.v1.services.otp import otp_service
+from api.v1.services.principal import Principal
+from api.utils.rate_limit import RateLimiter, Rule, IP, EMAIL
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,8 +18,13 @@ logger = logging.getLogger(__name__)
 
 auth = APIRouter(prefix="/auth", tags=["auth"])
 
-@auth.post("/register", status_code=status.HTTP_201_CREATED, response_model=dict)
-async def register_user_endpoint(user: UserCreate, db: Session = Depends(get_db)):
+register_limit = RateLimiter("register", Rule(IP, 10, 3600), Rule(EMAIL, 3, 3600))
+login_limit = RateLimiter("login", Rule(IP, 20, 60), Rule(EMAIL, 10, 300))
+resend_verification_limit = RateLimiter("resend-verification", Rule(IP, 10, 600), Rule(EMAIL, 3, 600))
+forgot_password_limit = RateLimiter("forgot-password", Rule(IP, 10, 900), Rule(EMAIL, 3, 900))
+
+@auth.post("/register", status_code=status.HTTP_201_CREATED, response_model=dict, dependencies=[Depends(register_limit)])
+async def register_user_endpoint(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Register a new user.
     """
@@ -26,8 +34,8 @@ async def register_user_endpoint(user: UserCreate, db: Session = Depends(get_db)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-@auth.post("/login", response_model=dict)
-async def login_user_endpoint(login: Login, db: Session = Depends(get_db)):
+@auth.post("/login", response_model=dict, dependencies=[Depends(login_limit)])
+async def login_user_endpoint(login: Login, db: AsyncSession = Depends(get_async_db)):
     """
     Authenticate a user and return a JWT token.
     """
@@ -38,16 +46,16 @@ async def login_user_endpoint(login: Login, db: Session = Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
 @auth.get("/me", response_model=UserResponse)
-async def get_current_user_endpoint(current_user: User = Depends(get_current_user)):
+async def get_current_user_endpoint(current_user: Principal = Depends(get_current_user)):
     """
     Get the current authenticated user's details.
     """
     return UserResponse.from_orm(current_user)
 
-@auth.post("/login_swagger", response_model=dict)
+@auth.post("/login_swagger", response_model=dict, dependencies=[Depends(login_limit)])
 async def login_user_endpoint(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Authenticate a user and return a JWT token (OAuth2 password flow).
@@ -59,12 +67,13 @@ async def login_user_endpoint(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e))
 
 @auth.get("/export-wallet")
-async def export_wallet(current_user: User = Depends(get_current_user)):
+async def export_wallet(current_user: Principal = Depends(get_current_user), db: AsyncSession = Depends(get_async_db)):
     """
     Allow users to export their private key (advanced feature).
     """
+    user = await current_user.load(db)
     # Decrypt and return private key
-    decrypted_key = decrypt_private_key(current_user.encrypted_private_key, ENCRYPTION_KEY)
+    decrypted_key = decrypt_private_key(user.encrypted_private_key, ENCRYPTION_KEY)
     
     return {
         "warning": "KEEP THIS PRIVATE KEY SECRET! Anyone with this key can access your funds.",
@@ -78,7 +87,7 @@ async def export_wallet(current_user: User = Depends(get_current_user)):
 async def verify_email(
     email: str, 
     otp_code: str, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Verify user email with OTP code.
@@ -95,10 +104,10 @@ async def verify_email(
             detail=str(e)
         )
 
-@auth.post("/resend-verification", status_code=status.HTTP_200_OK, response_model=dict)
+@auth.post("/resend-verification", status_code=status.HTTP_200_OK, response_model=dict, dependencies=[Depends(resend_verification_limit)])
 async def resend_verification(
     email: str, 
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Resend verification OTP code.
@@ -117,12 +126,12 @@ async def resend_verification(
 @auth.get("/verification-status", response_model=dict)
 async def get_verification_status(
     email: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Check if a user's email is verified.
     """
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).where(User.email == email))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -136,11 +145,14 @@ async def get_verification_status(
 
 
 @auth.get("/profile", response_model=dict)
-async def get_user_profile(current_user: User = Depends(get_current_user)):
+async def get_user_profile(current_user: Principal = Depends(get_current_user)):
     """
     Get current user profile with wallet balance.
     """
-    balance = await get_wallet_balance(current_user.wallet_address)
+    try:
+        balance = await get_wallet_balance(current_user.wallet_address)
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     
     return {
         "id": current_user.id,
@@ -155,14 +167,14 @@ async def get_user_profile(current_user: User = Depends(get_current_user)):
 @auth.put("/profile", response_model=UserResponse)
 async def update_profile(
     user_update: UserUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update current user's profile information
     """
     try:
-        updated_user = await update_user_profile(db, current_user, user_update)
+        updated_user = await update_user_profile(db, await current_user.load(db), user_update)
         return UserResponse.from_orm(updated_user)
     except ValueError as e:
         raise HTTPException(
@@ -173,14 +185,14 @@ async def update_profile(
 @auth.post("/change-password", status_code=status.HTTP_200_OK)
 async def change_password(
     password_change: PasswordChange,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Change current user's password
     """
     try:
-        await change_user_password(db, current_user, password_change)
+        await change_user_password(db, await current_user.load(db), password_change)
         return {
             "message": "Password changed successfully"
         }
@@ -193,14 +205,14 @@ async def change_password(
 @auth.delete("/account", status_code=status.HTTP_200_OK)
 async def delete_account(
     password: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete current user's account
     """
     try:
-        await delete_user_account(db, current_user, password)
+        await delete_user_account(db, await current_user.load(db), password)
         return {
             "message": "Account deleted successfully"
         }
@@ -213,14 +225,14 @@ async def delete_account(
 @auth.patch("/profile", response_model=UserResponse)
 async def partial_update_profile(
     user_update: UserUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Partially update current user's profile information
     """
     try:
-        updated_user = await update_user_profile(db, current_user, user_update)
+        updated_user = await update_user_profile(db, await current_user.load(db), user_update)
         return UserResponse.from_orm(updated_user)
     except ValueError as e:
         raise HTTPException(
@@ -228,10 +240,10 @@ async def partial_update_profile(
             detail=str(e)
         )
     
-@auth.post("/forgot-password", status_code=status.HTTP_200_OK)
+@auth.post("/forgot-password", status_code=status.HTTP_200_OK, dependencies=[Depends(forgot_password_limit)])
 async def forgot_password(
     request: ForgotPasswordRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Request password reset OTP
@@ -250,7 +262,7 @@ async def forgot_password(
 @auth.post("/reset-password", status_code=status.HTTP_200_OK)
 async def reset_password(
     reset_data: ResetPassword,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Reset password with OTP verification
@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from api.db.database import get_db
-from api.v1.services.hedera import donate_hbar, verify_transaction, update_raised_amount, donate_hbar_from_user, get_wallet_balance
-from api.v1.services.donation import create_donation, get_user_completed_donations
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.db.database import get_async_db
+from api.v1.services.hedera import get_wallet_balance
+from api.v1.services.donation import create_donation, get_user_completed_donations, get_user_donation
+from api.utils.celery_app import settle_donation_task
 from api.v1.schemas.donation import DonationCreate, DonationResponse, UserDonationResponse
 from api.v1.models.project import Project
 from api.v1.services.auth import get_current_user
 from api.v1.models.donation import Donation, DonationStatus
 from typing import List
+from uuid import UUID
 import logging
 
 logging.basicConfig(level=logging.DEBUG)
@@ -16,51 +18,44 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/donations", tags=["donations"])
 
-@router.post("/", response_model=DonationResponse)
-async def make_donation(donation: DonationCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+@router.post("/", response_model=DonationResponse, status_code=202)
+async def make_donation(donation: DonationCreate, db: AsyncSession = Depends(get_async_db), current_user=Depends(get_current_user)):
     """
-    Process a donation to a project using the current user's wallet.
+    Accept a donation to a project from the current user's wallet.
+    The donation is recorded as pending and settled in the background;
+    poll GET /donations/{donation_id} for the outcome.
     """
-    project = db.query(Project).filter(Project.id == donation.project_id).first()
+    project = await db.get(Project, donation.project_id)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
     # Check if user has a wallet
-    if not current_user.wallet_address or not current_user.encrypted_private_key:
+    if not current_user.wallet_address or not current_user.has_wallet_key:
         raise HTTPException(status_code=400, detail="User wallet not configured")
     
     # Check user balance
-    user_balance = await get_wallet_balance(current_user.wallet_address)
+    try:
+        user_balance = await get_wallet_balance(current_user.wallet_address)
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     if user_balance < donation.amount:
         raise HTTPException(status_code=400, detail="Insufficient balance")
     
-    tx_hash = None
+    new_donation = await create_donation(db, donation, None, current_user.id, status="pending")
     try:
-        # Use the new function that gets private key from database
-        tx_hash = await donate_hbar_from_user(
-            user_id=current_user.id,
-            project_wallet=project.wallet_address,
-            amount_hbar=donation.amount,
-            db=db
-        )
-        
-        # Create donation record
-        new_donation = await create_donation(db, donation, tx_hash, current_user.id, status="completed")
-        await update_raised_amount(db, donation.project_id, donation.amount)
-        
-        logger.info(f"Donation completed: {donation.amount} HBAR from user {current_user.id} to project {project.id}")
-        return new_donation
-        
+        settle_donation_task.delay(donation_id=str(new_donation.id))
     except Exception as e:
-        if tx_hash:
-            existing_donation = db.query(Donation).filter(Donation.tx_hash == tx_hash).first()
-            if not existing_donation:
-                new_donation = await create_donation(db, donation, tx_hash, current_user.id, status="failed")
-        raise HTTPException(status_code=400, detail=str(e))
+        logger.error(f"Failed to queue settlement for donation {new_donation.id}: {str(e)}")
+        new_donation.status = DonationStatus.failed
+        await db.commit()
+        raise HTTPException(status_code=503, detail="Donations are temporarily unavailable, please retry shortly")
+
+    logger.info(f"Donation {new_donation.id} queued: {donation.amount} HBAR from user {current_user.id} to project {project.id}")
+    return new_donation
     
 @router.get("/my-donations", response_model=List[UserDonationResponse])
 async def get_my_donations(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user)
 ):
     """
@@ -75,4 +70,18 @@ async def get_my_donations(
         raise HTTPException(
             status_code=500, 
             detail="Failed to fetch donations"
-        )
\ No newline at end of file
+        )
+
+@router.get("/{donation_id}", response_model=DonationResponse)
+async def get_donation_status(
+    donation_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_user)
+):
+    """
+    Get a donation made by the current user, including its settlement status
+    """
+    donation = await get_user_donation(db, donation_id, current_user.id)
+    if not donation:
+        raise HTTPException(status_code=404, detail="Donation not found")
+    return donation
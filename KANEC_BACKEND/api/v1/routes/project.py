@@ -1,17 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Response
-from sqlalchemy.orm import Session
-from api.db.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Response, Header, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.db.database import get_async_db
 from api.v1.services.hedera import create_project_wallet
-from api.v1.services.project import create_project, get_verified_projects, get_project_by_id, verify_project, get_project_transparency, upload_project_image, get_project_image
-from api.v1.schemas.project import ProjectCreate, ProjectResponse
+from api.v1.services.project import create_project, get_verified_projects, list_projects, get_project_by_id, verify_project, get_project_transparency, upload_project_image, get_project_image, get_project_image_meta, image_version, get_project_with_donations, stream_project_transparency
+from api.v1.services.verification import get_stored_verifications
+from api.v1.schemas.project import ProjectCreate, ProjectResponse, ImageSize, ProjectPage, ProjectSort, SortOrder, FundingStatus
 from api.v1.services.auth import get_current_user
+from api.utils.http_cache import etag_for, etag_matches, cache_headers
+from api.utils.media_pool import MediaPoolSaturated
+from api.utils.uploads import UploadTooLarge, UnsupportedUpload
 from uuid import UUID
-from typing import List
+from typing import List, Optional
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 @router.post("/", response_model=ProjectResponse)
-async def create_project_endpoint(project: ProjectCreate, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+async def create_project_endpoint(project: ProjectCreate, db: AsyncSession = Depends(get_async_db), current_user=Depends(get_current_user)):
     """
     Create a new project with a Hedera wallet.
     """
@@ -29,7 +34,7 @@ async def create_project_endpoint(project: ProjectCreate, db: Session = Depends(
 async def upload_project_image_endpoint(
     project_id: UUID,
     image: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user=Depends(get_current_user)
 ):
     """
@@ -39,37 +44,54 @@ async def upload_project_image_endpoint(
         if current_user.role.value not in ["admin", "org"]:
             raise HTTPException(status_code=403, detail="Only admins or orgs can upload project images")
         
-        # Validate image file type
-        if image.filename:
-            file_extension = image.filename.lower().split('.')[-1]
-            if f".{file_extension}" not in {'.jpg', '.jpeg', '.png', '.gif', '.webp'}:
-                raise HTTPException(status_code=400, detail="Invalid image format. Allowed: jpg, jpeg, png, gif, webp")
-        
+        # The image format is checked from the content while it is streamed
         updated_project = await upload_project_image(db, project_id, image, current_user.id)
         return updated_project
-    except HTTPException as e:
+    except (HTTPException, MediaPoolSaturated) as e:
         raise e
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UnsupportedUpload as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{project_id}/image")
 async def get_project_image_endpoint(
     project_id: UUID,
-    db: Session = Depends(get_db)
+    size: ImageSize = ImageSize.full,
+    v: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get project image as binary data.
+    Get project image as binary data, in the requested rendition.
+
+    The ETag is the image's content hash. A matching If-None-Match gets a 304
+    without the image being read. Requests for the current versioned URL
+    (?v=...) are cacheable for a year; anything else must revalidate.
     """
     try:
-        image_data, mime_type = await get_project_image(db, project_id)
-        return Response(content=image_data, media_type=mime_type)
+        meta = await get_project_image_meta(db, project_id, size)
+        if not meta:
+            raise ValueError("Project or image not found")
+
+        etag = etag_for(meta.content_hash)
+        headers = cache_headers(etag, meta.updated_at, immutable=bool(meta.image_hash) and v == image_version(meta.image_hash))
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        image_data, mime_type = await get_project_image(db, project_id, size)
+        return Response(content=image_data, media_type=mime_type, headers=headers)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/", response_model=List[ProjectResponse])
-async def get_verified_projects_endpoint(db: Session = Depends(get_db)):
+async def get_verified_projects_endpoint(db: AsyncSession = Depends(get_async_db)):
     """
     Get all verified projects.
     """
@@ -79,8 +101,37 @@ async def get_verified_projects_endpoint(db: Session = Depends(get_db)):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/list", response_model=ProjectPage)
+async def list_projects_endpoint(
+    category: Optional[str] = None,
+    location: Optional[str] = None,
+    funding: Optional[FundingStatus] = None,
+    sort: ProjectSort = ProjectSort.amount_raised,
+    order: SortOrder = SortOrder.desc,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    List verified projects a page at a time, with optional filters and sorting.
+    Pass `next_cursor` from a response as `cursor` to fetch the next page.
+    """
+    try:
+        return await list_projects(
+            db,
+            category=category,
+            location=location,
+            funding=funding,
+            sort=sort,
+            order=order,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/{project_id}", response_model=ProjectResponse)
-async def get_project_endpoint(project_id: UUID, db: Session = Depends(get_db)):
+async def get_project_endpoint(project_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """
     Get a single project by ID.
     """
@@ -95,7 +146,7 @@ async def get_project_endpoint(project_id: UUID, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{project_id}/transparency")
-async def get_project_transparency_endpoint(project_id: UUID, db: Session = Depends(get_db)):
+async def get_project_transparency_endpoint(project_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """
     Get transparency details for a project.
     """
@@ -106,8 +157,26 @@ async def get_project_transparency_endpoint(project_id: UUID, db: Session = Depe
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.get("/{project_id}/transparency/stream")
+async def stream_project_transparency_endpoint(project_id: UUID, db: AsyncSession = Depends(get_async_db)):
+    """
+    Stream transparency details for a project as newline-delimited JSON,
+    emitting each donation as soon as it has been verified.
+    """
+    try:
+        project, donations = await get_project_with_donations(db, project_id)
+        known = await get_stored_verifications(db, [donation.tx_hash for donation in donations])
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(
+        stream_project_transparency(project, donations, known),
+        media_type="application/x-ndjson"
+    )
+
 @router.patch("/{project_id}/verify")
-async def verify_project_endpoint(project_id: UUID, db: Session = Depends(get_db), current_user=Depends(get_current_user)):
+async def verify_project_endpoint(project_id: UUID, db: AsyncSession = Depends(get_async_db), current_user=Depends(get_current_user)):
     """
     Verify a project (admin only).
     """
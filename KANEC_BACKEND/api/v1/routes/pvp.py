@@ -1,24 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from api.db.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.db.database import get_async_db
 from api.v1.services.hedera import donate_hbar_from_user, get_wallet_balance, transfer_hbar_p2p
 from api.v1.services.auth import get_current_user
-from api.v1.models.user import User
+from api.v1.services.principal import Principal
 from api.v1.schemas.pvp import P2PTransferRequest, P2PTransferResponse
+from api.utils.rate_limit import RateLimiter, Rule, IP, USER
+from api.utils.hedera_executor import HederaExecutorSaturated
 from uuid import UUID
 
 p2p = APIRouter(prefix="/p2p", tags=["p2p-transfers"])
 
-@p2p.post("/transfer", response_model=P2PTransferResponse)
+transfer_limit = RateLimiter("p2p-transfer", Rule(USER, 10, 60), Rule(IP, 30, 60))
+
+@p2p.post("/transfer", response_model=P2PTransferResponse, dependencies=[Depends(transfer_limit)])
 async def transfer_hbar(
     transfer: P2PTransferRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Transfer HBAR from current user's wallet to another wallet.
     """
-    if not current_user.wallet_address or not current_user.encrypted_private_key:
+    if not current_user.wallet_address or not current_user.has_wallet_key:
         raise HTTPException(status_code=400, detail="User wallet not configured")
     
     if not transfer.recipient_wallet.startswith("0.0."):
@@ -32,7 +36,10 @@ async def transfer_hbar(
     if transfer.amount > 10000:  
         raise HTTPException(status_code=400, detail="Amount too large. Maximum transfer is 10,000 HBAR")
     
-    user_balance = await get_wallet_balance(current_user.wallet_address)
+    try:
+        user_balance = await get_wallet_balance(current_user.wallet_address)
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     if user_balance < transfer.amount:
         raise HTTPException(
             status_code=400, 
@@ -57,14 +64,21 @@ async def transfer_hbar(
             memo=transfer.memo
         )
         
+    except HederaExecutorSaturated:
+        raise
+    except TimeoutError as e:
+        raise HTTPException(
+            status_code=504,
+            detail=f"{str(e)}. The transfer may still complete; check your balance before retrying"
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Transfer failed: {str(e)}")
     
 
 @p2p.get("/balance")
 async def get_user_balance(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Get current user's HBAR balance.
@@ -81,6 +95,10 @@ async def get_user_balance(
             "balance_tinybars": int(balance * 100_000_000)
         }
         
+    except HederaExecutorSaturated:
+        raise
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to get balance: {str(e)}")
 
@@ -103,6 +121,10 @@ async def validate_wallet(wallet_address: str):
             "balance_hbar": balance
         }
         
+    except HederaExecutorSaturated:
+        raise
+    except TimeoutError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         return {
             "valid": True,
@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from api.db.database import get_db
-from api.v1.services.hedera import trace_transaction
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.db.database import get_async_db
+from api.v1.services.verification import trace_transaction
 
 router = APIRouter(prefix="/trace", tags=["trace"])
 
 @router.get("/trace/{tx_hash}")
-async def trace_donation(tx_hash: str, db: Session = Depends(get_db)):
+async def trace_donation(tx_hash: str, db: AsyncSession = Depends(get_async_db)):
     """
     Trace a donation by its transaction hash.
     """
@@ -13,7 +13,7 @@ class DonationResponse(BaseModel):
     project_id: UUID
     donor_id: UUID
     amount: float
-    tx_hash: str
+    tx_hash: Optional[str] = None
     status: DonationStatus
     created_at: datetime
     updated_at: datetime
@@ -1,7 +1,26 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from uuid import UUID
+import enum
+
+class ImageSize(str, enum.Enum):
+    thumbnail = "thumbnail"
+    card = "card"
+    full = "full"
+
+class ProjectSort(str, enum.Enum):
+    amount_raised = "amount_raised"
+    created_at = "created_at"
+    completion = "completion"
+
+class SortOrder(str, enum.Enum):
+    asc = "asc"
+    desc = "desc"
+
+class FundingStatus(str, enum.Enum):
+    open = "open"
+    funded = "funded"
 
 class ProjectCreate(BaseModel):
     title: str
@@ -23,6 +42,7 @@ class ProjectResponse(BaseModel):
     verified: bool
     wallet_address: str  
     image: Optional[str] = None  # This will be a URL to fetch the image
+    images: Optional[Dict[ImageSize, str]] = None  # URL of each rendition
     image_mime_type: Optional[str] = None
     created_by: UUID
     created_at: datetime
@@ -31,6 +51,24 @@ class ProjectResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class ProjectSummary(BaseModel):
+    """Listing projection: no description, wallet or creator details"""
+    id: UUID
+    title: str
+    category: str
+    location: Optional[str]
+    target_amount: float
+    amount_raised: float
+    backers_count: int
+    completion: float  # amount_raised / target_amount
+    verified: bool
+    image: Optional[str] = None  # thumbnail rendition URL
+    created_at: datetime
+
+class ProjectPage(BaseModel):
+    items: List[ProjectSummary]
+    next_cursor: Optional[str] = None
+
 # New schema for the database model (internal use)
 class ProjectDB(BaseModel):
     id: UUID
@@ -43,7 +81,7 @@ class ProjectDB(BaseModel):
     location: Optional[str]
     verified: bool
     wallet_address: str  
-    image: Optional[bytes] = None  # Binary data for DB
+    image_hash: Optional[str] = None  # Content hash of the image in project_images
     image_mime_type: Optional[str] = None
     created_by: UUID
     created_at: datetime
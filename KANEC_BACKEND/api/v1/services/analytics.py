@@ -19,7 +19,7 @@ class DonationAnalytics:
     def __init__(self, db: Session):
         self.db = db
     
-    async def get_user_insights(self, user_id: UUID) -> Dict[str, Any]:
+    def get_user_insights(self, user_id: UUID) -> Dict[str, Any]:
         """
         Get comprehensive AI-powered insights for a user.
         """
@@ -43,7 +43,7 @@ class DonationAnalytics:
                 "donation_frequency_trend": self._get_frequency_trend(df),
                 "user_impact_score": self._calculate_impact_score(df),
                 "monthly_trends": self._get_monthly_trends(df),
-                "recommended_projects": await self._get_recommended_projects(user_id, df, self.db),
+                "recommended_projects": self._get_recommended_projects(user_id, df, self.db),
                 "user_percentile": self._calculate_user_percentile(user_id, df, self.db),
                 "donation_summary": self._get_donation_summary(df)
             }
@@ -308,7 +308,7 @@ class DonationAnalytics:
         
         return trends[-6:]  # Last 6 months
     
-    async def _get_recommended_projects(self, user_id: UUID, df: pd.DataFrame, db: Session) -> List[Dict[str, Any]]:
+    def _get_recommended_projects(self, user_id: UUID, df: pd.DataFrame, db: Session) -> List[Dict[str, Any]]:
         """Get project recommendations based on user's donation history."""
         
         if not df.empty:
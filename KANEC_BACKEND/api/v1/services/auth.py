@@ -1,7 +1,8 @@
 import os
 from datetime import datetime, timedelta
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
@@ -9,10 +10,10 @@ from api.v1.models.user import User
 from api.utils.settings import settings
 from api.v1.schemas.user import UserCreate, Login, UserResponse, UserUpdate, PasswordChange
 
-from api.db.database import get_db
-from passlib.context import CryptContext
-from api.v1.services.hedera import create_user_wallet, encrypt_private_key
+from api.utils.password_hasher import password_hasher
+from api.v1.services.wallet_pool import acquire_user_wallet
 from api.v1.services.otp import otp_service
+from api.v1.services.principal import Principal, get_principal, invalidate_principal
 import logging
 
 logging.basicConfig(level=logging.DEBUG)
@@ -20,12 +21,6 @@ logger = logging.getLogger(__name__)
 
 ENCRYPTION_KEY = settings.PRIVATE_KEY_ENCRYPTION_KEY
 
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto",
-    bcrypt__rounds=12
-)
-
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login_swagger")
 
 async def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -41,9 +36,13 @@ async def create_access_token(data: dict, expires_delta: Optional[timedelta] = N
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Principal:
     """
     Get the current authenticated user from JWT token.
+
+    Returns a cached Principal keyed by the token subject, so most requests
+    authorize without touching the database. Handlers that need the full User
+    call `await current_user.load(db)`.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -58,29 +57,29 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = De
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
+    principal = await get_principal(email)
+    if principal is None:
         raise credentials_exception
-    return user
+    return principal
 
-async def register_user(db: Session, user_data: UserCreate) -> dict:
+async def register_user(db: AsyncSession, user_data: UserCreate) -> dict:
     """
     Register a new user with auto-generated Hedera wallet and encrypted private key.
     """
-    if db.query(User).filter(User.email == user_data.email).first():
+    if await db.scalar(select(User).where(User.email == user_data.email)):
         raise ValueError("Email already registered")
 
+    # Hash first so a saturated hasher rejects before a wallet is created
+    hashed_password = await password_hasher.hash(user_data.password)
+
     try:
-        wallet_address, private_key = await create_user_wallet()
-        logger.info(f"Created Hedera wallet for user: {wallet_address}")
-        
-        encrypted_private_key = encrypt_private_key(private_key, ENCRYPTION_KEY)
-        
+        wallet_address, encrypted_private_key = await acquire_user_wallet(db)
+        logger.info(f"Assigned Hedera wallet to user: {wallet_address}")
+
     except Exception as e:
         logger.error(f"Failed to create wallet for user: {str(e)}")
         raise ValueError("Failed to create user wallet. Please try again.")
 
-    hashed_password = pwd_context.hash(user_data.password)
     new_user = User(
         name=user_data.name,
         email=user_data.email,
@@ -93,8 +92,8 @@ async def register_user(db: Session, user_data: UserCreate) -> dict:
         is_verified=False  
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
 
     try:
         await otp_service.send_verification_otp(db, new_user)
@@ -110,17 +109,30 @@ async def register_user(db: Session, user_data: UserCreate) -> dict:
         "is_verified": False
     }
 
-async def login_user(db: Session, login_data: Login) -> dict:
+async def _upgrade_password_hash(db: AsyncSession, user: User, new_hash: Optional[str]) -> None:
+    """
+    Persist a rehashed password produced at login when the stored hash was
+    made with an outdated cost
+    """
+    if new_hash is None:
+        return
+    user.password = new_hash
+    await db.commit()
+    await db.refresh(user)
+    logger.info(f"User {user.id} password hash upgraded")
+
+async def login_user(db: AsyncSession, login_data: Login) -> dict:
     """
     Authenticate a user and generate a JWT token.
     """
-    user = db.query(User).filter(User.email == login_data.email).first()
+    user = await db.scalar(select(User).where(User.email == login_data.email))
     if not user:
         raise ValueError("Invalid email or password")
 
-    hashed_password = str(user.password)
-    if not hashed_password or not pwd_context.verify(login_data.password, hashed_password):
+    valid, new_hash = await password_hasher.verify_and_update(login_data.password, user.password)
+    if not valid:
         raise ValueError("Invalid email or password")
+    await _upgrade_password_hash(db, user, new_hash)
 
     if not user.is_verified:
         raise ValueError("Please verify your email before logging in. Check your email for the verification code.")
@@ -135,16 +147,18 @@ async def login_user(db: Session, login_data: Login) -> dict:
         "user": UserResponse.from_orm(user)
     }
 
-async def login_user_swagger(db: Session, form_data: OAuth2PasswordRequestForm) -> dict:
+async def login_user_swagger(db: AsyncSession, form_data: OAuth2PasswordRequestForm) -> dict:
     """
     Authenticate a user and generate a JWT token for OAuth2 password flow.
     """
-    user = db.query(User).filter(User.email == form_data.username).first()
+    user = await db.scalar(select(User).where(User.email == form_data.username))
     if not user:
         raise ValueError("Invalid email or password")
         
-    if not pwd_context.verify(form_data.password, user.password):
+    valid, new_hash = await password_hasher.verify_and_update(form_data.password, user.password)
+    if not valid:
         raise ValueError("Invalid email or password")
+    await _upgrade_password_hash(db, user, new_hash)
 
     if not user.is_verified:
         raise ValueError("Please verify your email before logging in. Check your email for the verification code.")
@@ -161,7 +175,7 @@ async def login_user_swagger(db: Session, form_data: OAuth2PasswordRequestForm)
     }
 
 async def update_user_profile(
-    db: Session, 
+    db: AsyncSession, 
     current_user: User, 
     user_update: UserUpdate
 ) -> User:
@@ -173,11 +187,13 @@ async def update_user_profile(
     if not update_data:
         raise ValueError("No data provided for update")
     
+    previous_email = current_user.email
+    
     if 'email' in update_data and update_data['email'] != current_user.email:
-        existing_user = db.query(User).filter(
+        existing_user = await db.scalar(select(User).where(
             User.email == update_data['email'],
             User.id != current_user.id
-        ).first()
+        ))
         if existing_user:
             raise ValueError("Email already registered")
         
@@ -188,44 +204,47 @@ async def update_user_profile(
             setattr(current_user, field, value)
     
     current_user.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
+    await invalidate_principal(previous_email, current_user.email)
     
     logger.info(f"User {current_user.id} profile updated")
     return current_user
 
 async def change_user_password(
-    db: Session,
+    db: AsyncSession,
     current_user: User,
     password_change: PasswordChange
 ) -> bool:
     """
     Change user password after verifying current password
     """
-    if not pwd_context.verify(password_change.current_password, current_user.password):
+    if not await password_hasher.verify(password_change.current_password, current_user.password):
         raise ValueError("Current password is incorrect")
     
-    new_hashed_password = pwd_context.hash(password_change.new_password)
+    new_hashed_password = await password_hasher.hash(password_change.new_password)
     current_user.password = new_hashed_password
     current_user.updated_at = datetime.utcnow()
     
-    db.commit()
+    await db.commit()
+    await invalidate_principal(current_user.email)
     logger.info(f"User {current_user.id} password changed")
     return True
 
 async def delete_user_account(
-    db: Session,
+    db: AsyncSession,
     current_user: User,
     password: str
 ) -> bool:
     """
     Delete user account after password verification
     """
-    if not pwd_context.verify(password, current_user.password):
+    if not await password_hasher.verify(password, current_user.password):
         raise ValueError("Password is incorrect")
     
-    db.delete(current_user)
-    db.commit()
+    await db.delete(current_user)
+    await db.commit()
+    await invalidate_principal(current_user.email)
     
     logger.info(f"User {current_user.id} account deleted")
     return True
\ No newline at end of file
@@ -1,11 +1,30 @@
 from typing import Optional, List
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import contains_eager, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from api.v1.models.donation import Donation, DonationStatus
 from api.v1.schemas.donation import DonationCreate, UserDonationResponse
-from datetime import datetime, timezone
+from api.v1.services.hedera import (
+    donate_hbar_from_user,
+    new_transaction_id,
+    update_raised_amount,
+    verify_transaction,
+    TransferRejected,
+    TRANSACTION_NOT_FOUND,
+    TRANSACTION_VALID_DURATION,
+)
+from api.utils.hedera_executor import HederaExecutorSaturated
+from api.utils.settings import settings
+from api.utils.transaction_id import try_parse_tx_id
+from api.db.database import TaskSessionLocal
+from datetime import datetime, timedelta, timezone
 from uuid import UUID
+import logging
+import time
 
-async def create_donation(db: Session, donation: DonationCreate, tx_hash: Optional[str], user_id: UUID, status: str = "completed") -> Donation:
+logger = logging.getLogger(__name__)
+
+async def create_donation(db: AsyncSession, donation: DonationCreate, tx_hash: Optional[str], user_id: UUID, status: str = "completed") -> Donation:
     new_donation = Donation(
         project_id=donation.project_id,
         donor_id=user_id,
@@ -16,22 +35,24 @@ async def create_donation(db: Session, donation: DonationCreate, tx_hash: Option
         updated_at=datetime.now(timezone.utc)
     )
     db.add(new_donation)
-    db.commit()
-    db.refresh(new_donation)
+    await db.commit()
+    await db.refresh(new_donation)
     return new_donation
 
-async def get_user_completed_donations(db: Session, user_id: UUID) -> List[UserDonationResponse]:
+async def get_user_completed_donations(db: AsyncSession, user_id: UUID) -> List[UserDonationResponse]:
     """
     Get all completed donations made by a user with project details
     """
-    donations = db.query(Donation).join(
+    donations = (await db.scalars(select(Donation).join(
         Donation.project
-    ).filter(
+    ).options(
+        contains_eager(Donation.project)
+    ).where(
         Donation.donor_id == user_id,
         Donation.status == DonationStatus.completed
     ).order_by(
         Donation.created_at.desc()
-    ).all()
+    ))).all()
     
     donation_responses = []
     for donation in donations:
@@ -45,4 +66,137 @@ async def get_user_completed_donations(db: Session, user_id: UUID) -> List[UserD
             project_category=donation.project.category
         ))
     
-    return donation_responses
\ No newline at end of file
+    return donation_responses
+
+async def get_user_donation(db: AsyncSession, donation_id: UUID, user_id: UUID) -> Optional[Donation]:
+    return await db.scalar(select(Donation).where(
+        Donation.id == donation_id,
+        Donation.donor_id == user_id
+    ))
+
+async def stale_pending_donations(older_than: float, limit: int) -> List[UUID]:
+    """
+    Ids of pending donations not updated for `older_than` seconds, oldest first.
+    Their settlement task ran out of retries or was never delivered.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=older_than)
+    async with TaskSessionLocal() as db:
+        return list((await db.scalars(
+            select(Donation.id)
+            .where(Donation.status == DonationStatus.pending, Donation.updated_at < cutoff)
+            .order_by(Donation.updated_at)
+            .limit(limit)
+        )).all())
+
+async def settle_donation(donation_id: UUID) -> DonationStatus:
+    """
+    Submit the transfer for a pending donation and record the outcome.
+
+    Runs outside the request, so it uses its own session. The transaction id is
+    fixed and saved before submission. The donation is only marked failed when
+    no HBAR can have moved; when the outcome is unknown (a lane timeout, a lost
+    connection) it stays pending with that id, and later runs reconcile it
+    against the mirror node instead of submitting again, so a donation can
+    never be paid twice.
+    """
+    async with TaskSessionLocal() as db:
+        donation = await db.scalar(
+            select(Donation)
+            .options(selectinload(Donation.project))
+            .where(Donation.id == donation_id)
+            .with_for_update()
+        )
+        if not donation:
+            raise ValueError("Donation not found")
+        if donation.status != DonationStatus.pending:
+            logger.info(f"Donation {donation_id} already settled as {donation.status.value}")
+            return donation.status
+        if donation.tx_hash:
+            return await _reconcile_donation(db, donation)
+
+        tx_id = new_transaction_id()
+        donation.tx_hash = tx_id.to_mirror()
+        donation.updated_at = datetime.now(timezone.utc)
+        await db.commit()
+
+        try:
+            tx_hash = await donate_hbar_from_user(
+                user_id=donation.donor_id,
+                project_wallet=donation.project.wallet_address,
+                amount_hbar=donation.amount,
+                db=db,
+                transaction_id=tx_id
+            )
+        except TransferRejected as e:
+            logger.error(f"Donation {donation_id} failed: {str(e)}")
+            return await _fail_donation(db, donation)
+        except HederaExecutorSaturated:
+            # Never submitted, so the next run can start afresh with a new id
+            await db.refresh(donation, with_for_update=True)
+            if donation.status == DonationStatus.pending and donation.tx_hash == tx_id.to_mirror():
+                donation.tx_hash = None
+                await db.commit()
+            return DonationStatus.pending
+        except Exception as e:
+            logger.warning(f"Donation {donation_id} outcome unknown ({type(e).__name__}: {str(e)}); will reconcile {tx_id}")
+            return DonationStatus.pending
+
+        return await _complete_donation(db, donation, tx_hash)
+
+
+async def _reconcile_donation(db: AsyncSession, donation: Donation) -> DonationStatus:
+    """Settle a donation whose transfer was submitted with an unknown outcome"""
+    tx_id = try_parse_tx_id(donation.tx_hash)
+    if tx_id is None:
+        logger.error(f"Donation {donation.id} has an unparseable transaction id {donation.tx_hash}")
+        return DonationStatus.pending
+
+    verification = await verify_transaction(tx_id.to_mirror())
+    if verification.get("timestamp"):
+        if verification["valid"]:
+            return await _complete_donation(db, donation, tx_id.to_mirror())
+        logger.error(f"Donation {donation.id} reached consensus as {verification.get('result')}")
+        return await _fail_donation(db, donation)
+
+    expired = time.time() > tx_id.valid_start + TRANSACTION_VALID_DURATION + settings.MIRROR_NODE_FRESH_WINDOW
+    if expired and verification.get("error") == TRANSACTION_NOT_FOUND:
+        # Past its validity window and still unknown to the mirror node, so it never reached consensus
+        logger.error(f"Donation {donation.id} transaction {tx_id} never reached consensus")
+        return await _fail_donation(db, donation)
+
+    logger.info(f"Donation {donation.id} transaction {tx_id} not settled yet")
+    return DonationStatus.pending
+
+
+async def _complete_donation(db: AsyncSession, donation: Donation, tx_hash: str) -> DonationStatus:
+    # Re-check under the lock: a concurrent run may have reconciled it meanwhile
+    await db.refresh(donation, with_for_update=True)
+    if donation.status != DonationStatus.pending:
+        return donation.status
+
+    donation.tx_hash = tx_hash
+    donation.status = DonationStatus.completed
+    donation.updated_at = datetime.now(timezone.utc)
+    try:
+        await update_raised_amount(db, donation.project_id, donation.amount)
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        # The transfer went through; keep the id so the donation can be reconciled
+        logger.critical(f"Donation {donation.id} transferred as {tx_hash} but could not be recorded")
+        raise
+
+    logger.info(f"Donation completed: {donation.amount} HBAR from user {donation.donor_id} to project {donation.project_id}")
+    return donation.status
+
+
+async def _fail_donation(db: AsyncSession, donation: Donation) -> DonationStatus:
+    await db.refresh(donation, with_for_update=True)
+    if donation.status != DonationStatus.pending:
+        return donation.status
+
+    donation.status = DonationStatus.failed
+    donation.tx_hash = None
+    donation.updated_at = datetime.now(timezone.utc)
+    await db.commit()
+    return donation.status
@@ -1,10 +1,18 @@
 import asyncio
 from typing import Optional
-from hiero_sdk_python import Client, AccountId, PrivateKey, Hbar, AccountCreateTransaction, AccountInfoQuery, Network, TransferTransaction, TransactionGetReceiptQuery, CryptoGetAccountBalanceQuery
+from hiero_sdk_python import AccountId, PrivateKey, Hbar, AccountCreateTransaction, AccountInfoQuery, Network, TransferTransaction, TransactionGetReceiptQuery, CryptoGetAccountBalanceQuery, TransactionId
+from hiero_sdk_python.exceptions import PrecheckError
+from hiero_sdk_python.response_code import ResponseCode
 from api.utils.settings import settings
+from api.utils.hedera_pool import hedera_pool
+from api.utils.hedera_executor import hedera_executor, HederaExecutorSaturated, QUERY, TRANSACTION, ACCOUNT
+from api.utils.cache_utils import TTLCache, LRUCache
+from api.utils.mirror_node import mirror_node, indexing_wait, record_indexing_lag
+from api.utils.transaction_id import HederaTransactionId, try_parse_tx_id
 from api.v1.models.project import Project
-from api.v1.models.donation import Donation
-from sqlalchemy.orm import Session
+from api.v1.models.donation import Donation, DonationStatus
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, distinct
 import requests
 from uuid import UUID
 import logging
@@ -18,49 +26,46 @@ import base64
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-async def get_hedera_client() -> Client:
+balance_cache = TTLCache(
+    "balance",
+    ttl=settings.BALANCE_CACHE_TTL,
+    maxsize=settings.BALANCE_CACHE_MAXSIZE
+)
+
+FINALIZED_VERIFICATION_TTL = 24 * 60 * 60
+finalized_verifications = LRUCache(maxsize=10000)
+
+TRANSACTION_NOT_FOUND = "Transaction not found in mirror node"
+MIRROR_NODE_UNAVAILABLE = "Mirror node unavailable"
+
+# Default validity window of a transaction; after it one that never reached consensus never will
+TRANSACTION_VALID_DURATION = 120
+
+
+class TransferRejected(ValueError):
     """
-    Get configured Hedera client for testnet or mainnet.
+    A transfer that certainly moved no HBAR: it failed before submission, was
+    rejected at precheck, or reached consensus with a failure status
     """
-    try:
-        network = settings.HEDERA_NETWORK.lower()
-        client = Client(Network(network='testnet' if network == 'testnet' else 'mainnet'))
-        
-        account_id = AccountId.from_string(settings.HEDERA_OPERATOR_ID)
-        operator_key = PrivateKey.from_string(settings.HEDERA_OPERATOR_KEY)
-        
-        # Debug the actual key type
-        pub_key = operator_key.public_key()
-        logger.debug(f"Setting operator with ID: {account_id}")
-        logger.debug(f"Operator key type: {type(pub_key)}")
-        logger.debug(f"Operator public key: {pub_key}")
-        
-        client.set_operator(account_id, operator_key)
-        return client
-        
-    except ValueError as e:
-        logger.error(f"Invalid Hedera configuration: {str(e)}")
-        raise ValueError(f"Invalid Hedera configuration: {str(e)}")
-    except Exception as e:
-        logger.error(f"Unexpected error in get_hedera_client: {type(e).__name__}: {str(e)}")
-        raise ValueError(f"Failed to initialize Hedera client: {type(e).__name__}: {str(e)}")
-    
+
+
+def new_transaction_id() -> HederaTransactionId:
+    """A fresh transaction id paid by the operator, to fix before submitting"""
+    return HederaTransactionId.from_sdk(TransactionId.generate(AccountId.from_string(settings.HEDERA_OPERATOR_ID)))
+
 
 async def create_user_wallet() -> tuple[str, str]:
     """
     Create a new Hedera account for a user and return (wallet_address, encrypted_private_key)
     """
-    client = await get_hedera_client()
-    loop = asyncio.get_event_loop()
-
-    def sync_create_account():
+    def sync_create_account(client):
         try:
             new_key = PrivateKey.generate("ecdsa")
             private_key_string = new_key.to_string()  
             
             logger.debug(f"Generating new ECDSA account for user with public key: {new_key.public_key()}")
 
-            operator_key = PrivateKey.from_string(settings.HEDERA_OPERATOR_KEY)
+            operator_key = client.operator_private_key
 
             transaction = (
                 AccountCreateTransaction()
@@ -89,7 +94,8 @@ async def create_user_wallet() -> tuple[str, str]:
             logger.error(f"Failed to create user Hedera account: {type(e).__name__}: {str(e)}")
             raise
 
-    return await loop.run_in_executor(None, sync_create_account)
+    async with hedera_pool.client() as client:
+        return await hedera_executor.run(ACCOUNT, sync_create_account, client)
 
 def encrypt_private_key(private_key: str, encryption_key: str) -> str:
     """
@@ -108,43 +114,53 @@ def decrypt_private_key(encrypted_key: str, encryption_key: str) -> str:
     return decrypted_key.decode()
 
 
-async def get_wallet_balance(wallet_address: str) -> float:
+async def query_wallet_balance(wallet_address: str) -> float:
     """
-    Get the HBAR balance of a wallet using the correct pattern from docs.
+    Query the live HBAR balance of a wallet from the network, bypassing the cache.
     """
-    client = await get_hedera_client()
-    loop = asyncio.get_event_loop()
+    def sync_get_balance(client):
+        account_id = AccountId.from_string(wallet_address)
+        balance_query = CryptoGetAccountBalanceQuery().set_account_id(account_id)
+        balance_result = balance_query.execute(client)
 
-    def sync_get_balance():
-        try:
-            account_id = AccountId.from_string(wallet_address)
-            balance_query = CryptoGetAccountBalanceQuery().set_account_id(account_id)
-            balance_result = balance_query.execute(client)
-            
-            balance_hbar = balance_result.hbars.to_hbars()
-            logger.debug(f"Balance for {wallet_address}: {balance_hbar} HBAR")
-            return float(balance_hbar)
-            
-        except Exception as e:
-            logger.error(f"Failed to get balance for {wallet_address}: {str(e)}")
-            return 0.0
+        balance_hbar = balance_result.hbars.to_hbars()
+        logger.debug(f"Balance for {wallet_address}: {balance_hbar} HBAR")
+        return float(balance_hbar)
 
-    balance = await loop.run_in_executor(None, sync_get_balance)
-    return balance
+    async with hedera_pool.client() as client:
+        return await hedera_executor.run(QUERY, sync_get_balance, client)
 
-async def create_project_wallet(db: Session, project: Optional[Project] = None) -> str:
+async def get_wallet_balance(wallet_address: str, fresh: bool = False) -> float:
     """
-    Create a new Hedera account for a project wallet.
+    Get the HBAR balance of a wallet, served from the balance cache when possible.
+    Concurrent lookups for the same wallet share a single network query.
+    """
+    try:
+        if fresh:
+            return await query_wallet_balance(wallet_address)
+        return await balance_cache.get_or_load(wallet_address, lambda: query_wallet_balance(wallet_address))
+    except (HederaExecutorSaturated, TimeoutError):
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get balance for {wallet_address}: {str(e)}")
+        return 0.0
+
+async def invalidate_wallet_balance(*wallet_addresses: str) -> None:
+    """
+    Drop cached balances after a transfer touching these wallets has settled.
     """
-    client = await get_hedera_client()
-    loop = asyncio.get_event_loop()
+    await balance_cache.delete(*[w for w in wallet_addresses if w])
 
-    def sync_create_account():
+async def create_project_wallet(db: AsyncSession, project: Optional[Project] = None) -> str:
+    """
+    Create a new Hedera account for a project wallet.
+    """
+    def sync_create_account(client):
         try:
             new_key = PrivateKey.generate("ecdsa")
             logger.debug(f"Generating new ECDSA account with public key: {new_key.public_key()}")
 
-            operator_key = PrivateKey.from_string(settings.HEDERA_OPERATOR_KEY)
+            operator_key = client.operator_private_key
 
             transaction = (
                 AccountCreateTransaction()
@@ -172,10 +188,11 @@ async def create_project_wallet(db: Session, project: Optional[Project] = None)
             raise
 
     try:
-        account_id = await loop.run_in_executor(None, sync_create_account)
+        async with hedera_pool.client() as client:
+            account_id = await hedera_executor.run(ACCOUNT, sync_create_account, client)
         if project:
             project.wallet_address = account_id
-            db.commit()
+            await db.commit()
         return account_id
     except Exception as e:
         logger.error(f"Failed to create Hedera wallet: {type(e).__name__}: {str(e)}")
@@ -186,10 +203,7 @@ async def donate_hbar(donor_wallet: str, project_wallet: str, amount_hbar: float
     """
     Process an HBAR donation from donor to project wallet.
     """
-    client = await get_hedera_client()
-    loop = asyncio.get_event_loop()
-
-    def sync_donate():
+    def sync_donate(client):
         try:
             donor_id = AccountId.from_string(donor_wallet)
             project_id = AccountId.from_string(project_wallet)
@@ -216,11 +230,8 @@ async def donate_hbar(donor_wallet: str, project_wallet: str, amount_hbar: float
             if receipt.status != 22:  # SUCCESS
                 raise ValueError(f"Transaction failed with status: {receipt.status}")
 
-            tx_str = str(transaction_id)
-            # Format 1: Replace @ with -
-            tx_hash = tx_str.replace('@', '-')
-            # Format 2: If that doesn't work, we'll try the original in verify_transaction
-            
+            tx_hash = HederaTransactionId.from_sdk(transaction_id).to_mirror()
+
             logger.info(f"Donation transaction completed successfully: {tx_hash}")
             return tx_hash
 
@@ -228,23 +239,33 @@ async def donate_hbar(donor_wallet: str, project_wallet: str, amount_hbar: float
             logger.error(f"Failed to process donation: {type(e).__name__}: {str(e)}")
             raise
 
-    tx_hash = await loop.run_in_executor(None, sync_donate)
+    async with hedera_pool.client() as client:
+        tx_hash = await hedera_executor.run(TRANSACTION, sync_donate, client)
+    await invalidate_wallet_balance(donor_wallet, project_wallet)
     return tx_hash
 
-async def donate_hbar_from_user(user_id: UUID, project_wallet: str, amount_hbar: float, db: Session) -> str:
+async def donate_hbar_from_user(
+    user_id: UUID,
+    project_wallet: str,
+    amount_hbar: float,
+    db: AsyncSession,
+    transaction_id: Optional[HederaTransactionId] = None
+) -> str:
     """
     Process an HBAR donation using the user's stored private key.
+
+    Pass `transaction_id` (see new_transaction_id) to fix the id before
+    submission, so an attempt with an unknown outcome can be reconciled
+    against the mirror node. Raises TransferRejected when no HBAR can have
+    moved; any other error leaves the outcome unknown.
     """
-    client = await get_hedera_client()
-    loop = asyncio.get_event_loop()
+    from api.v1.models.user import User
+    user = await db.get(User, user_id)
+    if not user or not user.wallet_address or not user.encrypted_private_key:
+        raise TransferRejected("User wallet not found or not properly configured")
 
-    def sync_donate():
+    def sync_donate(client):
         try:
-            from api.v1.models.user import User
-            user = db.query(User).filter(User.id == user_id).first()
-            if not user or not user.wallet_address or not user.encrypted_private_key:
-                raise ValueError("User wallet not found or not properly configured")
-
             donor_id = AccountId.from_string(user.wallet_address)
             project_id = AccountId.from_string(project_wallet)
 
@@ -261,44 +282,53 @@ async def donate_hbar_from_user(user_id: UUID, project_wallet: str, amount_hbar:
                 TransferTransaction()
                 .add_hbar_transfer(donor_id, -amount_tinybars)
                 .add_hbar_transfer(project_id, amount_tinybars)
-                .freeze_with(client)
-                .sign(donor_key)
             )
+            if transaction_id is not None:
+                transaction.set_transaction_id(TransactionId.from_string(transaction_id.to_sdk()))
+            transaction.freeze_with(client).sign(donor_key)
+        except Exception as e:
+            logger.error(f"Failed to prepare donation: {type(e).__name__}: {str(e)}")
+            raise TransferRejected(f"Could not prepare donation transfer: {str(e)}") from e
 
+        try:
             receipt = transaction.execute(client)
-            transaction_id = transaction.transaction_id
-            
-            logger.debug(f"Transaction ID: {transaction_id}")
-            logger.debug(f"Transaction status: {receipt.status}")
-
-            if receipt.status != 22:
-                raise ValueError(f"Transaction failed with status: {receipt.status}")
-
-            tx_hash = str(transaction_id).replace('@', '-')
-            logger.info(f"Donation transaction completed successfully: {tx_hash}")
-            return tx_hash
-
+        except PrecheckError as e:
+            # A duplicate means an earlier attempt with this id was accepted
+            if e.status == ResponseCode.DUPLICATE_TRANSACTION:
+                raise
+            logger.error(f"Donation rejected at precheck: {str(e)}")
+            raise TransferRejected(str(e)) from e
         except Exception as e:
             logger.error(f"Failed to process donation: {type(e).__name__}: {str(e)}")
             raise
 
-    tx_hash = await loop.run_in_executor(None, sync_donate)
+        transaction_id_sdk = transaction.transaction_id
+        logger.debug(f"Transaction ID: {transaction_id_sdk}")
+        logger.debug(f"Transaction status: {receipt.status}")
+
+        if receipt.status != ResponseCode.SUCCESS:
+            raise TransferRejected(f"Transaction failed with status: {receipt.status}")
+
+        tx_hash = HederaTransactionId.from_sdk(transaction_id_sdk).to_mirror()
+        logger.info(f"Donation transaction completed successfully: {tx_hash}")
+        return tx_hash, user.wallet_address
+
+    async with hedera_pool.client() as client:
+        tx_hash, donor_wallet = await hedera_executor.run(TRANSACTION, sync_donate, client)
+    await invalidate_wallet_balance(donor_wallet, project_wallet)
     return tx_hash
 
-async def transfer_hbar_p2p(sender_user_id: UUID, recipient_wallet: str, amount_hbar: float, db: Session, memo: str = "P2P transfer") -> str:
+async def transfer_hbar_p2p(sender_user_id: UUID, recipient_wallet: str, amount_hbar: float, db: AsyncSession, memo: str = "P2P transfer") -> str:
     """
     Transfer HBAR between user wallets (P2P transfer).
     """
-    client = await get_hedera_client()
-    loop = asyncio.get_event_loop()
+    from api.v1.models.user import User
+    sender = await db.get(User, sender_user_id)
+    if not sender or not sender.wallet_address or not sender.encrypted_private_key:
+        raise ValueError("Sender wallet not found or not properly configured")
 
-    def sync_transfer():
+    def sync_transfer(client):
         try:
-            from api.v1.models.user import User
-            sender = db.query(User).filter(User.id == sender_user_id).first()
-            if not sender or not sender.wallet_address or not sender.encrypted_private_key:
-                raise ValueError("Sender wallet not found or not properly configured")
-
             sender_id = AccountId.from_string(sender.wallet_address)
             recipient_id = AccountId.from_string(recipient_wallet)
 
@@ -354,87 +384,89 @@ async def transfer_hbar_p2p(sender_user_id: UUID, recipient_wallet: str, amount_
             if receipt.status != 22:
                 raise ValueError(f"P2P transfer failed with status: {receipt.status}")
 
-            tx_hash = str(transaction_id).replace('@', '-')
+            tx_hash = HederaTransactionId.from_sdk(transaction_id).to_mirror()
             logger.info(f"P2P transfer completed successfully: {tx_hash}")
-            return tx_hash
+            return tx_hash, sender.wallet_address
 
         except Exception as e:
             logger.error(f"Failed to process P2P transfer: {type(e).__name__}: {str(e)}")
             raise
 
-    tx_hash = await loop.run_in_executor(None, sync_transfer)
+    async with hedera_pool.client() as client:
+        tx_hash, sender_wallet = await hedera_executor.run(TRANSACTION, sync_transfer, client)
+    await invalidate_wallet_balance(sender_wallet, recipient_wallet)
     return tx_hash
 
 async def verify_transaction(tx_hash: str) -> dict:
     """
     Verify a transaction using Hedera Mirror Node API.
-    Try multiple transaction ID formats.
+    The id is normalized to the mirror-node form, so a lookup is a single request.
+    Transactions already found on the mirror node are answered from memory.
     """
-    import httpx
-    import asyncio
-    
-    network = settings.HEDERA_NETWORK.lower()
-    mirror_node_url = f"https://{'testnet' if network == 'testnet' else 'mainnet'}.mirrornode.hedera.com"
-    
-    await asyncio.sleep(5)
-    
-    # Try multiple transaction ID formats
-    formats_to_try = [
-        tx_hash,  # Original format with -
-        tx_hash.replace('-', '@'),  # Replace - with @
-        tx_hash.split('-')[0] + '@' + tx_hash.split('-')[1].split('.')[0] + '.' + tx_hash.split('-')[1].split('.')[1][:6],  # Limited precision
-    ]
-    
-    max_retries = 3
-    for tx_format in formats_to_try:
-        for attempt in range(max_retries):
-            try:
-                url = f"{mirror_node_url}/api/v1/transactions/{tx_format}"
-                logger.debug(f"Verifying transaction attempt {attempt + 1} with format: {tx_format}")
-                
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.get(url)
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        transactions = result.get("transactions", [])
-                        if not transactions:
-                            continue
-                        
-                        tx = transactions[0]
-                        transfers = tx.get("transfers", [])
-                        
-                        # Find the transfer amounts
-                        positive_transfers = [t for t in transfers if t.get("amount", 0) > 0]
-                        negative_transfers = [t for t in transfers if t.get("amount", 0) < 0]
-                        
-                        return {
-                            "valid": tx.get("result") == "SUCCESS",
-                            "amount": sum(t.get("amount", 0) for t in positive_transfers) / 100_000_000,
-                            "from_account": negative_transfers[0].get("account") if negative_transfers else None,
-                            "to_account": positive_transfers[0].get("account") if positive_transfers else None,
-                            "timestamp": tx.get("consensus_timestamp"),
-                            "transaction_id": tx.get("transaction_id"),
-                            "transfers": transfers
-                        }
-                    elif response.status_code == 404:
-                        # Transaction not yet indexed, wait and retry
-                        if attempt < max_retries - 1:
-                            wait_time = 2 ** attempt
-                            logger.debug(f"Transaction not indexed yet with format {tx_format}, waiting {wait_time}s...")
-                            await asyncio.sleep(wait_time)
-                            continue
-                    else:
-                        # Other HTTP error, try next format
-                        break
-                        
-            except Exception as e:
-                logger.debug(f"Failed with format {tx_format} attempt {attempt + 1}: {str(e)}")
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(2 ** attempt)
-                    continue
-    
-    logger.warning(f"Could not verify transaction {tx_hash} with mirror node using any format")
+    tx_id = try_parse_tx_id(tx_hash)
+    if tx_id is None:
+        return _transaction_not_found(tx_hash, "Invalid transaction id")
+    tx_hash = tx_id.to_mirror()
+
+    cached = finalized_verifications.get(tx_hash)
+    if cached is not None:
+        return cached
+
+    # Old transactions are already indexed; only fresh ones are polled
+    fresh = indexing_wait.is_fresh(tx_id.valid_start)
+    error = TRANSACTION_NOT_FOUND
+    tx = None
+    for delay in indexing_wait.delays(tx_id.valid_start):
+        if delay:
+            await asyncio.sleep(delay)
+        try:
+            response = await mirror_node.get(f"/api/v1/transactions/{tx_hash}")
+        except Exception as e:
+            logger.debug(f"Mirror node lookup failed for {tx_hash}: {str(e)}")
+            error = MIRROR_NODE_UNAVAILABLE
+            continue
+
+        if response.status_code == 200:
+            transactions = response.json().get("transactions", [])
+            if transactions:
+                tx = transactions[0]
+                break
+        elif response.status_code != 404:
+            logger.warning(f"Mirror node returned HTTP {response.status_code} for {tx_hash}")
+            error = MIRROR_NODE_UNAVAILABLE
+            break
+        error = TRANSACTION_NOT_FOUND
+
+    if tx is None:
+        logger.warning(f"Could not verify transaction {tx_hash} with mirror node")
+        return _transaction_not_found(tx_hash, error)
+
+    if fresh:
+        record_indexing_lag(tx.get("consensus_timestamp"))
+    verification = _transaction_to_verification(tx)
+    # Mirror node records are final once consensus is reached
+    finalized_verifications.set(tx_hash, verification, FINALIZED_VERIFICATION_TTL)
+    return verification
+
+def _transaction_to_verification(tx: dict) -> dict:
+    transfers = tx.get("transfers", [])
+
+    # Find the transfer amounts
+    positive_transfers = [t for t in transfers if t.get("amount", 0) > 0]
+    negative_transfers = [t for t in transfers if t.get("amount", 0) < 0]
+
+    return {
+        "valid": tx.get("result") == "SUCCESS",
+        "result": tx.get("result"),
+        "amount": sum(t.get("amount", 0) for t in positive_transfers) / 100_000_000,
+        "from_account": negative_transfers[0].get("account") if negative_transfers else None,
+        "to_account": positive_transfers[0].get("account") if positive_transfers else None,
+        "timestamp": tx.get("consensus_timestamp"),
+        "transaction_id": tx.get("transaction_id"),
+        "transfers": transfers
+    }
+
+def _transaction_not_found(tx_hash: str, error: str) -> dict:
     return {
         "valid": False,
         "amount": 0,
@@ -442,47 +474,29 @@ async def verify_transaction(tx_hash: str) -> dict:
         "to_account": None,
         "timestamp": None,
         "transaction_id": tx_hash,
-        "error": "Transaction not found in mirror node after trying multiple formats"
+        "error": error
     }
 
-async def trace_transaction(tx_hash: str, db: Session) -> dict:
-    """
-    Trace a donation by transaction hash.
-    
-    Args:
-        tx_hash: Hedera transaction ID
-        db: SQLAlchemy session
-    
-    Returns:
-        dict: Transaction details with linked donation/project
+async def update_raised_amount(db: AsyncSession, project_id: UUID, amount: float):
     """
-    verification = await verify_transaction(tx_hash)
-    donation = db.query(Donation).filter(Donation.tx_hash == tx_hash).first()
-    
-    result = {
-        "transaction_id": tx_hash,
-        "valid": verification["valid"],
-        "amount": verification["amount"],
-        "from_account": verification["from_account"],
-        "to_account": verification["to_account"],
-        "timestamp": verification["timestamp"]
-    }
-    
-    if donation:
-        result.update({
-            "donation_id": donation.id,
-            "project_id": donation.project_id,
-            "donor_id": donation.donor_id,
-            "status": donation.status.value
-        })
-    
-    return result
-
-async def update_raised_amount(db: Session, project_id: UUID, amount: float):
-    """
-    Update project's amount_raised.
+    Add a completed donation to the project's funding counters.
+
+    Both counters are computed by the database in one UPDATE, so concurrent
+    donations never overwrite each other. The caller commits, together with the
+    donation status change, so the counters and the donation land atomically.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if project:
-        project.amount_raised += amount
-        db.commit()
\ No newline at end of file
+    # The donation's new status must be visible to the backers subquery
+    await db.flush()
+    backers = select(func.count(distinct(Donation.donor_id))).where(
+        Donation.project_id == project_id,
+        Donation.status == DonationStatus.completed
+    ).scalar_subquery()
+    await db.execute(
+        update(Project)
+        .where(Project.id == project_id)
+        .values(
+            amount_raised=func.coalesce(Project.amount_raised, 0) + amount,
+            backers_count=backers
+        )
+        .execution_options(synchronize_session=False)
+    )
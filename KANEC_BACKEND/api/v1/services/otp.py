@@ -1,10 +1,13 @@
 import random
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from api.v1.models.user import User
 from api.utils.redis_utils import redis_client
 from api.utils.celery_app import send_otp_email_task, send_password_reset_email_task
 from api.utils.email_utils import email_utils
+from api.utils.password_hasher import password_hasher
+from api.v1.services.principal import invalidate_principal
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,7 +19,7 @@ class OTPService:
         return str(random.randint(100000, 999999))
 
     @staticmethod
-    async def send_verification_otp(db: Session, user: User) -> bool:
+    async def send_verification_otp(db: AsyncSession, user: User) -> bool:
         """Generate and send OTP to user's email using Celery"""
         try:
             otp_code = OTPService.generate_otp()
@@ -40,9 +43,9 @@ class OTPService:
             raise
 
     @staticmethod
-    async def verify_otp(db: Session, email: str, otp_code: str) -> bool:
+    async def verify_otp(db: AsyncSession, email: str, otp_code: str) -> bool:
         """Verify OTP code for user using Redis"""
-        user = db.query(User).filter(User.email == email).first()
+        user = await db.scalar(select(User).where(User.email == email))
         if not user:
             raise ValueError("User not found")
         
@@ -52,7 +55,8 @@ class OTPService:
         
         user.is_verified = True
         user.updated_at = datetime.utcnow()
-        db.commit()
+        await db.commit()
+        await invalidate_principal(email)
         
         await redis_client.delete_otp(email)
         
@@ -60,9 +64,9 @@ class OTPService:
         return True
 
     @staticmethod
-    async def resend_otp(db: Session, email: str) -> bool:
+    async def resend_otp(db: AsyncSession, email: str) -> bool:
         """Resend OTP to user"""
-        user = db.query(User).filter(User.email == email).first()
+        user = await db.scalar(select(User).where(User.email == email))
         if not user:
             raise ValueError("User not found")
         
@@ -72,9 +76,9 @@ class OTPService:
         return await OTPService.send_verification_otp(db, user)
     
     @staticmethod
-    async def send_password_reset_otp(db: Session, email: str) -> bool:
+    async def send_password_reset_otp(db: AsyncSession, email: str) -> bool:
         """Generate and send password reset OTP to user's email"""
-        user = db.query(User).filter(User.email == email).first()
+        user = await db.scalar(select(User).where(User.email == email))
         if not user:
             logger.info(f"Password reset requested for non-existent email: {email}")
             return True  
@@ -102,9 +106,9 @@ class OTPService:
             raise
 
     @staticmethod
-    async def verify_password_reset_otp(db: Session, email: str, otp_code: str) -> bool:
+    async def verify_password_reset_otp(db: AsyncSession, email: str, otp_code: str) -> bool:
         """Verify password reset OTP code"""
-        user = db.query(User).filter(User.email == email).first()
+        user = await db.scalar(select(User).where(User.email == email))
         if not user:
             raise ValueError("User not found")
         
@@ -118,18 +122,17 @@ class OTPService:
         return True
 
     @staticmethod
-    async def complete_password_reset(db: Session, email: str, new_password: str) -> bool:
+    async def complete_password_reset(db: AsyncSession, email: str, new_password: str) -> bool:
         """Complete password reset after OTP verification"""
-        user = db.query(User).filter(User.email == email).first()
+        user = await db.scalar(select(User).where(User.email == email))
         if not user:
             raise ValueError("User not found")
         
-        from api.v1.services.auth import pwd_context
-        hashed_password = pwd_context.hash(new_password)
+        hashed_password = await password_hasher.hash(new_password)
         user.password = hashed_password
         user.updated_at = datetime.utcnow()
         
-        db.commit()
+        await db.commit()
         
         key = f"password_reset:{email}"
         await redis_client.delete_otp(key)
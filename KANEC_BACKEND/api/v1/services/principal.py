@@ -0,0 +1,94 @@
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.db.database import AsyncSessionLocal
+from api.utils.cache_utils import TTLCache
+from api.utils.settings import settings
+from api.v1.models.user import User, UserRole
+
+principal_cache = TTLCache(
+    "principal",
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+    maxsize=settings.PRINCIPAL_CACHE_MAXSIZE
+)
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    The authenticated user, as much of it as authorization and most handlers
+    need. It never carries the password hash or the encrypted wallet key; call
+    `load` for the full User when a handler needs those.
+    """
+
+    id: UUID
+    email: str
+    name: str
+    role: UserRole
+    wallet_address: Optional[str]
+    is_verified: bool
+    has_wallet_key: bool
+    created_at: datetime
+    updated_at: datetime
+
+    def to_cache(self) -> dict:
+        data = asdict(self)
+        data.update(
+            id=str(self.id),
+            role=self.role.value,
+            created_at=self.created_at.isoformat(),
+            updated_at=self.updated_at.isoformat()
+        )
+        return data
+
+    @classmethod
+    def from_cache(cls, data: dict) -> "Principal":
+        return cls(**{
+            **data,
+            "id": UUID(data["id"]),
+            "role": UserRole(data["role"]),
+            "created_at": datetime.fromisoformat(data["created_at"]),
+            "updated_at": datetime.fromisoformat(data["updated_at"])
+        })
+
+    async def load(self, db: AsyncSession) -> User:
+        user = await db.get(User, self.id)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return user
+
+
+async def _load_principal(email: str) -> Optional[dict]:
+    # A session of its own: the load may be shared by concurrent requests
+    async with AsyncSessionLocal() as db:
+        row = (await db.execute(select(
+            User.id, User.email, User.name, User.role, User.wallet_address, User.is_verified,
+            User.encrypted_private_key.isnot(None).label("has_wallet_key"),
+            User.created_at, User.updated_at
+        ).where(User.email == email))).first()
+    return Principal(**row._mapping).to_cache() if row else None
+
+
+async def get_principal(email: str) -> Optional[Principal]:
+    """The principal for a token subject, from the cache or a column-only query"""
+    data = await principal_cache.get_or_load(email, lambda: _load_principal(email))
+    return Principal.from_cache(data) if data else None
+
+
+async def invalidate_principal(*emails: str) -> None:
+    """
+    Drop cached principals; call after any change to the user's cached fields.
+    The cache versions the delete, so a load already running in another worker
+    cannot write the old principal back.
+    """
+    await principal_cache.delete(*[email for email in emails if email])
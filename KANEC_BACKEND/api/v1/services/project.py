@@ -1,20 +1,62 @@
-from sqlalchemy.orm import Session
-from api.v1.models.project import Project
-from api.v1.models.donation import Donation
-from api.v1.schemas.project import ProjectCreate, ProjectResponse, ProjectDB
-from api.v1.services.hedera import create_project_wallet, verify_transaction
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import load_only
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.v1.models.project import Project, completion_ratio
+from api.v1.models.project_image import ProjectImage
+from api.v1.models.donation import Donation, DonationStatus
+from api.v1.schemas.project import (
+    ProjectCreate, ProjectResponse, ProjectDB, ImageSize,
+    ProjectSummary, ProjectPage, ProjectSort, SortOrder, FundingStatus
+)
+from api.v1.services.hedera import verify_transaction
+from api.v1.services.wallet_pool import acquire_project_wallet
+from api.v1.services.verification import get_stored_verifications, store_verifications
+from api.db.database import AsyncSessionLocal
 from datetime import datetime, timezone
 from uuid import UUID
-from typing import List
+from typing import AsyncIterator, Dict, List, Optional
+from api.utils.settings import settings
+from api.utils.media_pool import media_pool
+from api.utils.image_processing import render_renditions
+from api.utils.uploads import spooled_upload
+from api.utils.pagination import encode_cursor, decode_cursor
+import asyncio
+import hashlib
+import json
 import os
 import uuid
-from PIL import Image
-import io
 from fastapi import HTTPException
 
-# Remove UPLOAD_DIR since we're storing in DB
-ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+# Images are stored in the project_images table, not on disk. Uploads are
+# accepted by content (see api.utils.uploads.sniff_image_format), not extension.
 MAX_IMAGE_SIZE = (1200, 800)  # Optimal size for web display
+# Bounding box and WEBP quality of each rendition, largest first
+RENDITIONS = {
+    ImageSize.full: (MAX_IMAGE_SIZE, 85),
+    ImageSize.card: ((600, 400), 80),
+    ImageSize.thumbnail: ((300, 200), 75),
+}
+IMAGE_VERSION_LENGTH = 16
+
+def image_version(content_hash: str) -> str:
+    return content_hash[:IMAGE_VERSION_LENGTH]
+
+def project_image_url(project: Project, size: ImageSize = ImageSize.full) -> Optional[str]:
+    """
+    Versioned image URL. A new upload changes the version, so clients may cache
+    a given URL forever.
+    """
+    if not project.image_hash:
+        return None
+    version = image_version(project.image_hash)
+    if size == ImageSize.full:
+        return f"/projects/{project.id}/image?v={version}"
+    return f"/projects/{project.id}/image?size={size.value}&v={version}"
+
+def project_image_urls(project: Project) -> Optional[Dict[ImageSize, str]]:
+    if not project.image_hash:
+        return None
+    return {size: project_image_url(project, size) for size in RENDITIONS}
 
 def project_to_response(project: Project) -> ProjectResponse:
     """Convert database Project model to API response model"""
@@ -29,46 +71,58 @@ def project_to_response(project: Project) -> ProjectResponse:
         location=project.location,
         verified=project.verified,
         wallet_address=project.wallet_address,
-        image=f"/projects/{project.id}/image" if project.image else None,
+        image=project_image_url(project),
+        images=project_image_urls(project),
         image_mime_type=project.image_mime_type,
         created_by=project.created_by,
         created_at=project.created_at,
         updated_at=project.updated_at
     )
 
-async def optimize_image(image_file) -> tuple[bytes, str]:
+async def optimize_image(image_file) -> tuple[Dict[ImageSize, bytes], str]:
     """
-    Optimize uploaded image and return binary data and MIME type.
+    Optimize uploaded image and return the binary data of each rendition and
+    their MIME type. The upload is streamed to a temporary file, and decoding
+    and encoding run on the media worker pool straight from that file.
     """
-    # Read image file
-    image_data = await image_file.read()
-    image = Image.open(io.BytesIO(image_data))
-    
-    # Convert to RGB if necessary (for JPEG)
-    if image.mode in ('RGBA', 'P'):
-        image = image.convert('RGB')
-    
-    # Resize image while maintaining aspect ratio
-    image.thumbnail(MAX_IMAGE_SIZE, Image.Resampling.LANCZOS)
-    
-    # Convert to bytes
-    output = io.BytesIO()
-    image.save(output, 'WEBP', quality=85, optimize=True)
-    optimized_data = output.getvalue()
-    
-    return optimized_data, 'image/webp'
+    specs = [(size.value, box, quality) for size, (box, quality) in RENDITIONS.items()]
+    async with spooled_upload(image_file, settings.MAX_IMAGE_UPLOAD_BYTES) as path:
+        rendered = await media_pool.run(render_renditions, path, specs, settings.MEDIA_MAX_IMAGE_PIXELS)
+    return {ImageSize(name): data for name, data in rendered.items()}, 'image/webp'
 
-async def create_project(db: Session, project: ProjectCreate, user_id: UUID, image_file = None) -> ProjectResponse:
+async def store_project_image(db: AsyncSession, project: Project, renditions: Dict[ImageSize, bytes], mime_type: str) -> None:
+    """
+    Save a project's image renditions to the image store and point the project
+    at them. Does not commit.
+    """
+    stored = {
+        image.rendition: image
+        for image in (await db.scalars(select(ProjectImage).where(ProjectImage.project_id == project.id))).all()
+    }
+    for size, image_data in renditions.items():
+        image = stored.get(size.value)
+        if image is None:
+            image = ProjectImage(project_id=project.id, rendition=size.value)
+            db.add(image)
+        image.content_hash = hashlib.sha256(image_data).hexdigest()
+        image.mime_type = mime_type
+        image.size = len(image_data)
+        image.data = image_data
+
+    project.image_hash = hashlib.sha256(renditions[ImageSize.full]).hexdigest()
+    project.image_mime_type = mime_type
+
+async def create_project(db: AsyncSession, project: ProjectCreate, user_id: UUID, image_file = None) -> ProjectResponse:
     """
     Create a new project with a Hedera wallet in the database.
     """
-    wallet_address = await create_project_wallet(db)
+    wallet_address = await acquire_project_wallet(db)
     
     # Handle image upload if provided
-    image_data = None
+    renditions = None
     mime_type = None
     if image_file:
-        image_data, mime_type = await optimize_image(image_file)
+        renditions, mime_type = await optimize_image(image_file)
     
     new_project = Project(
         title=project.title,
@@ -80,22 +134,23 @@ async def create_project(db: Session, project: ProjectCreate, user_id: UUID, ima
         location=project.location,
         verified=project.verified,
         wallet_address=wallet_address,  
-        image=image_data,  # Store binary data
-        image_mime_type=mime_type,  # Store MIME type
         created_by=user_id,
         created_at=datetime.now(timezone.utc),
         updated_at=datetime.now(timezone.utc)
     )
     db.add(new_project)
-    db.commit()
-    db.refresh(new_project)
+    if renditions:
+        await db.flush()
+        await store_project_image(db, new_project, renditions, mime_type)
+    await db.commit()
+    await db.refresh(new_project)
     return project_to_response(new_project)
 
-async def upload_project_image(db: Session, project_id: UUID, image_file, user_id: UUID) -> ProjectResponse:
+async def upload_project_image(db: AsyncSession, project_id: UUID, image_file, user_id: UUID) -> ProjectResponse:
     """
-    Upload and optimize image for a project (store in database).
+    Upload and optimize image for a project (store in the image store).
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise ValueError("Project not found")
     
@@ -104,81 +159,271 @@ async def upload_project_image(db: Session, project_id: UUID, image_file, user_i
         raise ValueError("Not authorized to update this project")
     
     # Handle image upload and optimization
-    image_data, mime_type = await optimize_image(image_file)
+    renditions, mime_type = await optimize_image(image_file)
     
-    # Update project with new image data
-    project.image = image_data
-    project.image_mime_type = mime_type
+    await store_project_image(db, project, renditions, mime_type)
     project.updated_at = datetime.now(timezone.utc)
     
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
     return project_to_response(project)
 
-async def get_project_image(db: Session, project_id: UUID) -> tuple[bytes, str]:
+def _for_rendition(query, project_id: UUID, size: ImageSize):
+    """
+    Restrict an image query to the `size` rendition, falling back to the full
+    image for projects uploaded before renditions existed.
+    """
+    return query.where(
+        ProjectImage.project_id == project_id,
+        ProjectImage.rendition.in_({size.value, ImageSize.full.value})
+    ).order_by((ProjectImage.rendition == size.value).desc()).limit(1)
+
+async def get_project_image_meta(db: AsyncSession, project_id: UUID, size: ImageSize = ImageSize.full):
+    """
+    Content hash, MIME type and last update of a project's image rendition,
+    plus the project's image version, without loading the image itself.
+    Returns None if the project has no image.
+    """
+    return (await db.execute(_for_rendition(
+        select(ProjectImage.content_hash, ProjectImage.mime_type, ProjectImage.updated_at, Project.image_hash)
+        .join(Project, Project.id == ProjectImage.project_id),
+        project_id,
+        size
+    ))).first()
+
+async def get_project_image(db: AsyncSession, project_id: UUID, size: ImageSize = ImageSize.full) -> tuple[bytes, str]:
     """
     Get image data and MIME type for a project.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project or not project.image:
+    row = (await db.execute(_for_rendition(select(ProjectImage.data, ProjectImage.mime_type), project_id, size))).first()
+    if not row:
         raise ValueError("Project or image not found")
     
-    return project.image, project.image_mime_type or 'image/webp'
+    return row.data, row.mime_type or 'image/webp'
 
-async def get_verified_projects(db: Session) -> List[ProjectResponse]:
+async def get_verified_projects(db: AsyncSession) -> List[ProjectResponse]:
     """
     Get all verified projects.
     """
-    projects = db.query(Project).filter(Project.verified == True).all()
+    projects = (await db.scalars(select(Project).where(Project.verified == True))).all()
     return [project_to_response(project) for project in projects]
 
-async def get_project_by_id(db: Session, project_id: UUID) -> ProjectResponse:
+SORT_KEYS = {
+    ProjectSort.amount_raised: Project.amount_raised,
+    ProjectSort.created_at: Project.created_at,
+    ProjectSort.completion: completion_ratio,
+}
+
+# Everything ProjectSummary needs; description and the rest stay unloaded
+SUMMARY_COLUMNS = (
+    Project.title, Project.category, Project.location, Project.target_amount, Project.amount_raised,
+    Project.backers_count, Project.verified, Project.image_hash, Project.created_at,
+)
+
+def project_to_summary(project: Project) -> ProjectSummary:
+    return ProjectSummary(
+        id=project.id,
+        title=project.title,
+        category=project.category,
+        location=project.location,
+        target_amount=project.target_amount,
+        amount_raised=project.amount_raised,
+        backers_count=project.backers_count or 0,
+        completion=project.amount_raised / project.target_amount if project.target_amount else 0.0,
+        verified=project.verified,
+        image=project_image_url(project, ImageSize.thumbnail),
+        created_at=project.created_at
+    )
+
+def _cursor_position(cursor: str, sort: ProjectSort, order: SortOrder) -> tuple:
+    """Decode a listing cursor into its (sort value, project id) keyset position"""
+    position = decode_cursor(cursor)
+    if position.get("sort") != sort.value or position.get("order") != order.value:
+        raise ValueError("Cursor does not match the requested sort order")
+    try:
+        value = position["value"]
+        value = datetime.fromisoformat(value) if sort == ProjectSort.created_at else float(value)
+        return value, UUID(position["id"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+async def list_projects(
+    db: AsyncSession,
+    category: Optional[str] = None,
+    location: Optional[str] = None,
+    funding: Optional[FundingStatus] = None,
+    sort: ProjectSort = ProjectSort.amount_raised,
+    order: SortOrder = SortOrder.desc,
+    limit: int = 20,
+    cursor: Optional[str] = None
+) -> ProjectPage:
+    """
+    One page of verified projects, using keyset pagination on (sort key, id).
+    Pass the returned next_cursor back to get the following page.
+    """
+    sort_key = SORT_KEYS[sort]
+    query = select(Project, sort_key.label("sort_value")).options(load_only(*SUMMARY_COLUMNS)).where(
+        Project.verified == True
+    )
+    if category:
+        query = query.where(Project.category == category)
+    if location:
+        query = query.where(Project.location.icontains(location, autoescape=True))
+    if funding == FundingStatus.funded:
+        query = query.where(Project.amount_raised >= Project.target_amount)
+    elif funding == FundingStatus.open:
+        query = query.where(Project.amount_raised < Project.target_amount)
+
+    keyset = tuple_(sort_key, Project.id)
+    if cursor:
+        position = _cursor_position(cursor, sort, order)
+        query = query.where(keyset < position if order == SortOrder.desc else keyset > position)
+    if order == SortOrder.desc:
+        query = query.order_by(sort_key.desc(), Project.id.desc())
+    else:
+        query = query.order_by(sort_key.asc(), Project.id.asc())
+
+    rows = (await db.execute(query.limit(limit + 1))).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        value = last.sort_value.isoformat() if sort == ProjectSort.created_at else last.sort_value
+        next_cursor = encode_cursor({"sort": sort.value, "order": order.value, "value": value, "id": str(last.Project.id)})
+
+    return ProjectPage(items=[project_to_summary(row.Project) for row in rows], next_cursor=next_cursor)
+
+async def get_project_by_id(db: AsyncSession, project_id: UUID) -> ProjectResponse:
     """
     Get a project by its ID.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         return None
     return project_to_response(project)
 
-async def verify_project(db: Session, project_id: UUID) -> ProjectResponse:
+async def verify_project(db: AsyncSession, project_id: UUID) -> ProjectResponse:
     """
     Verify a project (set verified=True).
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise ValueError("Project not found")
     project.verified = True
-    db.commit()
-    db.refresh(project)
+    await db.commit()
+    await db.refresh(project)
     return project_to_response(project)
 
-async def get_project_transparency(db: Session, project_id: UUID) -> dict:
+UNVERIFIED = {"valid": False, "from_account": None, "to_account": None, "amount": 0.0}
+
+async def get_project_with_donations(db: AsyncSession, project_id: UUID) -> tuple[Project, List[Donation]]:
     """
-    Get transparency details for a project.
+    Load a project and its donations for the transparency report.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = await db.get(Project, project_id)
     if not project:
         raise ValueError("Project not found")
-    
-    donations = db.query(Donation).filter(Donation.project_id == project_id).all()
-    verified_donations = []
-    for donation in donations:
-        verification = await verify_transaction(donation.tx_hash) if donation.tx_hash else {"valid": False, "from_account": None, "to_account": None, "amount": 0.0}
-        verified_donations.append({
-            "amount": donation.amount,
-            "tx_hash": donation.tx_hash,
-            "status": donation.status.value,
-            "from_account": verification["from_account"],
-            "to_account": verification["to_account"],
-            "valid": verification["valid"]
-        })
-    
+
+    donations = (await db.scalars(select(Donation).where(Donation.project_id == project_id))).all()
+    return project, donations
+
+def transparency_header(project: Project) -> dict:
     return {
-        "project_id": project_id,
+        "project_id": project.id,
         "wallet_address": project.wallet_address,
         "amount_raised": project.amount_raised,
         "backers_count": project.backers_count,
-        "image": f"/projects/{project_id}/image" if project.image else None,
+        "image": project_image_url(project),
+    }
+
+async def verify_donations(
+    donations: List[Donation],
+    known: Optional[Dict[str, dict]] = None,
+    fetched: Optional[Dict[str, dict]] = None
+) -> AsyncIterator[tuple[int, dict]]:
+    """
+    Verify donations against the mirror node concurrently, yielding
+    (index, entry) pairs in completion order. At most MIRROR_NODE_CONCURRENCY
+    lookups are in flight, sharing the mirror node connection pool.
+    Transactions present in `known` skip the network; results fetched from the
+    network are collected into `fetched` so the caller can persist them.
+    Donations still pending are reported unverified without a lookup: their
+    transaction may not exist yet, and the mirror node would be waited on for
+    nothing.
+    """
+    known = known or {}
+    # Copy plain values up front so the fan-out never touches the ORM session
+    rows = [(donation.amount, donation.tx_hash, donation.status.value) for donation in donations]
+    semaphore = asyncio.Semaphore(settings.MIRROR_NODE_CONCURRENCY)
+
+    async def verify(index: int, amount: float, tx_hash: Optional[str], status: str) -> tuple[int, dict]:
+        if status == DonationStatus.pending.value:
+            verification = UNVERIFIED
+        elif tx_hash in known:
+            verification = known[tx_hash]
+        elif tx_hash:
+            async with semaphore:
+                verification = await verify_transaction(tx_hash)
+            if fetched is not None:
+                fetched[tx_hash] = verification
+        else:
+            verification = UNVERIFIED
+        return index, {
+            "amount": amount,
+            "tx_hash": tx_hash,
+            "status": status,
+            "from_account": verification["from_account"],
+            "to_account": verification["to_account"],
+            "valid": verification["valid"]
+        }
+
+    tasks = [asyncio.ensure_future(verify(index, *row)) for index, row in enumerate(rows)]
+    try:
+        for completed in asyncio.as_completed(tasks):
+            yield await completed
+    finally:
+        for task in tasks:
+            task.cancel()
+
+async def get_project_transparency(db: AsyncSession, project_id: UUID) -> dict:
+    """
+    Get transparency details for a project.
+    """
+    project, donations = await get_project_with_donations(db, project_id)
+    # Read everything needed from the loaded project before anything is committed
+    header = transparency_header(project)
+    known = await get_stored_verifications(db, [donation.tx_hash for donation in donations])
+
+    fetched = {}
+    verified_donations = [None] * len(donations)
+    async for index, entry in verify_donations(donations, known, fetched):
+        verified_donations[index] = entry
+
+    await store_verifications(db, fetched)
+
+    return {
+        **header,
         "donations": verified_donations
-    }
\ No newline at end of file
+    }
+
+async def stream_project_transparency(
+    project: Project,
+    donations: List[Donation],
+    known: Optional[Dict[str, dict]] = None
+) -> AsyncIterator[str]:
+    """
+    Stream the transparency report as NDJSON: the project header first, then one
+    line per donation as soon as its verification completes.
+    """
+    header = transparency_header(project)
+    yield json.dumps({"type": "project", **header}, default=str) + "\n"
+
+    fetched = {}
+    async for index, entry in verify_donations(donations, known, fetched):
+        yield json.dumps({"type": "donation", "index": index, **entry}, default=str) + "\n"
+    yield json.dumps({"type": "end", "count": len(donations)}) + "\n"
+
+    # The request session is gone once streaming starts, so persist with our own
+    if fetched:
+        async with AsyncSessionLocal() as db:
+            await store_verifications(db, fetched)
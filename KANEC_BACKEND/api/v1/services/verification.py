@@ -0,0 +1,145 @@
+from typing import Dict, Iterable
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+import logging
+
+from api.v1.models.transaction_verification import TransactionVerification
+from api.v1.models.donation import Donation, DonationStatus
+from api.utils.transaction_id import to_mirror_tx_id, try_parse_tx_id
+from api.v1.services.hedera import verify_transaction
+
+logger = logging.getLogger(__name__)
+
+
+def record_to_verification(record: TransactionVerification) -> dict:
+    return {
+        "valid": record.valid,
+        "result": record.result,
+        "amount": record.amount,
+        "from_account": record.from_account,
+        "to_account": record.to_account,
+        "timestamp": record.consensus_timestamp,
+        "transaction_id": record.tx_id,
+        "transfers": record.transfers or []
+    }
+
+
+def is_finalized(verification: dict) -> bool:
+    """A mirror-node record with a consensus timestamp never changes"""
+    return bool(verification.get("timestamp"))
+
+
+async def get_stored_verifications(db: AsyncSession, tx_hashes: Iterable[str]) -> Dict[str, dict]:
+    """
+    Load stored verifications for many transactions in one query, keyed by the
+    tx_hash values passed in.
+    """
+    keys = {}
+    for tx_hash in tx_hashes:
+        tx_id = try_parse_tx_id(tx_hash)
+        if tx_id is not None:
+            keys[tx_hash] = tx_id.to_mirror()
+    if not keys:
+        return {}
+
+    records = (await db.scalars(select(TransactionVerification).where(
+        TransactionVerification.tx_id.in_(set(keys.values()))
+    ))).all()
+    by_tx_id = {record.tx_id: record_to_verification(record) for record in records}
+    return {tx_hash: by_tx_id[tx_id] for tx_hash, tx_id in keys.items() if tx_id in by_tx_id}
+
+
+def _insert_ignoring_duplicates(db: AsyncSession):
+    dialect = db.get_bind().dialect.name
+    insert = sqlite_insert if dialect == "sqlite" else postgresql_insert
+    return insert(TransactionVerification).on_conflict_do_nothing(index_elements=["tx_id"])
+
+
+async def store_verifications(db: AsyncSession, verifications: Dict[str, dict]) -> None:
+    """
+    Persist finalized verifications in one statement and one commit. Pending or
+    unknown transactions are not stored, and rows already stored (possibly by
+    a concurrent request) are left as they are, so the session is never
+    rolled back and loaded objects stay usable.
+    """
+    rows = [
+        {
+            "tx_id": to_mirror_tx_id(tx_hash),
+            "valid": verification["valid"],
+            "result": verification.get("result"),
+            "amount": verification["amount"],
+            "from_account": verification["from_account"],
+            "to_account": verification["to_account"],
+            "consensus_timestamp": verification["timestamp"],
+            "transfers": verification.get("transfers")
+        }
+        for tx_hash, verification in verifications.items()
+        if is_finalized(verification)
+    ]
+    if not rows:
+        return
+
+    await db.execute(_insert_ignoring_duplicates(db), rows)
+    await db.commit()
+
+
+async def store_verification(db: AsyncSession, tx_hash: str, verification: dict) -> None:
+    """
+    Persist a finalized verification. Pending or unknown transactions are not stored.
+    """
+    await store_verifications(db, {tx_hash: verification})
+
+
+async def verify_transaction_cached(db: AsyncSession, tx_hash: str) -> dict:
+    """
+    Verify a transaction, serving finalized results from the verification store
+    and only reaching the mirror node for unknown or pending transactions.
+    """
+    stored = await get_stored_verifications(db, [tx_hash])
+    if tx_hash in stored:
+        return stored[tx_hash]
+
+    verification = await verify_transaction(tx_hash)
+    await store_verification(db, tx_hash, verification)
+    return verification
+
+
+async def trace_transaction(tx_hash: str, db: AsyncSession) -> dict:
+    """
+    Trace a donation by transaction hash.
+    
+    Args:
+        tx_hash: Hedera transaction ID, in SDK or mirror-node form
+        db: SQLAlchemy async session
+    
+    Returns:
+        dict: Transaction details with linked donation/project
+    """
+    tx_hash = to_mirror_tx_id(tx_hash)
+    donation = await db.scalar(select(Donation).where(Donation.tx_hash == tx_hash))
+    if donation and donation.status == DonationStatus.pending:
+        # Still settling; the transaction may not have reached the mirror node yet
+        verification = {"valid": False, "amount": 0.0, "from_account": None, "to_account": None, "timestamp": None}
+    else:
+        verification = await verify_transaction_cached(db, tx_hash)
+    
+    result = {
+        "transaction_id": tx_hash,
+        "valid": verification["valid"],
+        "amount": verification["amount"],
+        "from_account": verification["from_account"],
+        "to_account": verification["to_account"],
+        "timestamp": verification["timestamp"]
+    }
+    
+    if donation:
+        result.update({
+            "donation_id": donation.id,
+            "project_id": donation.project_id,
+            "donor_id": donation.donor_id,
+            "status": donation.status.value
+        })
+    
+    return result
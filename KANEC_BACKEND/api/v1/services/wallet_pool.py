@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.db.database import TaskSessionLocal
+from api.utils.settings import settings
+from api.utils.metrics import metrics
+from api.v1.models.wallet_pool import WalletKind, WalletPoolAccount
+from api.v1.services.hedera import create_user_wallet, create_project_wallet, encrypt_private_key
+
+logger = logging.getLogger(__name__)
+
+pool_depth = metrics.gauge("wallet_pool_depth", "Unclaimed pre-created wallets, as last seen by this process")
+pool_claims = metrics.counter("wallet_pool_claims", "Wallets handed out, from the pool or created live")
+pool_created = metrics.counter("wallet_pool_created", "Wallets created by the pool replenisher")
+pool_create_failures = metrics.counter("wallet_pool_create_failures", "Replenisher account creations that failed")
+
+LOW_WATER: Dict[WalletKind, int] = {
+    WalletKind.user: settings.WALLET_POOL_USER_LOW_WATER,
+    WalletKind.project: settings.WALLET_POOL_PROJECT_LOW_WATER,
+}
+TARGET: Dict[WalletKind, int] = {
+    WalletKind.user: settings.WALLET_POOL_USER_TARGET,
+    WalletKind.project: settings.WALLET_POOL_PROJECT_TARGET,
+}
+
+# How often one process may ask for an early top-up of the same pool
+REPLENISH_REQUEST_INTERVAL = 10.0
+_replenish_requested: Dict[WalletKind, float] = {}
+
+
+async def pool_size(db: AsyncSession, kind: WalletKind) -> int:
+    """Number of unclaimed accounts of `kind`"""
+    return await db.scalar(
+        select(func.count()).select_from(WalletPoolAccount).where(
+            WalletPoolAccount.kind == kind,
+            WalletPoolAccount.claimed_at.is_(None)
+        )
+    )
+
+
+async def claim_wallet(db: AsyncSession, kind: WalletKind) -> Optional[WalletPoolAccount]:
+    """
+    Claim the oldest unclaimed account of `kind`, or None when the pool is empty.
+
+    The row stays locked until the caller's transaction ends and SKIP LOCKED
+    lets concurrent claims take different rows. Rolling back returns the
+    account to the pool. Does not commit.
+    """
+    account = await db.scalar(
+        select(WalletPoolAccount)
+        .where(WalletPoolAccount.kind == kind, WalletPoolAccount.claimed_at.is_(None))
+        .order_by(WalletPoolAccount.created_at)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    if account is None:
+        return None
+    account.claimed_at = datetime.now(timezone.utc)
+    await db.flush()
+    return account
+
+
+async def acquire_user_wallet(db: AsyncSession) -> Tuple[str, str]:
+    """
+    Return (wallet_address, encrypted_private_key) for a new user, claimed from
+    the pool when possible and otherwise created on the network. Does not commit.
+    """
+    account = await claim_wallet(db, WalletKind.user)
+    await _after_claim(db, WalletKind.user, account)
+    if account is not None:
+        return account.wallet_address, account.encrypted_private_key
+
+    wallet_address, private_key = await create_user_wallet()
+    return wallet_address, encrypt_private_key(private_key, settings.PRIVATE_KEY_ENCRYPTION_KEY)
+
+
+async def acquire_project_wallet(db: AsyncSession) -> str:
+    """
+    Return a wallet address for a new project, claimed from the pool when
+    possible and otherwise created on the network. Does not commit.
+    """
+    account = await claim_wallet(db, WalletKind.project)
+    await _after_claim(db, WalletKind.project, account)
+    if account is not None:
+        return account.wallet_address
+    return await create_project_wallet(db)
+
+
+async def _after_claim(db: AsyncSession, kind: WalletKind, account: Optional[WalletPoolAccount]) -> None:
+    pool_claims.inc(kind=kind.value, source="pool" if account is not None else "live")
+    depth = await pool_size(db, kind)
+    pool_depth.set(depth, kind=kind.value)
+    if account is None:
+        logger.warning(f"Wallet pool for {kind.value} is empty, creating the account live")
+    if depth < LOW_WATER[kind]:
+        request_replenish(kind)
+
+
+def request_replenish(kind: WalletKind) -> None:
+    """Ask the worker for an early top-up, at most once per interval per process"""
+    now = time.monotonic()
+    if now - _replenish_requested.get(kind, float("-inf")) < REPLENISH_REQUEST_INTERVAL:
+        return
+    _replenish_requested[kind] = now
+    try:
+        from api.utils.celery_app import replenish_wallet_pool_task
+        replenish_wallet_pool_task.delay(kind.value)
+    except Exception as e:
+        logger.warning(f"Could not queue wallet pool top-up for {kind.value}: {str(e)}")
+
+
+async def _create_pool_account(kind: WalletKind) -> WalletPoolAccount:
+    if kind == WalletKind.user:
+        wallet_address, private_key = await create_user_wallet()
+        encrypted_key = encrypt_private_key(private_key, settings.PRIVATE_KEY_ENCRYPTION_KEY)
+        return WalletPoolAccount(kind=kind, wallet_address=wallet_address, encrypted_private_key=encrypted_key)
+    wallet_address = await create_project_wallet(None)
+    return WalletPoolAccount(kind=kind, wallet_address=wallet_address)
+
+
+async def replenish_wallet_pool(kind: WalletKind) -> int:
+    """
+    Top the pool for `kind` up to its target and return how many accounts were
+    created. Runs in the Celery worker.
+
+    At most WALLET_POOL_REPLENISH_BATCH accounts are created per run, and each
+    one is committed as soon as it exists so a failure part-way keeps the ones
+    already paid for. Overlapping runs can overshoot the target by one batch.
+    """
+    async with TaskSessionLocal() as db:
+        depth = await pool_size(db, kind)
+        missing = min(TARGET[kind] - depth, settings.WALLET_POOL_REPLENISH_BATCH)
+        created = 0
+        for _ in range(max(missing, 0)):
+            try:
+                account = await _create_pool_account(kind)
+            except Exception as e:
+                pool_create_failures.inc(kind=kind.value)
+                logger.error(f"Failed to pre-create {kind.value} wallet: {str(e)}")
+                break
+            db.add(account)
+            await db.commit()
+            created += 1
+            pool_created.inc(kind=kind.value)
+
+        pool_depth.set(depth + created, kind=kind.value)
+        if created:
+            logger.info(f"Wallet pool for {kind.value} topped up by {created} to {depth + created}")
+        return created
+
+
+async def replenish_wallet_pools() -> Dict[str, int]:
+    """Top up every pool in turn"""
+    return {kind.value: await replenish_wallet_pool(kind) for kind in WalletKind}
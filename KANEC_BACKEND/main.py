@@ -1,15 +1,40 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
 from api.utils.settings import settings
+from api.utils.metrics import metrics
+from api.utils.redis_utils import redis_client
+from api.utils.hedera_pool import hedera_pool
+from api.utils.hedera_executor import hedera_executor, HederaExecutorSaturated
+from api.utils.mirror_node import mirror_node
+from api.utils.media_pool import media_pool, MediaPoolSaturated
+from api.utils.password_hasher import password_hasher, PasswordHasherSaturated
+from api.utils.uploads import UploadSizeLimitMiddleware, MULTIPART_OVERHEAD
 from api.v1.routes import api_version_one
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await hedera_pool.start()
+    await mirror_node.start()
+    yield
+    await mirror_node.close()
+    await hedera_pool.close()
+    hedera_executor.shutdown()
+    media_pool.shutdown()
+    password_hasher.shutdown()
+    await redis_client.close()
+
+
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.VERSION,
     debug=settings.DEBUG,
-    root_path="/kanec"
+    root_path="/kanec",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -20,10 +45,31 @@ app.add_middleware(
     allow_headers=["*"],
     expose_headers=["*"]
 )
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_bytes=settings.MAX_IMAGE_UPLOAD_BYTES + MULTIPART_OVERHEAD,
+    path_pattern=r"/projects/[^/]+/image$"
+)
 app.mount("/static/projects/", StaticFiles(directory="static"), name="static")
 
 app.include_router(api_version_one)
 
+@app.exception_handler(HederaExecutorSaturated)
+async def hedera_saturated_handler(request: Request, exc: HederaExecutorSaturated):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+@app.exception_handler(MediaPoolSaturated)
+async def media_saturated_handler(request: Request, exc: MediaPoolSaturated):
+    return JSONResponse(status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+@app.exception_handler(PasswordHasherSaturated)
+async def password_hasher_saturated_handler(request: Request, exc: PasswordHasherSaturated):
+    return JSONResponse(status_code=429, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
 @app.get("/")
 def healthcheck():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+@app.get("/metrics")
+def get_metrics():
+    return metrics.snapshot()
\ No newline at end of file
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+""" Checks that the hot donation and project queries are planned on their indexes
+
+Runs EXPLAIN for each query against the configured database and exits non-zero
+if a plan does not use the expected index. Sequential scans are disabled for the
+check so small development databases give the same answer as production.
+"""
+import sys, os
+import json
+import uuid
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import select, func, distinct
+
+from api.v1.models.donation import Donation, DonationStatus
+from api.v1.models.project import Project, completion_ratio
+from api.db.database import engine
+
+SAMPLE_ID = uuid.uuid4()
+
+HOT_QUERIES = [
+    (
+        "user completed donations",
+        select(Donation).where(
+            Donation.donor_id == SAMPLE_ID,
+            Donation.status == DonationStatus.completed
+        ).order_by(Donation.created_at.desc()),
+        "ix_donations_donor_status_created",
+    ),
+    (
+        "project analytics",
+        select(Donation).where(
+            Donation.project_id == SAMPLE_ID,
+            Donation.status == DonationStatus.completed
+        ),
+        "ix_donations_project_status_created",
+    ),
+    (
+        "project backers count",
+        select(func.count(distinct(Donation.donor_id))).where(
+            Donation.project_id == SAMPLE_ID,
+            Donation.status == DonationStatus.completed
+        ),
+        "ix_donations_project_status_created",
+    ),
+    (
+        "recent platform activity",
+        select(func.count()).select_from(Donation).where(
+            Donation.status == DonationStatus.completed,
+            Donation.created_at >= func.now() - func.make_interval(0, 0, 0, 7)
+        ),
+        "ix_donations_completed_created",
+    ),
+    (
+        "recommended projects by category",
+        select(Project.id).where(
+            Project.verified == True,
+            Project.category.in_(["Education", "Health"])
+        ).order_by(Project.amount_raised.desc()).limit(5),
+        "ix_projects_verified_category_raised",
+    ),
+    (
+        "top verified projects",
+        select(Project.id).where(Project.verified == True).order_by(Project.amount_raised.desc()).limit(5),
+        "ix_projects_verified_raised",
+    ),
+    (
+        "project listing by completion",
+        select(Project.id).where(Project.verified == True).order_by(
+            completion_ratio.desc(), Project.id.desc()
+        ).limit(21),
+        "ix_projects_verified_completion",
+    ),
+    (
+        "project listing by newest",
+        select(Project.id).where(Project.verified == True).order_by(
+            Project.created_at.desc(), Project.id.desc()
+        ).limit(21),
+        "ix_projects_verified_created",
+    ),
+]
+
+
+def plan_indexes(node: dict) -> set:
+    """Every index name referenced anywhere in an EXPLAIN (FORMAT JSON) plan node"""
+    found = {node["Index Name"]} if "Index Name" in node else set()
+    for child in node.get("Plans", []):
+        found |= plan_indexes(child)
+    return found
+
+
+def explain(conn, query) -> dict:
+    compiled = query.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+    rows = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}").scalar()
+    plan = rows if isinstance(rows, list) else json.loads(rows)
+    return plan[0]["Plan"]
+
+
+def main() -> int:
+    failures = 0
+    with engine.connect() as conn:
+        with conn.begin() as transaction:
+            conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            for name, query, expected in HOT_QUERIES:
+                used = plan_indexes(explain(conn, query))
+                if expected in used:
+                    print(f"ok    {name}: {expected}")
+                else:
+                    failures += 1
+                    print(f"FAIL  {name}: expected {expected}, plan used {sorted(used) or 'no index'}")
+            transaction.rollback()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+
+import pytest
+import pytest_asyncio
+from passlib.context import CryptContext
+
+from api.utils.password_hasher import PasswordHasher, PasswordHasherSaturated
+from api.v1.models.user import User
+from api.v1.schemas.user import Login
+from api.v1.services.auth import login_user
+
+
+def fast_context(rounds: int = 5) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds, bcrypt__min_rounds=rounds)
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(fast_context(), workers=1, max_pending=1)
+    yield hasher
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_run_off_the_loop(hasher):
+    hashed = await hasher.hash("correct horse")
+
+    assert await hasher.verify("correct horse", hashed)
+    assert not await hasher.verify("battery staple", hashed)
+    assert not await hasher.verify("correct horse", None)
+    assert hasher.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_saturated_pool_rejects_instead_of_queueing(hasher):
+    release = threading.Event()
+    blocked = asyncio.ensure_future(hasher._run(release.wait))
+    await asyncio.sleep(0)
+
+    with pytest.raises(PasswordHasherSaturated):
+        await hasher.hash("correct horse")
+
+    release.set()
+    await blocked
+    assert hasher.pending == 0
+    assert await hasher.hash("correct horse")
+
+
+@pytest.mark.asyncio
+async def test_outdated_cost_is_rehashed(hasher):
+    old = fast_context(4).hash("correct horse")
+
+    valid, new_hash = await hasher.verify_and_update("correct horse", old)
+    assert valid and new_hash is not None
+    assert hasher.context.identify(new_hash) == "bcrypt" and "$05$" in new_hash
+
+    assert await hasher.verify_and_update("correct horse", new_hash) == (True, None)
+    assert await hasher.verify_and_update("battery staple", old) == (False, None)
+
+
+@pytest_asyncio.fixture
+async def verified_user(session_factory, seeded, hasher, monkeypatch):
+    _, (user_id, _) = seeded
+    monkeypatch.setattr("api.v1.services.auth.password_hasher", hasher)
+    async with session_factory() as db:
+        user = await db.get(User, user_id)
+        user.password = fast_context(4).hash("correct horse")
+        user.is_verified = True
+        await db.commit()
+        return user_id, user.email
+
+
+@pytest.mark.asyncio
+async def test_login_upgrades_the_stored_hash(session_factory, verified_user):
+    user_id, email = verified_user
+
+    async with session_factory() as db:
+        response = await login_user(db, Login(email=email, password="correct horse"))
+    assert response["access_token"]
+
+    async with session_factory() as db:
+        stored = (await db.get(User, user_id)).password
+    assert "$05$" in stored
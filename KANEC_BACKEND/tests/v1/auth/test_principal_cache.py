@@ -0,0 +1,89 @@
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+
+from api.utils.password_hasher import pwd_context
+from api.v1.models.user import User
+from api.v1.schemas.user import UserUpdate
+from api.v1.services import principal as principal_service
+from api.v1.services.auth import (
+    create_access_token,
+    delete_user_account,
+    get_current_user,
+    update_user_profile,
+)
+from api.v1.services.principal import principal_cache
+
+
+@pytest_asyncio.fixture
+async def user(session_factory, seeded, monkeypatch):
+    """The first seeded donor, with a real password hash; returns (user_id, token)"""
+    _, (user_id, _) = seeded
+    async with session_factory() as db:
+        user = await db.get(User, user_id)
+        user.password = pwd_context.hash("correct horse")
+        email = user.email
+        await db.commit()
+
+    loads = []
+
+    async def counting_load(email):
+        loads.append(email)
+        return await load(email)
+
+    load = principal_service._load_principal
+    monkeypatch.setattr(principal_service, "AsyncSessionLocal", session_factory)
+    monkeypatch.setattr(principal_service, "_load_principal", counting_load)
+    principal_cache.local.clear()
+    yield user_id, await create_access_token({"sub": email}), loads
+    principal_cache.local.clear()
+
+
+@pytest.mark.asyncio
+async def test_principal_is_cached_by_token_subject(user):
+    user_id, token, loads = user
+
+    first = await get_current_user(token)
+    second = await get_current_user(token)
+
+    assert first == second
+    assert first.id == user_id
+    assert first.has_wallet_key is True
+    assert not hasattr(first, "encrypted_private_key")
+    assert len(loads) == 1
+
+
+@pytest.mark.asyncio
+async def test_full_user_is_loaded_on_demand(session_factory, user):
+    _, token, _ = user
+    principal = await get_current_user(token)
+
+    async with session_factory() as db:
+        full = await principal.load(db)
+
+    assert full.encrypted_private_key == "key"
+
+
+@pytest.mark.asyncio
+async def test_profile_update_invalidates_the_principal(session_factory, user):
+    _, token, loads = user
+    principal = await get_current_user(token)
+
+    async with session_factory() as db:
+        await update_user_profile(db, await principal.load(db), UserUpdate(name="Renamed Donor"))
+
+    assert (await get_current_user(token)).name == "Renamed Donor"
+    assert len(loads) == 2
+
+
+@pytest.mark.asyncio
+async def test_deleted_account_stops_authenticating(session_factory, user):
+    _, token, _ = user
+    principal = await get_current_user(token)
+
+    async with session_factory() as db:
+        await delete_user_account(db, await principal.load(db), "correct horse")
+
+    with pytest.raises(HTTPException) as error:
+        await get_current_user(token)
+    assert error.value.status_code == 401
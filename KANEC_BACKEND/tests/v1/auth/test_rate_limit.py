@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from api.utils.rate_limit import EMAIL, IP, USER, RateLimiter, Rule, local_limiter
+from api.utils.redis_utils import redis_client
+from api.v1.services.auth import create_access_token
+
+
+class Body(BaseModel):
+    email: str
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Redis is down, so the in-process limiter answers
+    monkeypatch.setattr(redis_client, "enabled", False)
+    local_limiter.clear()
+
+    login_limit = RateLimiter("test-login", Rule(IP, 5, 60), Rule(EMAIL, 2, 60))
+    transfer_limit = RateLimiter("test-transfer", Rule(USER, 1, 60))
+    app = FastAPI()
+
+    @app.post("/login", dependencies=[Depends(login_limit)])
+    async def login(body: Body):
+        return {"email": body.email}
+
+    @app.post("/resend", dependencies=[Depends(login_limit)])
+    async def resend(email: str):
+        return {"email": email}
+
+    @app.post("/transfer", dependencies=[Depends(transfer_limit)])
+    async def transfer():
+        return {}
+
+    yield TestClient(app)
+    local_limiter.clear()
+
+
+def test_email_limit_returns_429_with_retry_after(client):
+    for _ in range(2):
+        response = client.post("/login", json={"email": "a@example.com"})
+        assert response.status_code == 200
+        assert response.json() == {"email": "a@example.com"}
+
+    response = client.post("/login", json={"email": "A@example.com "})
+    assert response.status_code == 429
+    assert 1 <= int(response.headers["Retry-After"]) <= 60
+
+    # Another email still has room under the same IP limit
+    assert client.post("/login", json={"email": "b@example.com"}).status_code == 200
+
+
+def test_rejected_requests_do_not_use_up_the_ip_limit(client):
+    for _ in range(2):
+        client.post("/login", json={"email": "a@example.com"})
+    for _ in range(5):
+        assert client.post("/login", json={"email": "a@example.com"}).status_code == 429
+
+    for email in ("b@example.com", "c@example.com", "d@example.com"):
+        assert client.post("/login", json={"email": email}).status_code == 200
+    assert client.post("/login", json={"email": "e@example.com"}).status_code == 429
+
+
+def test_email_is_read_from_the_query_string(client):
+    assert client.post("/resend", params={"email": "a@example.com"}).status_code == 200
+    assert client.post("/login", json={"email": "a@example.com"}).status_code == 200
+    assert client.post("/resend", params={"email": "a@example.com"}).status_code == 429
+
+
+def test_user_limit_follows_the_token_subject(client):
+    token = asyncio.run(create_access_token({"sub": "a@example.com"}))
+    other = asyncio.run(create_access_token({"sub": "b@example.com"}))
+
+    assert client.post("/transfer", headers={"Authorization": f"Bearer {token}"}).status_code == 200
+    assert client.post("/transfer", headers={"Authorization": f"Bearer {token}"}).status_code == 429
+    assert client.post("/transfer", headers={"Authorization": f"Bearer {other}"}).status_code == 200
+    # Without a valid token the user rule does not apply; authentication rejects it later
+    assert client.post("/transfer", headers={"Authorization": "Bearer junk"}).status_code == 200
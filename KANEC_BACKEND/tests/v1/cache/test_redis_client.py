@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from api.utils import redis_utils
+from api.utils.cache_utils import TTLCache
+from api.utils.redis_utils import RedisClient, RedisUnavailable
+
+
+@pytest.fixture
+def unreachable(monkeypatch):
+    """A client pointed at a port nothing listens on"""
+    monkeypatch.setattr(redis_utils.settings, "REDIS_URL", "redis://127.0.0.1:1/0")
+    monkeypatch.setattr(redis_utils.settings, "REDIS_RETRIES", 0)
+    client = RedisClient()
+    monkeypatch.setattr(redis_utils, "redis_client", client)
+    return client
+
+
+def test_each_loop_gets_its_own_client():
+    client = RedisClient()
+
+    async def current():
+        return client.client
+
+    first = asyncio.run(current())
+    second = asyncio.run(current())
+    assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_from_url_decodes_responses(unreachable):
+    connection = unreachable.client.connection_pool.connection_kwargs
+    assert connection["decode_responses"] is True
+    assert connection["health_check_interval"] > 0
+
+
+@pytest.mark.asyncio
+async def test_connection_failure_marks_redis_down(unreachable):
+    assert await unreachable.set_otp("a@example.com", "123456") is False
+    assert not unreachable.available
+    assert unreachable.client is None
+    assert await unreachable.get_many(["a", "b"]) == [None, None]
+    with pytest.raises(RedisUnavailable):
+        async with unreachable.pipeline():
+            pass
+
+
+@pytest.mark.asyncio
+async def test_down_redis_recovers_after_cooldown(unreachable, monkeypatch):
+    monkeypatch.setattr(redis_utils.settings, "REDIS_DOWN_COOLDOWN", 0.0)
+    assert await unreachable.ping() is False
+    assert unreachable.client is not None
+
+
+@pytest.mark.asyncio
+async def test_cache_falls_back_to_local_when_redis_is_down(unreachable, monkeypatch):
+    monkeypatch.setattr("api.utils.cache_utils.redis_client", unreachable)
+    cache = TTLCache("test", ttl=60)
+
+    await cache.set_many({"a": 1, "b": {"c": 2}})
+    assert await cache.get_many(["a", "b", "missing"]) == {"a": 1, "b": {"c": 2}}
+    assert await cache.get_or_load("a", pytest.fail) == 1
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from api.utils import cache_utils
+from api.utils.cache_utils import INVALIDATE_SCRIPT, RELEASE_LOCK_SCRIPT, SET_IF_CURRENT_SCRIPT, TTLCache
+from api.utils.redis_utils import RedisClient, redis_client
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(redis_client, "enabled", False)
+    return TTLCache("test", ttl=60)
+
+
+@pytest.mark.asyncio
+async def test_invalidation_during_load_skips_write_back(cache):
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def loader():
+        started.set()
+        await release.wait()
+        return "stale"
+
+    load = asyncio.ensure_future(cache.get_or_load("a", loader))
+    await started.wait()
+    await cache.delete("a")
+    release.set()
+
+    assert await load == "stale"
+    assert await cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_state_does_not_outlive_loads(cache):
+    await cache.delete(*[f"key-{i}" for i in range(1000)])
+    assert await cache.get_or_load("a", lambda: asyncio.sleep(0, "value")) == "value"
+
+    assert cache._generations == {}
+    assert cache._fills == {}
+
+
+@pytest.mark.asyncio
+async def test_failed_load_releases_its_generation(cache):
+    async def loader():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load("a", loader)
+
+    assert cache._generations == {}
+    assert cache._fills == {}
+
+
+class FakeRedis:
+    """The commands TTLCache uses, with its scripts replayed in Python"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def eval(self, script, numkeys, *args):
+        keys, argv = args[:numkeys], args[numkeys:]
+        if script == INVALIDATE_SCRIPT:
+            count = len(keys) // 2
+            for value_key, version_key in zip(keys[:count], keys[count:]):
+                self.data[version_key] = argv[0]
+                self.data.pop(value_key, None)
+            return count
+        if script == SET_IF_CURRENT_SCRIPT:
+            if (self.data.get(keys[1]) or "") != argv[0]:
+                return 0
+            self.data[keys[0]] = argv[1]
+            return 1
+        if script == RELEASE_LOCK_SCRIPT:
+            return int(self.data.get(keys[0]) == argv[0] and self.data.pop(keys[0]) is not None)
+        raise AssertionError("unexpected script")
+
+
+@pytest.fixture
+def shared_redis(monkeypatch):
+    fake = FakeRedis()
+    client = RedisClient()
+    monkeypatch.setattr(RedisClient, "client", property(lambda self: fake))
+    monkeypatch.setattr(cache_utils, "redis_client", client)
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_invalidation_in_another_worker_wins_over_an_earlier_load(shared_redis):
+    # Two caches over the same Redis stand in for two workers
+    loading, invalidating = TTLCache("test", ttl=60), TTLCache("test", ttl=60)
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def loader():
+        started.set()
+        await release.wait()
+        return "stale"
+
+    load = asyncio.ensure_future(loading.get_or_load("a", loader))
+    await started.wait()
+    await invalidating.delete("a")
+    release.set()
+
+    assert await load == "stale"
+    assert await invalidating.get("a") is None
+    assert await invalidating.get_or_load("a", lambda: asyncio.sleep(0, "fresh")) == "fresh"
+    assert await loading.get("a") == "fresh"
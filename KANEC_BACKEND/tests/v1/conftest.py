@@ -0,0 +1,40 @@
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from api.v1.models import *
+from api.v1.models.base_class import Base
+from api.v1.models.project import Project
+from api.v1.models.user import User
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def seeded(session_factory):
+    """A project and two donors; returns (project_id, [donor_ids])"""
+    async with session_factory() as db:
+        donors = [
+            User(name=f"Donor {i}", email=f"donor{i}@example.com", password="x", wallet_address=f"0.0.100{i}", encrypted_private_key="key")
+            for i in range(2)
+        ]
+        db.add_all(donors)
+        await db.flush()
+        project = Project(
+            title="Borehole",
+            description="Clean water",
+            category="water",
+            target_amount=100.0,
+            wallet_address="0.0.2002",
+            created_by=donors[0].id
+        )
+        db.add(project)
+        await db.commit()
+        return project.id, [donor.id for donor in donors]
@@ -0,0 +1,78 @@
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+
+from api.db.pool_metrics import (
+    instrument_engine,
+    instrumented_pool,
+    pool_checked_out,
+    pool_checkout_seconds,
+    pool_checkouts,
+    pool_connects,
+    pool_invalidations,
+    pool_overflow,
+    pool_timeouts,
+    pool_waits,
+)
+
+
+@pytest.fixture
+def pooled_engine(tmp_path):
+    label = f"test-{uuid.uuid4().hex[:8]}"
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=instrumented_pool(QueuePool, label),
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.1,
+    )
+    instrument_engine(engine, label)
+    yield engine, label
+    engine.dispose()
+
+
+def test_checkouts_and_occupancy_are_exported(pooled_engine):
+    engine, label = pooled_engine
+
+    with engine.connect() as first, engine.connect() as second:
+        first.execute(text("select 1"))
+        second.execute(text("select 1"))
+        assert pool_checked_out.value(engine=label) == 2
+        assert pool_overflow.value(engine=label) == 1
+
+    assert pool_checked_out.value(engine=label) == 0
+    assert pool_checkouts.value(engine=label) == 2
+    assert pool_connects.value(engine=label) == 2
+    assert pool_checkout_seconds.count(engine=label, waited=False) == 2
+
+
+def test_exhausted_pool_counts_wait_and_timeout(pooled_engine):
+    engine, label = pooled_engine
+
+    with engine.connect(), engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    assert pool_waits.value(engine=label) == 1
+    assert pool_timeouts.value(engine=label) == 1
+    assert pool_checkout_seconds.count(engine=label, waited=True) == 1
+
+
+def test_invalidated_connections_are_counted(pooled_engine):
+    engine, label = pooled_engine
+
+    with engine.connect() as conn:
+        conn.invalidate()
+
+    assert pool_invalidations.value(engine=label, soft=False) == 1
+
+
+def test_gauges_follow_the_pool_after_dispose(pooled_engine):
+    engine, label = pooled_engine
+    engine.dispose()
+
+    with engine.connect():
+        assert pool_checked_out.value(engine=label) == 1
+    assert pool_checkouts.value(engine=label) == 1
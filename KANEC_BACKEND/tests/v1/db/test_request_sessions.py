@@ -0,0 +1,90 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+
+from api.db.database import get_async_db, get_db
+
+# More than the threadpool has workers, so sync dependencies share threads
+CONCURRENCY = 100
+
+
+def build_app(dependency):
+    """An app whose handler parks until every request is in flight at once"""
+    app = FastAPI()
+    app.state.sessions = []
+    app.state.closed_early = []
+    in_flight = asyncio.Event()
+
+    async def same_session(db=Depends(dependency)):
+        return db
+
+    @app.get("/")
+    async def handler(db=Depends(dependency), other=Depends(same_session)):
+        assert db is other
+        app.state.sessions.append(db)
+        if len(app.state.sessions) == CONCURRENCY:
+            in_flight.set()
+        await asyncio.wait_for(in_flight.wait(), 5)
+        # Another request finishing must not have closed or reset our session
+        if db.info.get("closed"):
+            app.state.closed_early.append(db)
+        return {}
+
+    return app
+
+
+def track_close(monkeypatch, factory_name, close_name):
+    import api.db.database as database
+    factory = getattr(database, factory_name)
+
+    def tracked():
+        session = factory()
+        original = getattr(session, close_name)
+
+        def close(*args, **kwargs):
+            session.info["closed"] = True
+            return original(*args, **kwargs)
+
+        async def aclose(*args, **kwargs):
+            session.info["closed"] = True
+            return await original(*args, **kwargs)
+
+        setattr(session, close_name, aclose if asyncio.iscoroutinefunction(original) else close)
+        return session
+
+    monkeypatch.setattr(database, factory_name, tracked)
+
+
+async def run_concurrently(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        responses = await asyncio.gather(*[client.get("/") for _ in range(CONCURRENCY)])
+    assert all(response.status_code == 200 for response in responses)
+    # The app keeps every session alive, so ids are unique per object
+    return {id(session) for session in app.state.sessions}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_get_their_own_sync_session(monkeypatch):
+    track_close(monkeypatch, "SessionLocal", "close")
+    app = build_app(get_db)
+
+    sessions = await run_concurrently(app)
+
+    assert len(sessions) == CONCURRENCY
+    assert app.state.closed_early == []
+    assert all(session.info.get("closed") for session in app.state.sessions)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_get_their_own_async_session(monkeypatch):
+    track_close(monkeypatch, "AsyncSessionLocal", "close")
+    app = build_app(get_async_db)
+
+    sessions = await run_concurrently(app)
+
+    assert len(sessions) == CONCURRENCY
+    assert app.state.closed_early == []
+    assert all(session.info.get("closed") for session in app.state.sessions)
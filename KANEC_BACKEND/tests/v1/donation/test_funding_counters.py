@@ -0,0 +1,63 @@
+import pytest
+
+from api.v1.models.donation import Donation, DonationStatus
+from api.v1.models.project import Project
+from api.v1.services.hedera import update_raised_amount
+
+
+def complete(db, project_id, donor_id, amount):
+    db.add(Donation(project_id=project_id, donor_id=donor_id, amount=amount, status=DonationStatus.completed))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_donations_are_not_lost(session_factory, seeded):
+    project_id, (alice, bob) = seeded
+
+    async with session_factory() as first, session_factory() as second:
+        # Both sessions have read the project before either donation lands
+        assert (await first.get(Project, project_id)).amount_raised == 0.0
+        assert (await second.get(Project, project_id)).amount_raised == 0.0
+
+        complete(first, project_id, alice, 10.0)
+        await update_raised_amount(first, project_id, 10.0)
+        await first.commit()
+
+        complete(second, project_id, bob, 5.0)
+        await update_raised_amount(second, project_id, 5.0)
+        await second.commit()
+
+    async with session_factory() as check:
+        project = await check.get(Project, project_id)
+        assert project.amount_raised == 15.0
+        assert project.backers_count == 2
+
+
+@pytest.mark.asyncio
+async def test_repeat_donor_counts_as_one_backer(session_factory, seeded):
+    project_id, (alice, _) = seeded
+
+    async with session_factory() as db:
+        for amount in (1.0, 2.0):
+            complete(db, project_id, alice, amount)
+            await update_raised_amount(db, project_id, amount)
+            await db.commit()
+
+    async with session_factory() as check:
+        project = await check.get(Project, project_id)
+        assert project.amount_raised == 3.0
+        assert project.backers_count == 1
+
+
+@pytest.mark.asyncio
+async def test_counters_roll_back_with_the_donation(session_factory, seeded):
+    project_id, (alice, _) = seeded
+
+    async with session_factory() as db:
+        complete(db, project_id, alice, 7.0)
+        await update_raised_amount(db, project_id, 7.0)
+        await db.rollback()
+
+    async with session_factory() as check:
+        project = await check.get(Project, project_id)
+        assert project.amount_raised == 0.0
+        assert project.backers_count == 0
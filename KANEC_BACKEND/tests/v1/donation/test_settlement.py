@@ -0,0 +1,209 @@
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from unittest.mock import AsyncMock
+
+from api.utils.hedera_executor import HederaExecutorSaturated
+from api.utils.transaction_id import HederaTransactionId
+from api.v1.models.donation import Donation, DonationStatus
+from api.v1.models.project import Project
+from api.v1.services import donation as donation_service
+from api.v1.services.hedera import MIRROR_NODE_UNAVAILABLE, TRANSACTION_NOT_FOUND, TransferRejected
+
+TX_HASH = "0.0.1001-1700000000-000000005"
+
+
+@pytest.fixture
+def settlement(session_factory, monkeypatch):
+    monkeypatch.setattr(donation_service, "TaskSessionLocal", session_factory)
+
+
+async def add_donation(session_factory, project_id, donor_id, status=DonationStatus.pending, tx_hash=None, age=0):
+    async with session_factory() as db:
+        updated_at = datetime.now(timezone.utc) - timedelta(seconds=age)
+        donation = Donation(
+            project_id=project_id, donor_id=donor_id, amount=5.0, status=status, tx_hash=tx_hash, updated_at=updated_at
+        )
+        db.add(donation)
+        await db.commit()
+        return donation.id
+
+
+@pytest.mark.asyncio
+async def test_pending_donation_is_completed(session_factory, seeded, settlement, monkeypatch):
+    project_id, (alice, _) = seeded
+    donation_id = await add_donation(session_factory, project_id, alice)
+    transfer = AsyncMock(return_value=TX_HASH)
+    monkeypatch.setattr(donation_service, "donate_hbar_from_user", transfer)
+
+    status = await donation_service.settle_donation(donation_id)
+
+    assert status == DonationStatus.completed
+    transfer.assert_awaited_once()
+    assert transfer.await_args.kwargs["project_wallet"] == "0.0.2002"
+    async with session_factory() as db:
+        donation = await db.get(Donation, donation_id)
+        project = await db.get(Project, project_id)
+        assert donation.tx_hash == TX_HASH
+        assert project.amount_raised == 5.0
+        assert project.backers_count == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_transfer_marks_donation_failed(session_factory, seeded, settlement, monkeypatch):
+    project_id, (alice, _) = seeded
+    donation_id = await add_donation(session_factory, project_id, alice)
+    monkeypatch.setattr(donation_service, "donate_hbar_from_user", AsyncMock(side_effect=TransferRejected("INSUFFICIENT_PAYER_BALANCE")))
+
+    status = await donation_service.settle_donation(donation_id)
+
+    assert status == DonationStatus.failed
+    async with session_factory() as db:
+        donation = await db.get(Donation, donation_id)
+        project = await db.get(Project, project_id)
+        assert donation.tx_hash is None
+        assert project.amount_raised == 0.0
+
+
+async def load(session_factory, donation_id, project_id):
+    async with session_factory() as db:
+        return await db.get(Donation, donation_id), await db.get(Project, project_id)
+
+
+def mirror_result(valid=True, timestamp="1700000000.000000005", error=None):
+    result = {"valid": valid, "timestamp": timestamp, "result": "SUCCESS" if valid else "INSUFFICIENT_ACCOUNT_BALANCE"}
+    if error:
+        result["error"] = error
+    return result
+
+
+@pytest.mark.asyncio
+async def test_timed_out_transfer_stays_pending_with_its_transaction_id(session_factory, seeded, settlement, monkeypatch):
+    project_id, (alice, _) = seeded
+    donation_id = await add_donation(session_factory, project_id, alice)
+    transfer = AsyncMock(side_effect=TimeoutError("Hedera transaction call timed out after 60.0s"))
+    monkeypatch.setattr(donation_service, "donate_hbar_from_user", transfer)
+
+    status = await donation_service.settle_donation(donation_id)
+
+    assert status == DonationStatus.pending
+    donation, project = await load(session_factory, donation_id, project_id)
+    assert donation.status == DonationStatus.pending
+    assert donation.tx_hash == transfer.await_args.kwargs["transaction_id"].to_mirror()
+    assert project.amount_raised == 0.0
+
+
+@pytest.mark.asyncio
+async def test_retry_after_timeout_reconciles_instead_of_paying_again(session_factory, seeded, settlement, monkeypatch):
+    project_id, (alice, _) = seeded
+    donation_id = await add_donation(session_factory, project_id, alice)
+    transfer = AsyncMock(side_effect=TimeoutError())
+    monkeypatch.setattr(donation_service, "donate_hbar_from_user", transfer)
+    await donation_service.settle_donation(donation_id)
+    submitted = transfer.await_args.kwargs["transaction_id"].to_mirror()
+
+    # The worker thread finished the transfer after all
+    mirror = AsyncMock(return_value=mirror_result())
+    monkeypatch.setattr(donation_service, "verify_transaction", mirror)
+    status = await donation_service.settle_donation(donation_id)
+
+    assert status == DonationStatus.completed
+    assert transfer.await_count == 1
+    mirror.assert_awaited_once_with(submitted)
+    donation, project = await load(session_factory, donation_id, project_id)
+    assert donation.tx_hash == submitted
+    assert project.amount_raised == 5.0
+
+
+@pytest.mark.asyncio
+async def test_unknown_transfer_stays_pending_within_its_validity_window(session_factory, seeded, settlement, monkeypatch):
+    project_id, (alice, _) = seeded
+    recent = HederaTransactionId("0.0.2", int(time.time()) - 10, 0).to_mirror()
+    donation_id = await add_donation(session_factory, project_id, alice, tx_hash=recent)
+    monkeypatch.setattr(donation_service, "verify_transaction", AsyncMock(return_value=mirror_result(timestamp=None, error=TRANSACTION_NOT_FOUND)))
+
+    assert await donation_service.settle_donation(donation_id) == DonationStatus.pending
+
+
+@pytest.mark.asyncio
+async def test_expired_transaction_missing_from_mirror_node_fails(session_factory, seeded, settlement, monkeypatch):
+    project_id, (alice, _) = seeded
+    donation_id = await add_donation(session_factory, project_id, alice, tx_hash=TX_HASH)
+    monkeypatch.setattr(donation_service, "verify_transaction", AsyncMock(return_value=mirror_result(timestamp=None, error=TRANSACTION_NOT_FOUND)))
+
+    assert await donation_service.settle_donation(donation_id) == DonationStatus.failed
+    donation, _ = await load(session_factory, donation_id, project_id)
+    assert donation.tx_hash is None
+
+
+@pytest.mark.asyncio
+async def test_unreachable_mirror_node_never_fails_a_donation(session_factory, seeded, settlement, monkeypatch):
+    project_id, (alice, _) = seeded
+    donation_id = await add_donation(session_factory, project_id, alice, tx_hash=TX_HASH)
+    monkeypatch.setattr(donation_service, "verify_transaction", AsyncMock(return_value=mirror_result(timestamp=None, error=MIRROR_NODE_UNAVAILABLE)))
+
+    assert await donation_service.settle_donation(donation_id) == DonationStatus.pending
+
+
+@pytest.mark.asyncio
+async def test_saturated_lane_leaves_donation_to_start_afresh(session_factory, seeded, settlement, monkeypatch):
+    project_id, (alice, _) = seeded
+    donation_id = await add_donation(session_factory, project_id, alice)
+    monkeypatch.setattr(donation_service, "donate_hbar_from_user", AsyncMock(side_effect=HederaExecutorSaturated("busy")))
+
+    assert await donation_service.settle_donation(donation_id) == DonationStatus.pending
+    donation, _ = await load(session_factory, donation_id, project_id)
+    assert donation.tx_hash is None
+
+
+@pytest.mark.asyncio
+async def test_settled_donation_is_never_paid_twice(session_factory, seeded, settlement, monkeypatch):
+    project_id, (alice, _) = seeded
+    donation_id = await add_donation(session_factory, project_id, alice, DonationStatus.completed, TX_HASH)
+    transfer = AsyncMock()
+    monkeypatch.setattr(donation_service, "donate_hbar_from_user", transfer)
+
+    status = await donation_service.settle_donation(donation_id)
+
+    assert status == DonationStatus.completed
+    transfer.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_completed_donations_load_their_project_eagerly(session_factory, seeded):
+    project_id, (alice, _) = seeded
+    await add_donation(session_factory, project_id, alice, DonationStatus.completed, TX_HASH)
+    await add_donation(session_factory, project_id, alice)
+
+    async with session_factory() as db:
+        donations = await donation_service.get_user_completed_donations(db, alice)
+
+    assert [(d.project_name, d.tx_hash) for d in donations] == [("Borehole", TX_HASH)]
+
+
+@pytest.mark.asyncio
+async def test_sweep_finds_only_stale_pending_donations(session_factory, seeded, settlement):
+    project_id, (alice, _) = seeded
+    stale = await add_donation(session_factory, project_id, alice, tx_hash=TX_HASH, age=3600)
+    await add_donation(session_factory, project_id, alice, age=60)
+    await add_donation(session_factory, project_id, alice, DonationStatus.completed, age=3600)
+
+    assert await donation_service.stale_pending_donations(older_than=900, limit=10) == [stale]
+
+
+def test_sweep_task_requeues_settlement_without_retries(monkeypatch):
+    from api.utils import celery_app
+
+    stale = [uuid.uuid4(), uuid.uuid4()]
+    queued = []
+
+    async def stale_pending_donations(older_than, limit):
+        return stale
+
+    monkeypatch.setattr(donation_service, "stale_pending_donations", stale_pending_donations)
+    monkeypatch.setattr(celery_app.settle_donation_task, "delay", lambda **kwargs: queued.append(kwargs))
+
+    assert celery_app.sweep_pending_donations_task() == {"queued": 2}
+    assert queued == [{"donation_id": str(donation_id), "retry": False} for donation_id in stale]
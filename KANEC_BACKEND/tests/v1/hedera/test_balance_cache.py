@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from api.utils.redis_utils import redis_client
+from api.v1.services import hedera
+
+
+@pytest.fixture(autouse=True)
+def local_cache(monkeypatch):
+    monkeypatch.setattr(redis_client, "enabled", False)
+    hedera.balance_cache.local.clear()
+    yield
+    hedera.balance_cache.local.clear()
+
+
+@pytest.mark.asyncio
+async def test_balance_is_served_from_cache(monkeypatch):
+    query = AsyncMock(return_value=42.0)
+    monkeypatch.setattr(hedera, "query_wallet_balance", query)
+
+    assert await hedera.get_wallet_balance("0.0.1001") == 42.0
+    assert await hedera.get_wallet_balance("0.0.1001") == 42.0
+    assert query.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_query(monkeypatch):
+    async def slow_query(wallet_address):
+        await asyncio.sleep(0.02)
+        return 7.5
+
+    query = AsyncMock(side_effect=slow_query)
+    monkeypatch.setattr(hedera, "query_wallet_balance", query)
+
+    balances = await asyncio.gather(*(hedera.get_wallet_balance("0.0.1002") for _ in range(10)))
+
+    assert balances == [7.5] * 10
+    assert query.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_forces_a_fresh_query(monkeypatch):
+    query = AsyncMock(side_effect=[10.0, 4.0])
+    monkeypatch.setattr(hedera, "query_wallet_balance", query)
+
+    assert await hedera.get_wallet_balance("0.0.1003") == 10.0
+    await hedera.invalidate_wallet_balance("0.0.1003", "0.0.2000")
+    assert await hedera.get_wallet_balance("0.0.1003") == 4.0
+
+
+@pytest.mark.asyncio
+async def test_failed_query_is_not_cached(monkeypatch):
+    query = AsyncMock(side_effect=[ConnectionError("node down"), 3.0])
+    monkeypatch.setattr(hedera, "query_wallet_balance", query)
+
+    assert await hedera.get_wallet_balance("0.0.1004") == 0.0
+    assert await hedera.get_wallet_balance("0.0.1004") == 3.0
@@ -0,0 +1,146 @@
+import asyncio
+import threading
+import pytest
+from unittest.mock import MagicMock
+
+from api.utils.hedera_executor import ExecutorLane, HederaCallTimeout
+from api.utils.hedera_pool import HederaClientPool
+
+
+def make_client():
+    client = MagicMock()
+    client.network.nodes = [MagicMock()]
+    return client
+
+
+@pytest.mark.asyncio
+async def test_client_is_reused_between_checkouts():
+    factory = MagicMock(side_effect=make_client)
+    pool = HederaClientPool(size=2, factory=factory)
+
+    async with pool.client() as first:
+        pass
+    async with pool.client() as second:
+        pass
+
+    assert first is second
+    assert factory.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_never_exceeds_its_size():
+    factory = MagicMock(side_effect=make_client)
+    pool = HederaClientPool(size=2, factory=factory)
+
+    async def use():
+        async with pool.client():
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(use() for _ in range(6)))
+
+    assert factory.call_count == 2
+    assert pool.idle_count == 2
+
+
+@pytest.mark.asyncio
+async def test_acquire_times_out_when_exhausted():
+    pool = HederaClientPool(size=1, acquire_timeout=0.05, factory=make_client)
+    client = await pool.acquire()
+
+    with pytest.raises(TimeoutError):
+        await pool.acquire()
+
+    pool.release(client)
+    assert await pool.acquire() is client
+
+
+@pytest.mark.asyncio
+async def test_node_failure_discards_client():
+    factory = MagicMock(side_effect=make_client)
+    pool = HederaClientPool(size=1, factory=factory)
+
+    with pytest.raises(ConnectionError):
+        async with pool.client() as broken:
+            raise ConnectionError("node unreachable")
+
+    broken.close.assert_called_once()
+    async with pool.client() as replacement:
+        assert replacement is not broken
+    assert factory.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_waiter_gets_replacement_after_failure():
+    pool = HederaClientPool(size=1, factory=make_client)
+    broken = await pool.acquire()
+
+    waiter = asyncio.ensure_future(pool.acquire())
+    await asyncio.sleep(0)
+    pool.release(broken, healthy=False)
+
+    replacement = await asyncio.wait_for(waiter, 1)
+    assert replacement is not broken
+
+
+@pytest.mark.asyncio
+async def test_expired_client_is_rebuilt():
+    factory = MagicMock(side_effect=make_client)
+    pool = HederaClientPool(size=1, max_age=0, factory=factory)
+
+    async with pool.client():
+        pass
+    async with pool.client():
+        pass
+
+    assert factory.call_count == 2
+
+
+async def time_out_while_running(pool, lane, fn):
+    with pytest.raises(HederaCallTimeout) as timeout:
+        async with pool.client() as client:
+            await lane.run(fn)
+    return client, timeout.value.call
+
+
+@pytest.mark.asyncio
+async def test_lane_timeout_keeps_client_until_worker_returns():
+    pool = HederaClientPool(size=1, factory=make_client)
+    lane = ExecutorLane("query", workers=1, timeout=0.05, max_pending=10)
+    release = threading.Event()
+
+    try:
+        client, call = await time_out_while_running(pool, lane, release.wait)
+
+        # Still running on the worker thread: neither closed nor handed to anyone else
+        assert not call.done()
+        client.close.assert_not_called()
+        assert pool.idle_count == 0 and pool.in_use_count == 1
+    finally:
+        release.set()
+    await asyncio.wrap_future(call)
+    client.close.assert_not_called()
+    async with pool.client() as again:
+        assert again is client
+    lane.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_lane_timeout_discards_client_if_worker_then_fails():
+    pool = HederaClientPool(size=1, factory=make_client)
+    lane = ExecutorLane("query", workers=1, timeout=0.05, max_pending=10)
+    release = threading.Event()
+
+    def fail_later():
+        release.wait()
+        raise ConnectionError("node unreachable")
+
+    try:
+        client, call = await time_out_while_running(pool, lane, fail_later)
+        client.close.assert_not_called()
+    finally:
+        release.set()
+    with pytest.raises(ConnectionError):
+        await asyncio.wrap_future(call)
+    client.close.assert_called_once()
+    assert pool.in_use_count == 0
+    lane.shutdown()
@@ -0,0 +1,61 @@
+import threading
+import asyncio
+import pytest
+
+from api.utils.hedera_executor import ExecutorLane, HederaExecutor, HederaExecutorSaturated
+
+
+@pytest.mark.asyncio
+async def test_lane_runs_call_on_its_own_threads():
+    lane = ExecutorLane("query", workers=2, timeout=1, max_pending=10)
+
+    name = await lane.run(lambda: threading.current_thread().name)
+
+    assert name.startswith("hedera-query")
+    assert lane.pending == 0
+    lane.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_lane_times_out_slow_calls():
+    release = threading.Event()
+    lane = ExecutorLane("transaction", workers=1, timeout=0.05, max_pending=10)
+
+    with pytest.raises(TimeoutError):
+        await lane.run(release.wait)
+
+    release.set()
+    lane.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_lane_rejects_when_queue_is_full():
+    release = threading.Event()
+    lane = ExecutorLane("query", workers=1, timeout=1, max_pending=1)
+
+    blocked = asyncio.ensure_future(lane.run(release.wait))
+    await asyncio.sleep(0.01)
+    with pytest.raises(HederaExecutorSaturated):
+        await lane.run(lambda: None)
+
+    release.set()
+    await blocked
+    assert lane.pending == 0
+    lane.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_busy_lane_does_not_block_other_lanes():
+    release = threading.Event()
+    executor = HederaExecutor({
+        "query": ExecutorLane("query", workers=1, timeout=1, max_pending=10),
+        "transaction": ExecutorLane("transaction", workers=1, timeout=1, max_pending=10),
+    })
+
+    blocked = asyncio.ensure_future(executor.run("query", release.wait))
+    result = await executor.run("transaction", lambda: "settled")
+
+    assert result == "settled"
+    release.set()
+    await blocked
+    executor.shutdown()
@@ -0,0 +1,59 @@
+import time
+
+import httpx
+import pytest
+
+from api.utils.mirror_node import IndexingWait, MirrorNodeClient, mirror_indexing_lag
+from api.v1.services import hedera
+
+
+def test_old_transactions_are_queried_immediately_once():
+    wait = IndexingWait(expected_lag=10.0, fresh_window=120.0, timeout=45.0)
+    assert list(wait.delays(time.time() - 3600)) == [0.0]
+
+
+def test_fresh_transactions_wait_for_indexing_then_back_off_within_budget():
+    wait = IndexingWait(expected_lag=10.0, fresh_window=120.0, timeout=45.0, base_delay=0.5, max_delay=4.0)
+    valid_start = time.time() - 4
+    delays = list(wait.delays(valid_start))
+
+    assert 5.5 < delays[0] <= 6.0
+    assert len(delays) > 2
+    assert all(0 <= delay <= 4.0 for delay in delays[1:])
+    assert sum(delays) <= 45.0 - 4 + 0.1
+
+
+@pytest.mark.asyncio
+async def test_fresh_transaction_is_polled_until_indexed(monkeypatch):
+    valid_start = int(time.time()) - 20
+    tx_hash = f"0.0.1001-{valid_start}-000000005"
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if len(calls) < 3:
+            return httpx.Response(404, json={})
+        return httpx.Response(200, json={"transactions": [{
+            "result": "SUCCESS",
+            "consensus_timestamp": f"{valid_start + 2}.000000000",
+            "transaction_id": tx_hash,
+            "transfers": [{"account": "0.0.1001", "amount": -100_000_000}, {"account": "0.0.2002", "amount": 100_000_000}]
+        }]})
+
+    slept = []
+
+    async def fake_sleep(delay):
+        slept.append(delay)
+
+    monkeypatch.setattr(hedera, "mirror_node", MirrorNodeClient("https://testnet.mirrornode.hedera.com", transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(hedera.asyncio, "sleep", fake_sleep)
+    hedera.finalized_verifications.delete(tx_hash)
+    lag_before = mirror_indexing_lag.count()
+
+    result = await hedera.verify_transaction(tx_hash)
+
+    assert result["valid"] is True
+    assert result["amount"] == 1.0
+    assert len(calls) == 3
+    assert all(delay < 5 for delay in slept)
+    assert mirror_indexing_lag.count() == lag_before + 1
@@ -0,0 +1,50 @@
+import asyncio
+
+import httpx
+import pytest
+
+from api.utils.mirror_node import MirrorNodeClient, mirror_request_seconds, _endpoint
+
+
+def make_client(handler) -> MirrorNodeClient:
+    return MirrorNodeClient("https://testnet.mirrornode.hedera.com", transport=httpx.MockTransport(handler))
+
+
+def test_endpoint_label_drops_ids():
+    assert _endpoint("/api/v1/transactions/0.0.1-1700000000-000000001") == "transactions"
+    assert _endpoint("/api/v1/accounts/0.0.5?limit=1") == "accounts"
+
+
+@pytest.mark.asyncio
+async def test_client_is_reused_within_a_loop_and_records_latency():
+    def handler(request):
+        return httpx.Response(404, json={"_status": {"messages": [{"message": "Not found"}]}})
+
+    mirror = make_client(handler)
+    before = mirror_request_seconds.count(endpoint="transactions", status=404)
+
+    first = mirror.client
+    response = await mirror.get("/api/v1/transactions/0.0.1-1700000000-000000001")
+
+    assert response.status_code == 404
+    assert mirror.client is first
+    assert mirror_request_seconds.count(endpoint="transactions", status=404) == before + 1
+
+    await mirror.close()
+    assert first.is_closed
+
+
+def test_each_event_loop_gets_its_own_client():
+    mirror = make_client(lambda request: httpx.Response(200, json={}))
+
+    async def use_client():
+        await mirror.get("/api/v1/network/nodes")
+        client = mirror.client
+        await mirror.close()
+        return client
+
+    first = asyncio.run(use_client())
+    second = asyncio.run(use_client())
+
+    assert first is not second
+    assert first.is_closed and second.is_closed
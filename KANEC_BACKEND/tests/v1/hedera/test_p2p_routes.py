@@ -0,0 +1,100 @@
+import uuid
+from datetime import datetime
+
+import httpx
+import pytest
+
+from main import app
+from api.db.database import get_async_db
+from api.utils.redis_utils import redis_client
+from api.utils.hedera_executor import HederaExecutorSaturated
+from api.utils.settings import settings
+from api.v1.models.user import UserRole
+from api.v1.routes import pvp
+from api.v1.services import hedera as hedera_service
+from api.v1.services.auth import get_current_user
+from api.v1.services.principal import Principal
+
+
+def principal():
+    now = datetime.utcnow()
+    return Principal(
+        id=uuid.uuid4(), email="sender@example.com", name="Sender", role=UserRole.DONOR,
+        wallet_address="0.0.1001", is_verified=True, has_wallet_key=True, created_at=now, updated_at=now
+    )
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def override_db():
+        yield None
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    monkeypatch.setattr(redis_client, "enabled", False)
+    app.dependency_overrides[get_async_db] = override_db
+    app.dependency_overrides[get_current_user] = principal
+    yield httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+    app.dependency_overrides.clear()
+
+
+def failing(error):
+    async def call(*args, **kwargs):
+        raise error
+    return call
+
+
+@pytest.mark.asyncio
+async def test_saturated_balance_lookup_is_503_not_400(client, monkeypatch):
+    monkeypatch.setattr(pvp, "get_wallet_balance", failing(HederaExecutorSaturated("busy")))
+
+    async with client:
+        response = await client.get("/api/v1/p2p/balance")
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_timed_out_transfer_is_504_not_400(client, monkeypatch):
+    async def balance(wallet):
+        return 100.0
+
+    monkeypatch.setattr(pvp, "get_wallet_balance", balance)
+    monkeypatch.setattr(pvp, "transfer_hbar_p2p", failing(TimeoutError("Hedera transaction call timed out after 30s")))
+
+    async with client:
+        response = await client.post("/api/v1/p2p/transfer", json={"recipient_wallet": "0.0.2002", "amount": 1})
+
+    assert response.status_code == 504
+    assert "may still complete" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_saturated_wallet_validation_is_not_reported_missing(client, monkeypatch):
+    monkeypatch.setattr(hedera_service, "get_wallet_balance", failing(HederaExecutorSaturated("busy")))
+
+    async with client:
+        response = await client.post("/api/v1/p2p/validate-wallet", params={"wallet_address": "0.0.2002"})
+
+    assert response.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_timed_out_balance_query_is_503_not_zero(client, monkeypatch):
+    monkeypatch.setattr(hedera_service, "query_wallet_balance", failing(TimeoutError("Hedera query call timed out after 10s")))
+
+    async with client:
+        response = await client.get("/api/v1/p2p/balance")
+
+    assert response.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_timed_out_balance_check_does_not_reject_transfer_as_insufficient(client, monkeypatch):
+    monkeypatch.setattr(hedera_service, "query_wallet_balance", failing(TimeoutError("Hedera query call timed out after 10s")))
+    monkeypatch.setattr(pvp, "transfer_hbar_p2p", pytest.fail)
+
+    async with client:
+        response = await client.post("/api/v1/p2p/transfer", json={"recipient_wallet": "0.0.2002", "amount": 1})
+
+    assert response.status_code == 503
@@ -0,0 +1,58 @@
+import httpx
+import pytest
+
+from api.utils.mirror_node import MirrorNodeClient
+from api.utils.transaction_id import HederaTransactionId, to_mirror_tx_id, try_parse_tx_id
+from api.v1.services import hedera
+
+
+class FakeTimestamp:
+    seconds = 1700000000
+    nanos = 5
+
+
+class FakeSdkTransactionId:
+    account_id = "0.0.1001"
+    valid_start = FakeTimestamp()
+
+
+def test_sdk_mirror_and_legacy_forms_share_one_canonical_id():
+    canonical = "0.0.1001-1700000000-000000005"
+    assert to_mirror_tx_id("0.0.1001@1700000000.5") == canonical
+    assert to_mirror_tx_id("0.0.1001-1700000000.5") == canonical
+    assert to_mirror_tx_id(canonical) == canonical
+    assert HederaTransactionId.from_sdk(FakeSdkTransactionId()).to_mirror() == canonical
+
+
+def test_to_sdk_pads_nanos():
+    tx_id = HederaTransactionId.parse("0.0.1001-1700000000-000000005")
+    assert tx_id.to_sdk() == "0.0.1001@1700000000.000000005"
+    assert HederaTransactionId.parse(tx_id.to_sdk()) == tx_id
+
+
+def test_invalid_ids_are_rejected():
+    with pytest.raises(ValueError):
+        HederaTransactionId.parse("not-a-transaction")
+    assert try_parse_tx_id("0.0.1001@1700000000.1234567890") is None
+    assert try_parse_tx_id(None) is None
+
+
+@pytest.mark.asyncio
+async def test_verification_miss_costs_one_request(monkeypatch):
+    requested = []
+
+    def handler(request):
+        requested.append(request.url.path)
+        return httpx.Response(404, json={})
+
+    async def no_sleep(delay):
+        pass
+
+    monkeypatch.setattr(hedera, "mirror_node", MirrorNodeClient("https://testnet.mirrornode.hedera.com", transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(hedera.asyncio, "sleep", no_sleep)
+
+    result = await hedera.verify_transaction("0.0.1001@1700000000.5")
+
+    assert requested == ["/api/v1/transactions/0.0.1001-1700000000-000000005"]
+    assert result["valid"] is False
+    assert result["transaction_id"] == "0.0.1001-1700000000-000000005"
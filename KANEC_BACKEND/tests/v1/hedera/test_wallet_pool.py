@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from api.v1.models.wallet_pool import WalletKind, WalletPoolAccount
+from api.v1.services import wallet_pool
+from api.v1.services.wallet_pool import (
+    acquire_project_wallet,
+    acquire_user_wallet,
+    claim_wallet,
+    pool_claims,
+    pool_depth,
+    pool_size,
+    replenish_wallet_pool,
+)
+
+
+@pytest.fixture
+def network(monkeypatch):
+    """Fake account creation; records each account created and which top-ups were requested"""
+    calls = {"created": [], "replenish": [], "fail_after": None}
+
+    async def create_user_wallet():
+        if calls["fail_after"] is not None and len(calls["created"]) >= calls["fail_after"]:
+            raise RuntimeError("BUSY")
+        address = f"0.0.9{len(calls['created']):03d}"
+        calls["created"].append(address)
+        return address, f"key-{address}"
+
+    async def create_project_wallet(db):
+        address, _ = await create_user_wallet()
+        return address
+
+    monkeypatch.setattr(wallet_pool, "create_user_wallet", create_user_wallet)
+    monkeypatch.setattr(wallet_pool, "create_project_wallet", create_project_wallet)
+    monkeypatch.setattr(wallet_pool, "encrypt_private_key", lambda key, secret: f"enc:{key}")
+    monkeypatch.setattr(wallet_pool, "request_replenish", calls["replenish"].append)
+    return calls
+
+
+async def stock(session_factory, kind, count):
+    started = datetime.now(timezone.utc)
+    async with session_factory() as db:
+        db.add_all([
+            WalletPoolAccount(
+                kind=kind,
+                wallet_address=f"0.0.{kind.value}{i}",
+                encrypted_private_key=f"enc:{i}",
+                created_at=started + timedelta(seconds=i)
+            )
+            for i in range(count)
+        ])
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_claims_take_the_oldest_unclaimed_account(session_factory):
+    await stock(session_factory, WalletKind.user, 2)
+
+    async with session_factory() as db:
+        first = await claim_wallet(db, WalletKind.user)
+        second = await claim_wallet(db, WalletKind.user)
+        assert await claim_wallet(db, WalletKind.user) is None
+        assert await claim_wallet(db, WalletKind.project) is None
+        await db.commit()
+
+    assert (first.wallet_address, second.wallet_address) == ("0.0.user0", "0.0.user1")
+    assert first.claimed_at is not None
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_claim_returns_the_account(session_factory):
+    await stock(session_factory, WalletKind.user, 1)
+
+    async with session_factory() as db:
+        assert await claim_wallet(db, WalletKind.user) is not None
+        await db.rollback()
+
+    async with session_factory() as db:
+        assert await pool_size(db, WalletKind.user) == 1
+
+
+@pytest.mark.asyncio
+async def test_user_wallet_comes_from_the_pool(session_factory, network):
+    await stock(session_factory, WalletKind.user, 3)
+    before = pool_claims.value(kind="user", source="pool")
+
+    async with session_factory() as db:
+        assert await acquire_user_wallet(db) == ("0.0.user0", "enc:0")
+        await db.commit()
+
+    assert network["created"] == []
+    assert pool_claims.value(kind="user", source="pool") == before + 1
+    assert pool_depth.value(kind="user") == 2
+    assert network["replenish"] == [WalletKind.user]
+
+
+@pytest.mark.asyncio
+async def test_empty_pool_falls_back_to_live_creation(session_factory, network):
+    before = pool_claims.value(kind="project", source="live")
+
+    async with session_factory() as db:
+        assert await acquire_project_wallet(db) == "0.0.9000"
+
+    assert pool_claims.value(kind="project", source="live") == before + 1
+    assert network["replenish"] == [WalletKind.project]
+
+
+@pytest.mark.asyncio
+async def test_replenish_tops_up_to_target_in_batches(session_factory, network, monkeypatch):
+    monkeypatch.setattr(wallet_pool, "TaskSessionLocal", session_factory)
+    monkeypatch.setitem(wallet_pool.TARGET, WalletKind.user, 5)
+    monkeypatch.setattr(wallet_pool.settings, "WALLET_POOL_REPLENISH_BATCH", 3)
+    await stock(session_factory, WalletKind.user, 1)
+
+    assert await replenish_wallet_pool(WalletKind.user) == 3
+    assert await replenish_wallet_pool(WalletKind.user) == 1
+    assert await replenish_wallet_pool(WalletKind.user) == 0
+
+    async with session_factory() as db:
+        assert await pool_size(db, WalletKind.user) == 5
+        await claim_wallet(db, WalletKind.user)  # the stocked account
+        account = await claim_wallet(db, WalletKind.user)
+    assert account.encrypted_private_key == "enc:key-0.0.9000"
+    assert pool_depth.value(kind="user") == 5
+
+
+@pytest.mark.asyncio
+async def test_replenish_keeps_accounts_created_before_a_failure(session_factory, network, monkeypatch):
+    monkeypatch.setattr(wallet_pool, "TaskSessionLocal", session_factory)
+    network["fail_after"] = 2
+
+    assert await replenish_wallet_pool(WalletKind.project) == 2
+
+    async with session_factory() as db:
+        assert await pool_size(db, WalletKind.project) == 2
@@ -0,0 +1,57 @@
+import asyncio
+import io
+import time
+
+import pytest
+from PIL import Image
+
+from api.utils.image_processing import ImageTooLarge, render_renditions
+from api.utils.media_pool import MediaPool, MediaPoolSaturated
+
+SPECS = [("full", (1200, 800), 85), ("thumbnail", (300, 200), 75)]
+
+
+def png(width: int, height: int) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), (10, 20, 30)).save(output, "PNG")
+    return output.getvalue()
+
+
+@pytest.fixture
+def pool():
+    pool = MediaPool(workers=1, timeout=30.0, max_pending=1)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_renders_in_a_worker_process(pool):
+    rendered = await pool.run(render_renditions, png(1600, 900), SPECS, 10_000_000)
+
+    assert Image.open(io.BytesIO(rendered["thumbnail"])).size == (300, 169)
+    assert pool.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_oversized_images_are_rejected_before_decoding(pool):
+    with pytest.raises(ImageTooLarge):
+        await pool.run(render_renditions, png(2000, 2000), SPECS, 1_000_000)
+    assert pool.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_full_pool_rejects_new_jobs(pool):
+    slow = asyncio.ensure_future(pool.run(time.sleep, 0.5))
+    await asyncio.sleep(0)
+
+    with pytest.raises(MediaPoolSaturated):
+        await pool.run(time.sleep, 0)
+
+    await slow
+    assert pool.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_jobs_time_out(pool):
+    with pytest.raises(TimeoutError):
+        await pool.run(time.sleep, 2, timeout=0.1)
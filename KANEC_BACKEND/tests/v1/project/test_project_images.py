@@ -0,0 +1,151 @@
+import hashlib
+import io
+
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI, UploadFile
+from PIL import Image
+from sqlalchemy import event, select
+
+from api.db.database import get_async_db
+from api.utils.http_cache import IMMUTABLE, REVALIDATE, etag_matches
+from api.v1.models.project import Project
+from api.v1.models.project_image import ProjectImage
+from api.v1.routes.project import router
+from api.v1.schemas.project import ImageSize
+from api.v1.services.project import get_project_image, get_verified_projects, optimize_image, store_project_image
+
+
+def full(data: bytes) -> dict:
+    return {ImageSize.full: data}
+
+
+@pytest.mark.asyncio
+async def test_renditions_fit_their_boxes():
+    upload = io.BytesIO()
+    Image.new("RGBA", (2400, 1600), (200, 100, 50, 255)).save(upload, "PNG")
+    upload.seek(0)
+
+    renditions, mime_type = await optimize_image(UploadFile(upload))
+
+    sizes = {size: Image.open(io.BytesIO(data)).size for size, data in renditions.items()}
+    assert sizes == {ImageSize.full: (1200, 800), ImageSize.card: (600, 400), ImageSize.thumbnail: (300, 200)}
+    assert len(renditions[ImageSize.thumbnail]) < len(renditions[ImageSize.full])
+    assert mime_type == "image/webp"
+
+
+@pytest.mark.asyncio
+async def test_image_is_stored_outside_the_project_row(session_factory, seeded):
+    project_id, _ = seeded
+    async with session_factory() as db:
+        project = await db.get(Project, project_id)
+        await store_project_image(db, project, full(b"first"), "image/webp")
+        await db.commit()
+        await store_project_image(db, project, full(b"second"), "image/webp")
+        await db.commit()
+
+    async with session_factory() as db:
+        project = await db.get(Project, project_id)
+        assert project.image_hash == hashlib.sha256(b"second").hexdigest()
+        assert len((await db.scalars(select(ProjectImage))).all()) == 1
+        assert await get_project_image(db, project_id) == (b"second", "image/webp")
+
+
+@pytest.mark.asyncio
+async def test_project_listing_never_reads_image_bytes(session_factory, seeded):
+    project_id, _ = seeded
+    async with session_factory() as db:
+        project = await db.get(Project, project_id)
+        project.verified = True
+        await store_project_image(db, project, {ImageSize.full: b"image bytes", ImageSize.thumbnail: b"thumb"}, "image/webp")
+        await db.commit()
+
+    statements = []
+    engine = session_factory.kw["bind"].sync_engine
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        async with session_factory() as db:
+            projects = await get_verified_projects(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    version = hashlib.sha256(b"image bytes").hexdigest()[:16]
+    assert projects[0].image == f"/projects/{project_id}/image?v={version}"
+    assert projects[0].images[ImageSize.thumbnail] == f"/projects/{project_id}/image?size=thumbnail&v={version}"
+    assert not any("project_images" in statement for statement in statements)
+
+
+@pytest_asyncio.fixture
+async def image_client(session_factory, seeded):
+    project_id, _ = seeded
+    async with session_factory() as db:
+        project = await db.get(Project, project_id)
+        await store_project_image(db, project, {ImageSize.full: b"image bytes", ImageSize.thumbnail: b"thumb"}, "image/webp")
+        await db.commit()
+
+    async def override_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_async_db] = override_db
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client, project_id
+
+
+def test_if_none_match_uses_weak_comparison():
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abcd"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+@pytest.mark.asyncio
+async def test_versioned_image_url_is_immutable(image_client):
+    client, project_id = image_client
+    version = hashlib.sha256(b"image bytes").hexdigest()[:16]
+
+    response = await client.get(f"/projects/{project_id}/image", params={"v": version})
+
+    assert response.status_code == 200
+    assert response.content == b"image bytes"
+    assert response.headers["etag"] == f'"{hashlib.sha256(b"image bytes").hexdigest()}"'
+    assert response.headers["cache-control"] == IMMUTABLE
+    assert "last-modified" in response.headers
+
+    stale = await client.get(f"/projects/{project_id}/image", params={"v": "0" * 16})
+    assert stale.headers["cache-control"] == REVALIDATE
+
+
+@pytest.mark.asyncio
+async def test_matching_etag_gets_304_without_loading_the_image(image_client, monkeypatch):
+    client, project_id = image_client
+    etag = (await client.get(f"/projects/{project_id}/image")).headers["etag"]
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("image bytes were loaded")
+
+    monkeypatch.setattr("api.v1.routes.project.get_project_image", fail)
+    response = await client.get(f"/projects/{project_id}/image", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_size_selects_rendition_and_falls_back_to_full(image_client):
+    client, project_id = image_client
+    version = hashlib.sha256(b"image bytes").hexdigest()[:16]
+
+    thumbnail = await client.get(f"/projects/{project_id}/image", params={"size": "thumbnail", "v": version})
+    card = await client.get(f"/projects/{project_id}/image", params={"size": "card"})
+
+    assert thumbnail.content == b"thumb"
+    assert thumbnail.headers["etag"] == f'"{hashlib.sha256(b"thumb").hexdigest()}"'
+    assert thumbnail.headers["cache-control"] == IMMUTABLE
+    assert card.content == b"image bytes"
+    assert (await client.get(f"/projects/{project_id}/image", params={"size": "huge"})).status_code == 422
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, select, update
+
+from api.v1.models.project import Project
+from api.v1.schemas.project import FundingStatus, ProjectSort, SortOrder
+from api.v1.services.project import list_projects
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest_asyncio.fixture
+async def catalogue(session_factory, seeded):
+    """Twelve verified projects plus one unverified; returns the verified titles"""
+    _, (creator, _) = seeded
+    async with session_factory() as db:
+        for i in range(12):
+            db.add(Project(
+                title=f"Project {i}",
+                description="A long description that listings never load",
+                category="water" if i % 2 else "education",
+                location="Nairobi, Kenya" if i % 3 == 0 else "Kampala, Uganda",
+                target_amount=100.0,
+                amount_raised=float(i * 10),
+                verified=True,
+                wallet_address=f"0.0.3{i:03d}",
+                created_by=creator,
+                created_at=START + timedelta(days=i)
+            ))
+        db.add(Project(
+            title="Hidden", description="x", category="water", target_amount=1.0, amount_raised=999.0,
+            verified=False, wallet_address="0.0.4000", created_by=creator
+        ))
+        await db.commit()
+
+
+async def all_pages(session_factory, **kwargs):
+    pages, cursor = [], None
+    while True:
+        async with session_factory() as db:
+            page = await list_projects(db, cursor=cursor, **kwargs)
+        pages.append([item.title for item in page.items])
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort", list(ProjectSort))
+async def test_pages_cover_every_verified_project_once(session_factory, catalogue, sort):
+    pages = await all_pages(session_factory, sort=sort, limit=5)
+
+    titles = [title for page in pages for title in page]
+    assert [len(page) for page in pages] == [5, 5, 2]
+    assert titles == [f"Project {i}" for i in reversed(range(12))]
+
+
+@pytest.mark.asyncio
+async def test_ties_are_broken_by_id(session_factory, catalogue):
+    async with session_factory() as db:
+        await db.execute(update(Project).values(amount_raised=50.0))
+        await db.commit()
+        ids = sorted((await db.scalars(select(Project.id).where(Project.verified == True))).all())
+
+    pages = await all_pages(session_factory, sort=ProjectSort.amount_raised, order=SortOrder.asc, limit=5)
+
+    titles = [title for page in pages for title in page]
+    async with session_factory() as db:
+        assert titles == [(await db.get(Project, project_id)).title for project_id in ids]
+
+
+@pytest.mark.asyncio
+async def test_filters_combine(session_factory, catalogue):
+    async with session_factory() as db:
+        page = await list_projects(
+            db, category="water", location="kenya", funding=FundingStatus.open, sort=ProjectSort.created_at
+        )
+
+    # odd ids in water, multiples of 3 in Kenya, under target: 9 and 3
+    assert [item.title for item in page.items] == ["Project 9", "Project 3"]
+    assert page.items[0].completion == pytest.approx(0.9)
+    assert page.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_cursor_must_match_the_sort(session_factory, catalogue):
+    async with session_factory() as db:
+        page = await list_projects(db, sort=ProjectSort.completion, limit=2)
+        with pytest.raises(ValueError):
+            await list_projects(db, sort=ProjectSort.created_at, cursor=page.next_cursor)
+        with pytest.raises(ValueError):
+            await list_projects(db, cursor="not a cursor")
+
+
+@pytest.mark.asyncio
+async def test_listing_skips_heavy_columns(session_factory, catalogue):
+    statements = []
+    engine = session_factory.kw["bind"].sync_engine
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        async with session_factory() as db:
+            await list_projects(db, limit=3)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert len(statements) == 1
+    assert "description" not in statements[0]
+    assert "wallet_address" not in statements[0]
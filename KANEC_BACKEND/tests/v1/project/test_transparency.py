@@ -0,0 +1,128 @@
+import asyncio
+import json
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import func, select
+from unittest.mock import MagicMock
+
+from api.db.database import get_async_db
+from api.v1.models.donation import Donation, DonationStatus
+from api.v1.models.transaction_verification import TransactionVerification
+from api.v1.routes.project import router
+from api.v1.services import project as project_service
+from api.v1.services.verification import store_verification
+
+
+def make_donation(index, tx_hash="0.0.5-1700000000-000000001"):
+    donation = MagicMock()
+    donation.amount = float(index)
+    donation.tx_hash = tx_hash
+    donation.status = DonationStatus.completed
+    return donation
+
+
+@pytest.fixture
+def fake_verify(monkeypatch):
+    state = {"active": 0, "peak": 0, "calls": 0}
+
+    async def verify(tx_hash, client=None):
+        state["calls"] += 1
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.01)
+        state["active"] -= 1
+        return {"valid": True, "from_account": "0.0.1", "to_account": "0.0.2", "amount": 1.0}
+
+    monkeypatch.setattr(project_service, "verify_transaction", verify)
+    monkeypatch.setattr(project_service.settings, "MIRROR_NODE_CONCURRENCY", 3)
+    return state
+
+
+@pytest.mark.asyncio
+async def test_verifications_run_concurrently_within_the_limit(fake_verify):
+    donations = [make_donation(i) for i in range(10)]
+
+    results = [entry async for entry in project_service.verify_donations(donations)]
+
+    assert fake_verify["calls"] == 10
+    assert fake_verify["peak"] == 3
+    assert sorted(index for index, _ in results) == list(range(10))
+
+
+@pytest.mark.asyncio
+async def test_donations_without_tx_hash_skip_the_network(fake_verify):
+    donations = [make_donation(0, tx_hash=None)]
+
+    results = [entry async for entry in project_service.verify_donations(donations)]
+
+    assert fake_verify["calls"] == 0
+    assert results[0][1]["valid"] is False
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_header_then_each_donation(fake_verify):
+    project = MagicMock()
+    project.image_hash = None
+    donations = [make_donation(i) for i in range(3)]
+
+    lines = [json.loads(line) async for line in project_service.stream_project_transparency(project, donations)]
+
+    assert [line["type"] for line in lines] == ["project", "donation", "donation", "donation", "end"]
+    assert lines[-1]["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_transparency_survives_a_concurrently_stored_verification(session_factory, seeded, monkeypatch):
+    project_id, donor_ids = seeded
+    tx_hash = "0.0.1000-1700000000-000000001"
+    verification = {
+        "valid": True,
+        "result": "SUCCESS",
+        "amount": 5.0,
+        "from_account": "0.0.1000",
+        "to_account": "0.0.2002",
+        "timestamp": "1700000000.000000001",
+        "transfers": []
+    }
+    async with session_factory() as db:
+        db.add(Donation(donor_id=donor_ids[0], project_id=project_id, amount=5.0, tx_hash=tx_hash, status=DonationStatus.completed))
+        await db.commit()
+
+    async def verify_while_another_request_stores(tx_hash, client=None):
+        # Another request finishes verifying the same transaction first
+        async with session_factory() as other:
+            await store_verification(other, tx_hash, verification)
+        return verification
+
+    monkeypatch.setattr(project_service, "verify_transaction", verify_while_another_request_stores)
+
+    async def override_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_async_db] = override_db
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.get(f"/projects/{project_id}/transparency")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["project_id"] == str(project_id)
+    assert body["donations"][0]["valid"] is True
+
+    async with session_factory() as db:
+        assert await db.scalar(select(func.count()).select_from(TransactionVerification)) == 1
+
+
+@pytest.mark.asyncio
+async def test_pending_donations_skip_the_network(fake_verify):
+    donation = make_donation(0)
+    donation.status = DonationStatus.pending
+
+    results = [entry async for entry in project_service.verify_donations([donation])]
+
+    assert fake_verify["calls"] == 0
+    assert results[0][1]["status"] == "pending"
+    assert results[0][1]["valid"] is False
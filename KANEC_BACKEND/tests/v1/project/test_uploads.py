@@ -0,0 +1,90 @@
+import io
+import os
+
+import httpx
+import pytest
+from fastapi import FastAPI, File, UploadFile
+
+from api.utils.uploads import (
+    UnsupportedUpload,
+    UploadSizeLimitMiddleware,
+    UploadTooLarge,
+    sniff_image_format,
+    spooled_upload,
+)
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 100
+
+
+def upload(data: bytes) -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename="photo.jpg")
+
+
+def test_formats_are_sniffed_from_magic_bytes():
+    assert sniff_image_format(b"\xff\xd8\xff\xe0rest") == "jpeg"
+    assert sniff_image_format(PNG) == "png"
+    assert sniff_image_format(b"GIF89a...") == "gif"
+    assert sniff_image_format(b"RIFF\x00\x00\x00\x00WEBPVP8 ") == "webp"
+    assert sniff_image_format(b"<svg xmlns=...") is None
+
+
+@pytest.mark.asyncio
+async def test_upload_is_spooled_to_a_temporary_file():
+    async with spooled_upload(upload(PNG), max_bytes=1024, chunk_size=16) as path:
+        with open(path, "rb") as f:
+            assert f.read() == PNG
+    assert not os.path.exists(path)
+
+
+@pytest.mark.asyncio
+async def test_non_images_are_rejected_whatever_the_filename():
+    with pytest.raises(UnsupportedUpload):
+        async with spooled_upload(upload(b"#!/bin/sh\nrm -rf /"), max_bytes=1024):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_oversize_uploads_stop_at_the_cap():
+    source = upload(PNG + b"\x00" * 10_000)
+
+    with pytest.raises(UploadTooLarge):
+        async with spooled_upload(source, max_bytes=1024, chunk_size=256):
+            pass
+
+    # Reading stopped at the first chunk over the limit
+    assert source.file.tell() <= 1024 + 256
+
+
+def build_app(max_bytes: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/projects/{project_id}/image")
+    async def upload_image(project_id: str, image: UploadFile = File(...)):
+        return {"size": len(await image.read())}
+
+    app.add_middleware(UploadSizeLimitMiddleware, max_bytes=max_bytes, path_pattern=r"/projects/[^/]+/image$")
+    return app
+
+
+@pytest.mark.asyncio
+async def test_oversize_bodies_are_refused_before_parsing():
+    transport = httpx.ASGITransport(app=build_app(max_bytes=2048))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        small = await client.post("/projects/1/image", files={"image": ("a.png", PNG)})
+        large = await client.post("/projects/1/image", files={"image": ("a.png", PNG * 100)})
+
+        async def chunked():
+            yield b'--x\r\nContent-Disposition: form-data; name="image"; filename="a.png"\r\n\r\n'
+            for _ in range(100):
+                yield PNG
+
+        # No Content-Length, so the limit is enforced while the body streams in
+        streamed = await client.post(
+            "/projects/1/image",
+            content=chunked(),
+            headers={"Content-Type": "multipart/form-data; boundary=x"}
+        )
+
+    assert small.status_code == 200
+    assert large.status_code == 413
+    assert streamed.status_code == 413
@@ -0,0 +1,65 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from api.v1.models.donation import DonationStatus
+from api.v1.services import verification as verification_service
+from api.v1.services.verification import store_verification, trace_transaction, verify_transaction_cached
+
+
+FINALIZED = {
+    "valid": True,
+    "result": "SUCCESS",
+    "amount": 5.0,
+    "from_account": "0.0.1001",
+    "to_account": "0.0.2002",
+    "timestamp": "1700000000.000000001",
+    "transaction_id": "0.0.1001-1700000000-000000005",
+    "transfers": []
+}
+
+
+@pytest.mark.asyncio
+async def test_pending_verification_is_not_stored():
+    db = MagicMock()
+    await store_verification(db, "0.0.1001@1700000000.5", {**FINALIZED, "timestamp": None})
+    db.add.assert_not_called()
+    db.commit.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stored_verification_skips_mirror_node(monkeypatch):
+    mirror = AsyncMock(return_value=FINALIZED)
+    monkeypatch.setattr(verification_service, "verify_transaction", mirror)
+    stored = {}
+
+    async def fake_get_stored(db, tx_hashes):
+        return {tx_hash: stored[tx_hash] for tx_hash in tx_hashes if tx_hash in stored}
+
+    async def fake_store(db, tx_hash, verification):
+        stored[tx_hash] = verification
+
+    monkeypatch.setattr(verification_service, "get_stored_verifications", fake_get_stored)
+    monkeypatch.setattr(verification_service, "store_verification", fake_store)
+
+    db = MagicMock()
+    first = await verify_transaction_cached(db, "0.0.1001@1700000000.5")
+    second = await verify_transaction_cached(db, "0.0.1001@1700000000.5")
+
+    assert first == second == FINALIZED
+    assert mirror.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_trace_of_pending_donation_skips_mirror_node(monkeypatch):
+    mirror = AsyncMock(return_value=FINALIZED)
+    monkeypatch.setattr(verification_service, "verify_transaction", mirror)
+    donation = MagicMock()
+    donation.status = DonationStatus.pending
+    db = MagicMock()
+    db.scalar = AsyncMock(return_value=donation)
+
+    result = await trace_transaction("0.0.1001@1700000000.5", db)
+
+    mirror.assert_not_awaited()
+    assert result["status"] == "pending"
+    assert result["valid"] is False